@@ -0,0 +1,12 @@
+from pathlib import Path
+
+# Paths
+AGENTS_DIR = Path(__file__).parent.parent  # mki-agents
+CACHE_DIR = AGENTS_DIR / ".cache"
+
+# Translation memory shared by every agent
+MEMORY_DB = CACHE_DIR / "translation_memory.sqlite3"
+MEMORY_MAX_BYTES = 200_000_000  # evict least recently used results beyond this
+
+# Progress stores of the agents (one SQLite database per agent)
+PROGRESS_DIR = CACHE_DIR / "progress"
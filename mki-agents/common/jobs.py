@@ -0,0 +1,90 @@
+"""
+Batch job machinery shared by the agents
+
+A concurrent work queue drained by a fixed number of workers, and shards
+that split a dataset between processes or machines. A row belongs to a
+shard by a stable hash of its key (event_id, or location_name when
+geocoding), so every process picks the same rows without coordinating,
+and shard outputs are merged back by key.
+"""
+
+import asyncio
+import zlib
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TypeVar
+
+import pandas as pd
+
+T = TypeVar("T")
+
+
+async def run_queue(jobs: Iterable[T], handle: Callable[[T], Awaitable[None]], workers: int) -> None:
+    """Run handle(job) for every job with up to `workers` running at once, raising the first error."""
+    queue = asyncio.Queue()
+    for job in jobs:
+        queue.put_nowait(job)
+
+    async def worker() -> None:
+        while True:
+            job = await queue.get()
+            try:
+                await handle(job)
+            finally:
+                queue.task_done()
+
+    tasks = [asyncio.create_task(worker()) for _ in range(max(workers, 1))]
+    finished = asyncio.create_task(queue.join())
+    try:
+        # Workers only stop on an error; surface it instead of waiting forever
+        await asyncio.wait([finished, *tasks], return_when=asyncio.FIRST_COMPLETED)
+        for task in tasks:
+            if task.done():
+                task.result()
+    finally:
+        for task in [finished, *tasks]:
+            task.cancel()
+        await asyncio.gather(finished, *tasks, return_exceptions=True)
+
+
+@dataclass(frozen=True)
+class Shard:
+    """Shard `index` of `count` (0-based), as given on the command line as "i/n"."""
+
+    index: int = 0
+    count: int = 1
+
+    @classmethod
+    def parse(cls, text: str) -> "Shard":
+        try:
+            index, count = (int(part) for part in text.split("/"))
+        except ValueError:
+            raise ValueError(f"Shard must look like i/n, got {text!r}") from None
+        if not 0 <= index < count:
+            raise ValueError(f"Shard index must be in 0..{count - 1}, got {index}")
+        return cls(index, count)
+
+    def contains(self, key: str) -> bool:
+        """Whether the item with this key belongs to the shard."""
+        return zlib.crc32(key.encode("utf-8")) % self.count == self.index
+
+    def select(self, df: pd.DataFrame, column: str) -> pd.DataFrame:
+        """The rows of the shard, by the value of `column`."""
+        if self.count == 1:
+            return df
+        keys = df[column].fillna("").astype(str)
+        return df[keys.map(self.contains)]
+
+    def __str__(self) -> str:
+        return f"{self.index}/{self.count}"
+
+
+def merge_shards(paths: Iterable[Path], key: str = "event_id") -> pd.DataFrame:
+    """Concatenate shard outputs back into one dataset ordered by key."""
+    frames = [pd.read_csv(path) for path in paths]
+    merged = pd.concat(frames, ignore_index=True)
+    duplicated = merged[key].duplicated()
+    if duplicated.any():
+        raise ValueError(f"{int(duplicated.sum())} rows appear in more than one shard, e.g. {key}={merged[key][duplicated].iloc[0]}")
+    return merged.sort_values(key, kind="stable", ignore_index=True)
@@ -0,0 +1,129 @@
+"""
+Adaptive concurrency limiter for Gemini API calls
+
+Instead of sleeping a fixed delay between requests, callers hold a slot
+while a request is in flight. The number of slots grows by about one per
+round of successful requests and is halved when the API answers 429 /
+RESOURCE_EXHAUSTED, which also pauses new requests for a cooldown. This
+settles near the real quota instead of a guess baked into the config.
+"""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+def is_rate_limited(error: Exception) -> bool:
+    """Check whether an API error means we are over quota."""
+    return getattr(error, "code", None) == 429 or "RESOURCE_EXHAUSTED" in str(error)
+
+
+class AdaptiveLimiter:
+    """AIMD limit on the number of in-flight requests."""
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        min_concurrency: int = 1,
+        initial: int | None = None,
+        backoff: float = 0.5,
+        cooldown: float = 2.0,
+    ):
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.limit = float(initial or max_concurrency)
+        self.backoff = backoff
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.successes = 0
+        self.throttled = 0
+        self._cond = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        """Wait for a free slot and for any cooldown to pass."""
+        async with self._cond:
+            while True:
+                wait = self.paused_until - time.monotonic()
+                if wait > 0:
+                    try:
+                        await asyncio.wait_for(self._cond.wait(), wait)
+                    except TimeoutError:
+                        pass
+                elif self.in_flight < int(self.limit):
+                    break
+                else:
+                    await self._cond.wait()
+            self.in_flight += 1
+
+    async def release(self) -> None:
+        """Free a slot."""
+        async with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    async def __aenter__(self) -> "AdaptiveLimiter":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.release()
+
+    def on_success(self) -> None:
+        """Grow the limit by one slot per round of successful requests."""
+        self.successes += 1
+        self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+
+    def on_rate_limited(self, retry_after: float | None = None) -> float:
+        """Shrink the limit and pause new requests, returning the pause length."""
+        self.throttled += 1
+        now = time.monotonic()
+        delay = retry_after or self.cooldown
+        # Requests already in flight hit the same limit; only back off once per cooldown
+        if now >= self.paused_until:
+            self.limit = max(self.min_concurrency, self.limit * self.backoff)
+            self.paused_until = now + delay
+        return max(self.paused_until - now, 0.0)
+
+    def summary(self) -> str:
+        """Describe limiter state for progress output."""
+        return f"limit {int(self.limit)}/{self.max_concurrency}, {self.successes} ok, {self.throttled} throttled"
+
+
+async def call_limited(
+    limiter: AdaptiveLimiter,
+    request: Callable[[], Awaitable[T]],
+    max_retries: int,
+    max_throttle_retries: int,
+    retry_delay: float,
+    label: str = "Request",
+) -> T | None:
+    """
+    Await request() while holding a limiter slot, retrying failures.
+
+    Rate-limited failures are retried after the limiter's cooldown without
+    using up one of the max_retries attempts (up to max_throttle_retries).
+    Returns None if every attempt failed.
+    """
+    attempt = 0
+    throttle_retries = 0
+    while attempt < max_retries:
+        async with limiter:
+            try:
+                result = await request()
+            except Exception as e:
+                if is_rate_limited(e) and throttle_retries < max_throttle_retries:
+                    limiter.on_rate_limited()
+                    throttle_retries += 1
+                    continue
+                attempt += 1
+                print(f"  {label}: attempt {attempt}/{max_retries} failed: {e}")
+            else:
+                limiter.on_success()
+                return result
+        if attempt < max_retries:
+            await asyncio.sleep(retry_delay)
+    return None
@@ -0,0 +1,190 @@
+"""
+Persistent translation memory shared by the Gemini agents
+
+Every model answer is stored in SQLite under a hash of the source text,
+the target (language code, or the kind of answer for localize/geocode),
+the model name and the prompt it was produced with. Re-runs, new datasets
+and new languages only pay for strings that were never seen before.
+Opening a scope with a prompt that differs from the stored one drops the
+old answers for that task and target, so editing prompts.py invalidates
+them. The store is bounded in size and evicts least recently used entries.
+"""
+
+import hashlib
+import sqlite3
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from .config import MEMORY_DB, MEMORY_MAX_BYTES
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+  key TEXT PRIMARY KEY,
+  task TEXT NOT NULL,
+  target TEXT NOT NULL,
+  model TEXT NOT NULL,
+  prompt_hash TEXT NOT NULL,
+  value TEXT NOT NULL,
+  size INTEGER NOT NULL,
+  accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_scope ON entries(task, target, model);
+CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries(accessed_at);
+"""
+
+# SQLite's default limit on host parameters per statement
+MAX_PARAMS = 900
+
+
+def _hash(*parts: str) -> str:
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+class TranslationMemory:
+    """SQLite store of model answers with LRU eviction and hit/miss statistics."""
+
+    def __init__(self, path: Path = MEMORY_DB, max_bytes: int = MEMORY_MAX_BYTES):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+        self._db = sqlite3.connect(self.path, isolation_level=None, timeout=30.0)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+        self._total_bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def scope(self, task: str, target: str, model: str, prompt: str) -> "MemoryScope":
+        """Get the view of the memory for one task, target, model and prompt."""
+        prompt_hash = _hash(prompt)[:16]
+        cursor = self._db.execute(
+            "DELETE FROM entries WHERE task = ? AND target = ? AND model = ? AND prompt_hash != ?",
+            (task, target, model, prompt_hash),
+        )
+        if cursor.rowcount:
+            self._total_bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            print(f"Prompt changed: dropped {cursor.rowcount} cached {task}/{target} results")
+        return MemoryScope(self, task, target, model, prompt_hash)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        """Group several writes into one transaction."""
+        self._db.execute("BEGIN")
+        try:
+            yield
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        self._db.execute("COMMIT")
+
+    def _get_many(self, keys: list[str]) -> dict[str, str]:
+        """Look up entries by key, marking them as recently used."""
+        found = {}
+        for i in range(0, len(keys), MAX_PARAMS):
+            chunk = keys[i:i + MAX_PARAMS]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._db.execute(f"SELECT key, value FROM entries WHERE key IN ({placeholders})", chunk).fetchall()
+            if rows:
+                found.update(rows)
+                self._db.execute(
+                    f"UPDATE entries SET accessed_at = ? WHERE key IN ({','.join('?' * len(rows))})",
+                    (time.time(), *(key for key, _ in rows)),
+                )
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def _put_many(self, rows: list[tuple[str, str, str, str, str, str]]) -> None:
+        """Store (key, task, target, model, prompt_hash, value) rows."""
+        if not rows:
+            return
+        now = time.time()
+        keys = [row[0] for row in rows]
+        replaced = 0
+        for i in range(0, len(keys), MAX_PARAMS):
+            chunk = keys[i:i + MAX_PARAMS]
+            replaced += self._db.execute(
+                f"SELECT COALESCE(SUM(size), 0) FROM entries WHERE key IN ({','.join('?' * len(chunk))})", chunk
+            ).fetchone()[0]
+
+        sized = [(*row, len(row[5].encode("utf-8")), now) for row in rows]
+        with self._transaction():
+            self._db.executemany(
+                "INSERT OR REPLACE INTO entries (key, task, target, model, prompt_hash, value, size, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                sized,
+            )
+        self._total_bytes += sum(row[6] for row in sized) - replaced
+
+        if self._total_bytes > self.max_bytes:
+            self.evict()
+
+    def evict(self) -> None:
+        """Drop least recently used entries until the memory fits in max_bytes."""
+        excess = self._total_bytes - self.max_bytes
+        if excess <= 0:
+            return
+        rows = self._db.execute("SELECT key, size FROM entries ORDER BY accessed_at")
+        doomed = []
+        for key, size in rows:
+            if excess <= 0:
+                break
+            doomed.append((key,))
+            excess -= size
+            self._total_bytes -= size
+        with self._transaction():
+            self._db.executemany("DELETE FROM entries WHERE key = ?", doomed)
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def summary(self) -> str:
+        """Describe memory usage for progress output."""
+        lookups = self.hits + self.misses
+        rate = f"{self.hits / lookups:.0%}" if lookups else "n/a"
+        return (
+            f"{self.hits} hits, {self.misses} misses ({rate} hit rate); "
+            f"{len(self)} entries, {self._total_bytes / 1_000_000:.1f} MB"
+        )
+
+    def close(self) -> None:
+        """Close the memory database."""
+        self._db.close()
+
+
+class MemoryScope:
+    """Cached answers of one task/target/model/prompt combination."""
+
+    def __init__(self, memory: TranslationMemory, task: str, target: str, model: str, prompt_hash: str):
+        self.memory = memory
+        self.task = task
+        self.target = target
+        self.model = model
+        self.prompt_hash = prompt_hash
+
+    def _key(self, text: str) -> str:
+        return _hash(text, self.task, self.target, self.model, self.prompt_hash)
+
+    def get(self, text: str) -> str | None:
+        """Look up the cached answer for a source text."""
+        return self.get_many([text]).get(text)
+
+    def get_many(self, texts: Iterable[str]) -> dict[str, str]:
+        """Look up cached answers for many source texts at once."""
+        keys = {self._key(text): text for text in texts}
+        return {keys[key]: value for key, value in self.memory._get_many(list(keys)).items()}
+
+    def put(self, text: str, value: str) -> None:
+        """Store the answer for a source text."""
+        self.put_many({text: value})
+
+    def put_many(self, answers: dict[str, str]) -> None:
+        """Store answers for many source texts at once."""
+        self.memory._put_many([
+            (self._key(text), self.task, self.target, self.model, self.prompt_hash, value)
+            for text, value in answers.items()
+        ])
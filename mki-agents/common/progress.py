@@ -0,0 +1,127 @@
+"""
+Crash-safe progress store for the agents
+
+Each finished item (an event's translations, a location, coordinates) is
+written as its own row in a SQLite database in WAL mode, so recording a
+result costs the same however much is already done, an interrupted write
+never corrupts earlier results, and the store can be read while workers
+are still writing. Several namespaces (e.g. one per language) can share a
+database file.
+"""
+
+import json
+import sqlite3
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS progress (
+  namespace TEXT NOT NULL,
+  key TEXT NOT NULL,
+  value TEXT NOT NULL,
+  PRIMARY KEY (namespace, key)
+);
+"""
+
+
+def dataset_namespace(name: str, dataset: Path, default: Path) -> str:
+    """
+    Namespace of a task's progress on one dataset.
+
+    Event IDs of different datasets may collide, so each dataset gets its
+    own namespace; the default dataset keeps the plain name it always had.
+    """
+    if Path(dataset).resolve() == Path(default).resolve():
+        return name
+    return f"{Path(dataset).stem}:{name}"
+
+
+class ProgressStore:
+    """Results of one agent task, keyed by item, saved as soon as they are known."""
+
+    def __init__(self, path: Path, namespace: str = "default"):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.namespace = namespace
+        self._db = sqlite3.connect(self.path, isolation_level=None, timeout=30.0)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+
+    def put(self, key: str, value: Any) -> None:
+        """Record the result of one item."""
+        self._db.execute(
+            "INSERT OR REPLACE INTO progress (namespace, key, value) VALUES (?, ?, ?)",
+            (self.namespace, str(key), json.dumps(value, ensure_ascii=False)),
+        )
+
+    def put_many(self, results: dict[str, Any]) -> None:
+        """Record the results of several items in one transaction."""
+        self._db.execute("BEGIN")
+        try:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO progress (namespace, key, value) VALUES (?, ?, ?)",
+                [(self.namespace, str(key), json.dumps(value, ensure_ascii=False)) for key, value in results.items()],
+            )
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        self._db.execute("COMMIT")
+
+    def get(self, key: str) -> Any | None:
+        """Get the recorded result of an item."""
+        row = self._db.execute(
+            "SELECT value FROM progress WHERE namespace = ? AND key = ?", (self.namespace, str(key))
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def keys(self) -> set[str]:
+        """Get the keys of every finished item."""
+        rows = self._db.execute("SELECT key FROM progress WHERE namespace = ?", (self.namespace,))
+        return {row[0] for row in rows}
+
+    def items(self) -> dict[str, Any]:
+        """Get every recorded result."""
+        rows = self._db.execute("SELECT key, value FROM progress WHERE namespace = ?", (self.namespace,))
+        return {key: json.loads(value) for key, value in rows}
+
+    def to_frame(self, fields: Iterable[str]) -> pd.DataFrame:
+        """Get fields of dict results as columns of a frame indexed by key, extracted by SQLite."""
+        fields = list(fields)
+        columns = ", ".join(f"json_extract(value, '$.{field}') AS \"{field}\"" for field in fields)
+        return pd.read_sql_query(
+            f"SELECT key, {columns} FROM progress WHERE namespace = ?",
+            self._db,
+            params=(self.namespace,),
+            index_col="key",
+        )
+
+    def discard(self, keys: Iterable[str]) -> None:
+        """Forget items so they are processed again."""
+        self._db.executemany(
+            "DELETE FROM progress WHERE namespace = ? AND key = ?", [(self.namespace, str(key)) for key in keys]
+        )
+
+    def import_json(self, path: Path, field: str) -> int:
+        """Seed an empty store from a legacy JSON progress file, returning the items imported."""
+        if len(self) or not path.exists():
+            return 0
+        with open(path, "r", encoding="utf-8") as f:
+            results = json.load(f).get(field, {})
+        self.put_many(results)
+        return len(results)
+
+    def __contains__(self, key: str) -> bool:
+        return self._db.execute(
+            "SELECT 1 FROM progress WHERE namespace = ? AND key = ?", (self.namespace, str(key))
+        ).fetchone() is not None
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM progress WHERE namespace = ?", (self.namespace,)).fetchone()[0]
+
+    def close(self) -> None:
+        """Close the progress database."""
+        self._db.close()
@@ -0,0 +1 @@
+# Batch job runner for the agents
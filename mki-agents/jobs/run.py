@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Batch Job Runner for Any Events CSV
+
+Runs one agent task over an events dataset and writes the result to a new
+CSV, leaving the input untouched:
+
+    translate   translated copy of the events, one output per language
+    localize    events with a location_name column
+    geocode     events with geo_coordinates and region columns
+
+Every task uses the same machinery: concurrent requests bounded by the
+adaptive limiter, the shared translation memory, and a progress store that
+lets an interrupted job resume. With --shard i/n a job only processes its
+share of the rows, so several processes or machines can split a large
+dataset; `merge` joins their outputs back into one CSV.
+
+Usage:
+    uv run python -m jobs.run localize --input ../mki-datasets/history/history_events.csv --output history_loc.csv
+    uv run python -m jobs.run geocode --input history_loc.csv --output history_geo.csv --shard 0/4
+    uv run python -m jobs.run translate --input history_geo.csv --output history_{lang}.csv --lang en fr
+    uv run python -m jobs.run merge --output history_geo.csv history_geo.0.csv history_geo.1.csv ...
+"""
+
+import argparse
+import os
+from pathlib import Path
+
+import pandas as pd
+from dotenv import load_dotenv
+
+from common.config import AGENTS_DIR
+from common.jobs import Shard, merge_shards
+from localize.config import MAX_CONCURRENCY
+from localize.extract_locations import extract_frame
+from localize.geocode_locations import geocode_frame
+from translate.config import SUPPORTED_LANGUAGES
+from translate.translate_seera import translate_frame
+
+# Column that assigns rows to shards, per task (geocoding works per location)
+SHARD_KEYS = {
+    "translate": "event_id",
+    "localize": "event_id",
+    "geocode": "location_name",
+}
+
+
+def get_api_key() -> str:
+    """Read the Gemini API key from the environment or mki-agents/.env."""
+    load_dotenv(AGENTS_DIR / ".env")
+    api_key = os.getenv("GOOGLE_AI")
+    if not api_key:
+        raise ValueError("GOOGLE_AI environment variable not set")
+    return api_key
+
+
+def parse_shard(text: str) -> Shard:
+    try:
+        return Shard.parse(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
+
+
+def load_shard(path: Path, shard: Shard, key: str) -> pd.DataFrame:
+    """Load the events of a dataset that belong to a shard."""
+    print(f"Loading events from {path}")
+    df = pd.read_csv(path)
+    selected = shard.select(df, key)
+    print(f"Shard {shard}: {len(selected)} of {len(df)} events")
+    return selected.reset_index(drop=True)
+
+
+def save(df: pd.DataFrame, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    df.to_csv(path, index=False, encoding="utf-8-sig")
+    print(f"Saved {len(df)} events to {path}")
+
+
+def run_task(args: argparse.Namespace) -> None:
+    """Run one task over the input's shard and save the output."""
+    if args.task == "translate":
+        langs = list(dict.fromkeys(args.lang))
+        if len(langs) > 1 and "{lang}" not in str(args.output):
+            raise ValueError("--output must contain {lang} when translating into several languages")
+
+    df = load_shard(args.input, args.shard, SHARD_KEYS[args.task])
+    api_key = get_api_key()
+
+    if args.task == "translate":
+        outputs = translate_frame(df, langs, api_key, args.concurrency, args.input)
+        for lang, output in outputs.items():
+            save(output, Path(str(args.output).replace("{lang}", lang)))
+    elif args.task == "localize":
+        save(extract_frame(df, api_key, args.concurrency, args.input), args.output)
+    else:
+        save(geocode_frame(df, api_key, args.concurrency), args.output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run an agent task over any events CSV")
+    tasks = parser.add_subparsers(dest="task", required=True)
+
+    for task, description in (
+        ("translate", "Translate events into target languages"),
+        ("localize", "Extract the location of each event"),
+        ("geocode", "Add coordinates and region of each event's location"),
+    ):
+        task_parser = tasks.add_parser(task, help=description)
+        task_parser.add_argument("--input", type=Path, required=True, help="Events CSV to process")
+        task_parser.add_argument("--output", type=Path, required=True, help="CSV to write")
+        task_parser.add_argument(
+            "--shard",
+            type=parse_shard,
+            default=Shard(),
+            help="Only process shard i of n (0-based), e.g. 0/4",
+        )
+        task_parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=MAX_CONCURRENCY,
+            help="Maximum concurrent requests (lowered automatically when rate limited)",
+        )
+        if task == "translate":
+            task_parser.add_argument(
+                "--lang",
+                type=str,
+                nargs="+",
+                default=["en"],
+                choices=list(SUPPORTED_LANGUAGES.keys()),
+                help="Target language codes; use {lang} in --output for several",
+            )
+
+    merge_parser = tasks.add_parser("merge", help="Merge the outputs of every shard into one CSV")
+    merge_parser.add_argument("shards", type=Path, nargs="+", help="Shard outputs")
+    merge_parser.add_argument("--output", type=Path, required=True, help="CSV to write")
+    merge_parser.add_argument("--key", type=str, default="event_id", help="Column identifying a row")
+
+    args = parser.parse_args()
+    if args.task == "merge":
+        save(merge_shards(args.shards, args.key), args.output)
+    else:
+        run_task(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,58 @@
 from pathlib import Path
 
+from common.config import PROGRESS_DIR
+
 # Paths
 AGENT_DIR = Path(__file__).parent
 PROJECT_ROOT = AGENT_DIR.parent.parent  # mki-agents -> mki
 INPUT_CSV = PROJECT_ROOT / "mki-datasets" / "seera" / "seera_events.csv"
-PROGRESS_FILE = AGENT_DIR / ".progress.json"
+REGIONS_GEOJSON = PROJECT_ROOT / "mki-datasets" / "geojson" / "world_500.geojson"  # borders around the Seera era
+GAZETTEER_CSV = AGENT_DIR / "gazetteer.csv"  # known places with verified coordinates
+PROGRESS_DB = PROGRESS_DIR / "localize.sqlite3"  # "locations" and "geocode" namespaces
+
+# JSON progress files used before the progress store
+LEGACY_PROGRESS_FILE = AGENT_DIR / ".progress.json"
+LEGACY_GEOCODE_PROGRESS_FILE = AGENT_DIR / ".geocode_progress.json"
 
 # API Settings
 MODEL_NAME = "gemini-2.5-flash-lite"
-REQUEST_DELAY = 0.5  # seconds between API calls
 MAX_RETRIES = 3
 RETRY_DELAY = 2.0  # seconds between retries
+MAX_CONCURRENCY = 8  # upper bound on requests in flight
+MIN_CONCURRENCY = 1  # the limiter never backs off below this
+MAX_THROTTLE_RETRIES = 10  # 429 retries per request that don't count as attempts
+
+# Batched extraction requests
+LOCATION_BATCH_EVENTS = 25  # events packed into one request
+LOCATION_BATCH_CHARS = 40_000  # event text characters per request
+LOCATION_MAX_CHARS = 60  # longer answers are explanations, not place names
+UNKNOWN_LOCATION = "غير محدد"
+
+# Geocoding
+DEFAULT_COORDINATES = "21.4225,39.8262"  # Mecca, for locations that cannot be placed
+GEOCODE_CHECKPOINT_EVERY = 50  # geocoded locations per progress write
+
+# Gazetteer matching
+FUZZY_MIN_SIMILARITY = 0.7  # trigram Dice similarity for a fuzzy match
+# Common nouns that some names reduce to once the article is stripped ("المدينة" is
+# "city", "الغار" is "cave"): they match a whole name, never a word inside a longer one
+GENERIC_PLACE_WORDS = ("مدينة", "بلد", "قرية", "جبل", "وادي", "غار", "دار", "مسجد", "شعب", "بئر", "سوق", "حصن")
 
-# Batch settings
-BATCH_SIZE = 10  # Save progress every N events
+# Spatial validation
+COAST_TOLERANCE = 0.1  # degrees; points this close to land count as on land (coastlines are coarse)
+# Labels of land the historical map leaves unnamed, by a point inside each polygon
+UNNAMED_REGIONS = {"Arabia": (21.4225, 39.8262), "Abyssinia": (9.0, 38.75)}
+# Lands a location name may mention, and the regions a point given for it may fall in
+REGION_HINTS = {
+    "الحجاز": ("Arabia",),
+    "تهامة": ("Arabia",),
+    "نجد": ("Arabia", "Kingdom of Kinda"),
+    "اليمن": ("Himyarite Kingdom",),
+    "الشام": ("Eastern Roman Empire", "Ghassanids"),
+    "مصر": ("Eastern Roman Empire",),
+    "العراق": ("Sasanian Empire",),
+    "فارس": ("Sasanian Empire",),
+    "الحبشة": ("Abyssinia", "Axum"),
+}
+# A gazetteer match too weak to give coordinates still tells the region a place is in
+REFERENCE_MIN_SIMILARITY = 0.6
@@ -3,111 +3,138 @@
 Location Extraction Agent for Seera Events
 
 Extracts specific Arabic location names from Islamic historical events
-using Google Gemini API.
+using Google Gemini API, several events per request.
+
+Usage:
+    uv run python -m localize.extract_locations
+    uv run python -m localize.extract_locations --input ../mki-datasets/history/history_events.csv
+    uv run python -m localize.extract_locations --concurrency 16
 """
 
-import json
+import argparse
+import asyncio
 import os
-import time
+from pathlib import Path
 
 import pandas as pd
 from dotenv import load_dotenv
 
+from common.jobs import run_queue
+from common.limiter import AdaptiveLimiter
+from common.memory import TranslationMemory
+from common.progress import ProgressStore, dataset_namespace
+
 from .config import (
+    AGENT_DIR,
     INPUT_CSV,
-    PROGRESS_FILE,
+    LEGACY_PROGRESS_FILE,
+    LOCATION_BATCH_EVENTS,
+    MAX_CONCURRENCY,
+    MIN_CONCURRENCY,
+    PROGRESS_DB,
     MODEL_NAME,
-    REQUEST_DELAY,
-    BATCH_SIZE,
+    RETRY_DELAY,
+    UNKNOWN_LOCATION,
 )
 from .gemini_client import GeminiLocationExtractor
 
 
-def load_progress() -> dict:
-    """Load progress from checkpoint file."""
-    if PROGRESS_FILE.exists():
-        with open(PROGRESS_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return {"processed_ids": [], "locations": {}}
+def extract_frame(
+    df: pd.DataFrame,
+    api_key: str,
+    concurrency: int = MAX_CONCURRENCY,
+    dataset: Path = INPUT_CSV,
+) -> pd.DataFrame:
+    """
+    Add the location_name column to events, resuming from the progress store.
 
+    Batches of events are extracted concurrently. Progress is kept per
+    dataset, so the same event IDs in another CSV are extracted separately.
+    """
+    # Initialize client with the shared translation memory
+    memory = TranslationMemory()
+    extractor = GeminiLocationExtractor(api_key, MODEL_NAME, memory=memory)
 
-def save_progress(progress: dict) -> None:
-    """Save progress to checkpoint file."""
-    with open(PROGRESS_FILE, "w", encoding="utf-8") as f:
-        json.dump(progress, f, ensure_ascii=False, indent=2)
+    # Load progress for resumability
+    progress = ProgressStore(PROGRESS_DB, dataset_namespace("locations", dataset, INPUT_CSV))
+    if progress.namespace == "locations":
+        imported = progress.import_json(LEGACY_PROGRESS_FILE, "locations")
+        if imported:
+            print(f"Imported {imported} events from {LEGACY_PROGRESS_FILE.name}")
+    processed_ids = progress.keys()
+
+    # Process events, several per request
+    source = df[["event_id", "title", "details"]].fillna("").astype(str)
+    pending = {
+        event_id: (title, details)
+        for event_id, title, details in source.itertuples(index=False)
+        if event_id not in processed_ids
+    }
+    print(f"Previously processed: {len(source) - len(pending)} events")
+
+    event_ids = list(pending)
+    batches = [
+        {event_id: pending[event_id] for event_id in event_ids[start:start + LOCATION_BATCH_EVENTS]}
+        for start in range(0, len(event_ids), LOCATION_BATCH_EVENTS)
+    ]
+    limiter = AdaptiveLimiter(concurrency, MIN_CONCURRENCY, cooldown=RETRY_DELAY)
+    done = 0
+
+    async def run_batch(batch: dict[str, tuple[str, str]]) -> None:
+        nonlocal done
+        locations = await extractor.extract_locations_async(batch, limiter)
+        progress.put_many(locations)
+
+        for event_id in batch:
+            print(f"  Event {event_id}: {locations.get(event_id, 'FAILED (will retry on next run)')}")
+        done += len(batch)
+        print(f"  [{done}/{len(pending)}] {extractor.request_count} requests ({limiter.summary()})")
+
+    print(f"\nExtracting locations of {len(pending)} events with up to {concurrency} concurrent requests...")
+    asyncio.run(run_queue(batches, run_batch, concurrency))
+
+    locations = progress.items()
+    progress.close()
+    print(f"Translation memory: {memory.summary()}")
+    memory.close()
+
+    # Add location_name column to DataFrame
+    output = df.copy()
+    output["location_name"] = source["event_id"].map(locations).fillna(UNKNOWN_LOCATION)
+    print(f"Successfully processed {source['event_id'].isin(locations).sum()}/{len(df)} events")
+    return output
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Extract event locations with Gemini")
+    parser.add_argument("--input", type=Path, default=INPUT_CSV, help="Events CSV, updated in place")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=MAX_CONCURRENCY,
+        help="Maximum concurrent requests (lowered automatically when rate limited)",
+    )
+    args = parser.parse_args()
+    input_csv = args.input
+
     # Load environment variables from mki-agents/.env
-    env_path = PROGRESS_FILE.parent.parent / ".env"
+    env_path = AGENT_DIR.parent / ".env"
     load_dotenv(env_path)
 
     api_key = os.getenv("GOOGLE_AI")
     if not api_key:
         raise ValueError("GOOGLE_AI environment variable not set")
 
-    # Initialize client
-    extractor = GeminiLocationExtractor(api_key, MODEL_NAME)
-
     # Load CSV
-    print(f"Loading events from {INPUT_CSV}")
-    df = pd.read_csv(INPUT_CSV)
-    total_events = len(df)
-    print(f"Found {total_events} events")
-
-    # Load progress for resumability
-    progress = load_progress()
-    processed_ids = set(progress["processed_ids"])
-    locations = progress["locations"]
-
-    print(f"Previously processed: {len(processed_ids)} events")
+    print(f"Loading events from {input_csv}")
+    df = pd.read_csv(input_csv)
+    print(f"Found {len(df)} events")
 
-    # Process events
-    print("\nExtracting locations...")
-    for idx, row in df.iterrows():
-        event_id = str(row["event_id"])
-
-        # Skip already processed
-        if event_id in processed_ids:
-            continue
-
-        title = row["title"] if pd.notna(row["title"]) else ""
-        details = row["details"] if pd.notna(row["details"]) else ""
-
-        print(f"  [{idx + 1}/{total_events}] Event {event_id}: {title[:50]}...")
-
-        location = extractor.extract_location(title, details)
-
-        if location:
-            locations[event_id] = location
-            processed_ids.add(event_id)
-            print(f"    -> {location}")
-        else:
-            print("    -> FAILED (will retry on next run)")
-
-        # Save progress periodically
-        if (idx + 1) % BATCH_SIZE == 0:
-            progress["processed_ids"] = list(processed_ids)
-            progress["locations"] = locations
-            save_progress(progress)
-            print(f"  [Checkpoint saved: {len(processed_ids)} events processed]")
-
-        # Rate limiting
-        time.sleep(REQUEST_DELAY)
-
-    # Final save
-    progress["processed_ids"] = list(processed_ids)
-    progress["locations"] = locations
-    save_progress(progress)
-
-    # Add location_name column to DataFrame
-    df["location_name"] = df["event_id"].astype(str).map(locations)
-    df["location_name"] = df["location_name"].fillna("غير محدد")
+    df = extract_frame(df, api_key, args.concurrency, input_csv)
 
     # Save back to original CSV
-    df.to_csv(INPUT_CSV, index=False, encoding="utf-8-sig")
-    print(f"\nUpdated {INPUT_CSV} with location_name column")
-    print(f"Successfully processed {len(processed_ids)}/{total_events} events")
+    df.to_csv(input_csv, index=False, encoding="utf-8-sig")
+    print(f"\nUpdated {input_csv} with location_name column")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,191 @@
+"""
+Local gazetteer for resolving Arabic place names to coordinates
+
+Place names and their aliases are loaded from gazetteer.csv (verified
+coordinates, originally from mki-ui/src/data/seerahEvents.ts) and indexed
+by their normalized form, so spelling variants such as "أُحُدٍ" and "أحد"
+or "المدينة" and "مدينة" resolve to the same entry. Lookups try, in order:
+
+1. an exact match of the whole normalized name
+2. the longest run of words inside the name that is a known place
+   ("غزوة بدر الكبرى" -> بدر), other than a common noun such as "مدينة",
+   so "مدينة بغداد" is not Medina
+3. a known place starting with the name, via a character trie
+4. a fuzzy match on character trigrams, for small spelling differences
+
+Only names that none of these resolve need to go to Gemini.
+"""
+
+import csv
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+
+from .config import FUZZY_MIN_SIMILARITY, GAZETTEER_CSV, GENERIC_PLACE_WORDS
+
+# Harakat, tanween, shadda, sukun, superscript alef and tatweel
+TASHKEEL_RE = re.compile(r"[\u064B-\u065F\u0670\u0640]")
+LETTER_MAP = str.maketrans({"أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا", "ؤ": "و", "ئ": "ي", "ى": "ي", "ة": "ه"})
+# Definite article, possibly after a one-letter conjunction or preposition (و، ف، ب، ك، ل)
+ARTICLE_RE = re.compile(r"^(?:[وفبك]?ال|لل)(?=\w{2,})")
+NON_WORD_RE = re.compile(r"[^\w\s]")
+
+
+def normalize_arabic(text: str) -> str:
+    """Normalize an Arabic place name for matching."""
+    text = TASHKEEL_RE.sub("", text).translate(LETTER_MAP)
+    text = NON_WORD_RE.sub(" ", text)
+    return " ".join(ARTICLE_RE.sub("", word) for word in text.split())
+
+
+def trigrams(text: str) -> set[str]:
+    """Get the character trigrams of a normalized name, padded at word edges."""
+    padded = f" {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+@dataclass(frozen=True)
+class Place:
+    """A gazetteer entry."""
+
+    name: str
+    lat: float
+    lng: float
+    kind: str = ""
+
+
+@dataclass(frozen=True)
+class Match:
+    """A gazetteer lookup result and how it was found."""
+
+    place: Place
+    method: str  # exact, contained, prefix or fuzzy
+    score: float = 1.0
+
+
+class Trie:
+    """Character trie over normalized names."""
+
+    END = "\0"
+
+    def __init__(self):
+        self.root: dict = {}
+
+    def insert(self, key: str) -> None:
+        node = self.root
+        for char in key:
+            node = node.setdefault(char, {})
+        node[self.END] = key
+
+    def with_prefix(self, prefix: str) -> list[str]:
+        """Get every key starting with a prefix."""
+        node = self.root
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return []
+
+        keys = []
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            for char, child in node.items():
+                if char == self.END:
+                    keys.append(child)
+                else:
+                    stack.append(child)
+        return keys
+
+
+class Gazetteer:
+    """Index of known places by normalized name."""
+
+    def __init__(self, places: dict[str, Place] | None = None):
+        self.places: dict[str, Place] = {}
+        self.trie = Trie()
+        self.grams: dict[str, set[str]] = defaultdict(set)
+        self.max_words = 1
+        self.generic = {normalize_arabic(word) for word in GENERIC_PLACE_WORDS}
+        for name, place in (places or {}).items():
+            self.add(name, place)
+
+    @classmethod
+    def load(cls, path: Path = GAZETTEER_CSV) -> "Gazetteer":
+        """Load places and their aliases from a CSV file."""
+        gazetteer = cls()
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            for row in csv.DictReader(f):
+                place = Place(row["name"], float(row["lat"]), float(row["lng"]), row.get("kind") or "")
+                gazetteer.add(row["name"], place)
+                for alias in filter(None, (row.get("aliases") or "").split("|")):
+                    gazetteer.add(alias, place)
+        return gazetteer
+
+    def add(self, name: str, place: Place) -> None:
+        """Index a place under a name."""
+        key = normalize_arabic(name)
+        if not key or key in self.places:
+            return
+        self.places[key] = place
+        self.trie.insert(key)
+        self.max_words = max(self.max_words, len(key.split()))
+        for gram in trigrams(key):
+            self.grams[gram].add(key)
+
+    def lookup(self, name: str, min_similarity: float = FUZZY_MIN_SIMILARITY) -> Match | None:
+        """Find the place a name refers to, accepting fuzzy matches down to min_similarity."""
+        key = normalize_arabic(name)
+        if not key:
+            return None
+
+        place = self.places.get(key)
+        if place is not None:
+            return Match(place, "exact")
+
+        # Common nouns are left out of the fuzzy match, or "مدينة بغداد" would be close to "المدينة المنورة"
+        specific = " ".join(word for word in key.split() if word not in self.generic) or key
+        return self._contained(key) or self._prefix(key) or self._fuzzy(specific, min_similarity)
+
+    def _contained(self, key: str) -> Match | None:
+        """Find the longest, then leftmost, run of words that is a known place and not a common noun."""
+        words = key.split()
+        for size in range(min(self.max_words, len(words) - 1), 0, -1):
+            for start in range(len(words) - size + 1):
+                run = " ".join(words[start:start + size])
+                place = self.places.get(run)
+                if place is not None and run not in self.generic:
+                    return Match(place, "contained")
+        return None
+
+    def _prefix(self, key: str) -> Match | None:
+        """Find the shortest known place whose name starts with the name."""
+        if len(key) < 3 or key in self.generic:
+            return None
+        candidates = self.trie.with_prefix(key)
+        if not candidates:
+            return None
+        best = min(candidates, key=len)
+        return Match(self.places[best], "prefix", len(key) / len(best))
+
+    def _fuzzy(self, key: str, min_similarity: float) -> Match | None:
+        """Find the most similar known place by trigram Dice similarity."""
+        grams = trigrams(key)
+        counts: dict[str, int] = defaultdict(int)
+        for gram in grams:
+            for candidate in self.grams.get(gram, ()):
+                counts[candidate] += 1
+        if not counts:
+            return None
+
+        def similarity(candidate: str) -> float:
+            return 2 * counts[candidate] / (len(grams) + len(trigrams(candidate)))
+
+        best = max(counts, key=similarity)
+        score = similarity(best)
+        if score < min_similarity:
+            return None
+        return Match(self.places[best], "fuzzy", score)
+
+    def __len__(self) -> int:
+        return len(self.places)
@@ -1,23 +1,111 @@
+import asyncio
+import json
 import time
 
 from google import genai
 from google.genai import types
 
-from .config import MAX_RETRIES, RETRY_DELAY
-from .prompts import SYSTEM_PROMPT, USER_PROMPT_TEMPLATE
+from common.limiter import AdaptiveLimiter, call_limited
+from common.memory import TranslationMemory
+
+from .config import (
+    LOCATION_BATCH_CHARS,
+    LOCATION_BATCH_EVENTS,
+    LOCATION_MAX_CHARS,
+    MAX_RETRIES,
+    MAX_THROTTLE_RETRIES,
+    RETRY_DELAY,
+    UNKNOWN_LOCATION,
+)
+from .prompts import BATCH_PROMPT_TEMPLATE, SYSTEM_PROMPT, USER_PROMPT_TEMPLATE
+
+BATCH_SCHEMA = types.Schema(
+    type=types.Type.ARRAY,
+    items=types.Schema(
+        type=types.Type.OBJECT,
+        properties={
+            "event_id": types.Schema(type=types.Type.STRING),
+            "location": types.Schema(type=types.Type.STRING),
+        },
+        required=["event_id", "location"],
+    ),
+)
+
+
+def clean_location(text: str) -> str:
+    """Strip quotes and whitespace from a location answer."""
+    return text.strip().strip("\"'").strip()
+
+
+def is_valid_location(location: str) -> bool:
+    """Check that an answer looks like a single place name."""
+    return 0 < len(location) <= LOCATION_MAX_CHARS and "\n" not in location
+
+
+def parse_batch_response(response_text: str, expected: set[str]) -> dict[str, str]:
+    """Parse a batch reply, keeping only valid locations of expected events."""
+    try:
+        data = json.loads(response_text)
+    except (json.JSONDecodeError, TypeError):
+        return {}
+    if not isinstance(data, list):
+        return {}
+
+    results = {}
+    for item in data:
+        if not isinstance(item, dict) or not isinstance(item.get("location"), str):
+            continue
+        event_id = str(item.get("event_id", ""))
+        location = clean_location(item["location"])
+        if event_id in expected and is_valid_location(location):
+            results[event_id] = location
+    return results
+
+
+def chunk_events(events: dict[str, tuple[str, str]]) -> list[dict[str, tuple[str, str]]]:
+    """Split events into requests of at most LOCATION_BATCH_EVENTS events and LOCATION_BATCH_CHARS characters."""
+    chunks = []
+    chunk = {}
+    size = 0
+    for event_id, (title, details) in events.items():
+        length = len(title) + len(details)
+        if chunk and (len(chunk) >= LOCATION_BATCH_EVENTS or size + length > LOCATION_BATCH_CHARS):
+            chunks.append(chunk)
+            chunk = {}
+            size = 0
+        chunk[event_id] = (title, details)
+        size += length
+    if chunk:
+        chunks.append(chunk)
+    return chunks
 
 
 class GeminiLocationExtractor:
-    def __init__(self, api_key: str, model_name: str):
-        self.client = genai.Client(api_key=api_key)
+    def __init__(
+        self,
+        api_key: str,
+        model_name: str,
+        client: genai.Client | None = None,
+        memory: TranslationMemory | None = None,
+    ):
+        self.client = client or genai.Client(api_key=api_key)
         self.model_name = model_name
+        self.request_count = 0
+        # Every template is part of the prompt identity, so editing any of them invalidates cached answers
+        prompt = "\n".join((SYSTEM_PROMPT, USER_PROMPT_TEMPLATE, BATCH_PROMPT_TEMPLATE))
+        self.memory = memory.scope("localize", "location", model_name, prompt) if memory is not None else None
 
     def extract_location(self, title: str, details: str) -> str | None:
         """Extract location from event details with retry logic."""
         prompt = USER_PROMPT_TEMPLATE.format(title=title, details=details)
+        if self.memory is not None:
+            remembered = self.memory.get(prompt)
+            if remembered is not None:
+                return remembered
 
         for attempt in range(MAX_RETRIES):
             try:
+                self.request_count += 1
                 response = self.client.models.generate_content(
                     model=self.model_name,
                     contents=prompt,
@@ -27,9 +115,10 @@ class GeminiLocationExtractor:
                         max_output_tokens=100,
                     ),
                 )
-                location = response.text.strip()
-                location = location.strip("\"'").strip()
-                return location if location else "غير محدد"
+                location = clean_location(response.text) or UNKNOWN_LOCATION
+                if self.memory is not None:
+                    self.memory.put(prompt, location)
+                return location
 
             except Exception as e:
                 print(f"  Attempt {attempt + 1}/{MAX_RETRIES} failed: {e}")
@@ -37,3 +126,135 @@ class GeminiLocationExtractor:
                     time.sleep(RETRY_DELAY)
 
         return None
+
+    def _batch_request(self, events: dict[str, tuple[str, str]]) -> tuple[str, types.GenerateContentConfig]:
+        """Build the prompt and config of one structured-output request for several events."""
+        payload = [
+            {"event_id": event_id, "title": title, "details": details}
+            for event_id, (title, details) in events.items()
+        ]
+        prompt = BATCH_PROMPT_TEMPLATE.format(events=json.dumps(payload, ensure_ascii=False, indent=1))
+        config = types.GenerateContentConfig(
+            system_instruction=SYSTEM_PROMPT,
+            temperature=0.1,
+            max_output_tokens=100 * len(events),
+            response_mime_type="application/json",
+            response_schema=BATCH_SCHEMA,
+        )
+        return prompt, config
+
+    def _request_batch(self, events: dict[str, tuple[str, str]]) -> dict[str, str]:
+        """Send one structured-output request for several events."""
+        prompt, config = self._batch_request(events)
+        self.request_count += 1
+        response = self.client.models.generate_content(model=self.model_name, contents=prompt, config=config)
+        return parse_batch_response(response.text, set(events))
+
+    async def _request_batch_async(self, events: dict[str, tuple[str, str]]) -> dict[str, str]:
+        """Send one structured-output request for several events through the async client."""
+        prompt, config = self._batch_request(events)
+        self.request_count += 1
+        response = await self.client.aio.models.generate_content(model=self.model_name, contents=prompt, config=config)
+        return parse_batch_response(response.text, set(events))
+
+    async def _request_single_async(self, prompt: str) -> str:
+        """Send one single-event request through the async client."""
+        self.request_count += 1
+        response = await self.client.aio.models.generate_content(
+            model=self.model_name,
+            contents=prompt,
+            config=types.GenerateContentConfig(
+                system_instruction=SYSTEM_PROMPT,
+                temperature=0.1,
+                max_output_tokens=100,
+            ),
+        )
+        return clean_location(response.text or "") or UNKNOWN_LOCATION
+
+    def extract_locations(self, events: dict[str, tuple[str, str]]) -> dict[str, str]:
+        """
+        Extract the locations of many events, keyed by event_id.
+
+        Events are sent in batches; any event missing from a reply or with an
+        answer that is not a plausible place name falls back to a single
+        extract_location request. Events that still fail are left out.
+        """
+        prompts = {
+            event_id: USER_PROMPT_TEMPLATE.format(title=title, details=details)
+            for event_id, (title, details) in events.items()
+        }
+        results = {}
+        if self.memory is not None:
+            remembered = self.memory.get_many(prompts.values())
+            results = {event_id: remembered[prompt] for event_id, prompt in prompts.items() if prompt in remembered}
+
+        pending = {event_id: texts for event_id, texts in events.items() if event_id not in results}
+        for chunk in chunk_events(pending):
+            try:
+                found = self._request_batch(chunk)
+            except Exception as e:
+                print(f"  Batch of {len(chunk)} events failed: {e}")
+                found = {}
+            if self.memory is not None:
+                self.memory.put_many({prompts[event_id]: location for event_id, location in found.items()})
+            results.update(found)
+
+            for event_id, (title, details) in chunk.items():
+                if event_id not in found:
+                    print(f"    Event {event_id}: no valid answer in batch, asking alone")
+                    location = self.extract_location(title, details)
+                    if location:
+                        results[event_id] = location
+
+        return results
+
+    async def extract_locations_async(
+        self, events: dict[str, tuple[str, str]], limiter: AdaptiveLimiter
+    ) -> dict[str, str]:
+        """
+        Async version of extract_locations that holds a limiter slot per request.
+
+        The fallback single requests of a batch run concurrently, and
+        rate-limited requests are retried without using up an attempt.
+        """
+        prompts = {
+            event_id: USER_PROMPT_TEMPLATE.format(title=title, details=details)
+            for event_id, (title, details) in events.items()
+        }
+        results = {}
+        if self.memory is not None:
+            remembered = self.memory.get_many(prompts.values())
+            results = {event_id: remembered[prompt] for event_id, prompt in prompts.items() if prompt in remembered}
+
+        pending = {event_id: texts for event_id, texts in events.items() if event_id not in results}
+        for chunk in chunk_events(pending):
+            found = await call_limited(
+                limiter,
+                lambda: self._request_batch_async(chunk),
+                1,
+                MAX_THROTTLE_RETRIES,
+                RETRY_DELAY,
+                f"Batch of {len(chunk)} events",
+            ) or {}
+            results.update(found)
+
+            missing = [event_id for event_id in chunk if event_id not in found]
+            for event_id in missing:
+                print(f"    Event {event_id}: no valid answer in batch, asking alone")
+            singles = await asyncio.gather(*(
+                call_limited(
+                    limiter,
+                    lambda prompt=prompts[event_id]: self._request_single_async(prompt),
+                    MAX_RETRIES,
+                    MAX_THROTTLE_RETRIES,
+                    RETRY_DELAY,
+                    f"Event {event_id}",
+                )
+                for event_id in missing
+            ))
+            found.update({event_id: location for event_id, location in zip(missing, singles) if location})
+            results.update(found)
+            if self.memory is not None:
+                self.memory.put_many({prompts[event_id]: location for event_id, location in found.items()})
+
+        return results
@@ -0,0 +1,149 @@
+"""
+Async geocoding runner
+
+Every distinct location is first resolved locally: from the gazetteer,
+then from the translation memory. Only the rest is sent to Gemini, as
+concurrent requests bounded by an AdaptiveLimiter, so throughput follows
+the actual quota rather than a fixed sleep. Names that normalize to the
+same text share one request: a name whose normalized form is already in
+flight waits for that request instead of sending its own. Locations Gemini
+cannot place default to Mecca. Results are handed back in chunks, so the
+caller can checkpoint them while other requests are still running.
+"""
+
+import asyncio
+import json
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+
+from google import genai
+
+from common.limiter import AdaptiveLimiter
+from common.memory import MemoryScope
+
+from .config import DEFAULT_COORDINATES, GEOCODE_CHECKPOINT_EVERY
+from .geocoder import (
+    format_coordinates,
+    geocode_with_gemini,
+    get_reference_coords,
+    normalize_location,
+    parse_coordinates,
+    reference_regions,
+)
+
+
+@dataclass
+class GeocodeStats:
+    """Where each location's coordinates came from."""
+
+    reference: int = 0
+    cache: int = 0
+    llm: int = 0
+    default: int = 0
+    coalesced: int = 0  # llm or default answers shared with a name already in flight
+    requests: int = 0
+
+    def summary(self) -> str:
+        return (f"{self.reference} reference, {self.cache} cache, {self.llm} gemini, "
+                f"{self.default} default (Mecca); {self.requests} locations asked, {self.coalesced} coalesced")
+
+
+class GeocodeRunner:
+    """Resolves locations to "lat,lng" text, sending each normalized name to Gemini at most once."""
+
+    def __init__(
+        self,
+        client: genai.Client,
+        limiter: AdaptiveLimiter,
+        memory: MemoryScope | None = None,
+        on_done: Callable[[dict[str, str]], None] | None = None,
+        checkpoint_every: int = GEOCODE_CHECKPOINT_EVERY,
+    ):
+        self.client = client
+        self.limiter = limiter
+        self.memory = memory
+        self.on_done = on_done
+        self.checkpoint_every = checkpoint_every
+        self.stats = GeocodeStats()
+        self._in_flight: dict[str, asyncio.Task] = {}
+        self._unsaved: dict[str, str] = {}
+        self._answers: dict[str, str] = {}  # new Gemini answers for the translation memory
+
+    def _finish(self, results: dict[str, str]) -> None:
+        """Queue finished locations for the caller, flushing every checkpoint_every."""
+        self._unsaved.update(results)
+        if len(self._unsaved) >= self.checkpoint_every:
+            self.flush()
+
+    def flush(self) -> None:
+        """Hand the unsaved results to on_done and store new answers in the translation memory."""
+        if self._unsaved and self.on_done is not None:
+            self.on_done(self._unsaved)
+        if self._answers and self.memory is not None:
+            self.memory.put_many(self._answers)
+        self._unsaved = {}
+        self._answers = {}
+
+    def resolve_local(self, locations: Iterable[str]) -> tuple[dict[str, str], list[str]]:
+        """Resolve locations from the gazetteer and the translation memory, returning the rest."""
+        resolved = {}
+        remaining = []
+        for location in locations:
+            coords = get_reference_coords(location)
+            if coords:
+                resolved[location] = format_coordinates(coords)
+                self.stats.reference += 1
+            else:
+                remaining.append(location)
+
+        if self.memory is not None and remaining:
+            for location, answer in self.memory.get_many(remaining).items():
+                coords = parse_coordinates(answer, reference_regions(location))
+                if coords:
+                    resolved[location] = format_coordinates(coords)
+                    self.stats.cache += 1
+            remaining = [location for location in remaining if location not in resolved]
+        return resolved, remaining
+
+    async def _request(self, location: str) -> tuple[float, float] | None:
+        self.stats.requests += 1
+        return await geocode_with_gemini(self.client, location, self.limiter)
+
+    async def geocode(self, location: str) -> str:
+        """Geocode one location with Gemini, joining a request in flight for the same normalized name."""
+        key = normalize_location(location) or location
+        task = self._in_flight.get(key)
+        if task is None:
+            task = self._in_flight[key] = asyncio.create_task(self._request(location))
+        else:
+            self.stats.coalesced += 1
+        coords = await task
+
+        if coords is None:
+            self.stats.default += 1
+            return DEFAULT_COORDINATES
+        self.stats.llm += 1
+        self._answers[location] = json.dumps({"lat": coords[0], "lng": coords[1]})
+        return format_coordinates(coords)
+
+    async def run(self, locations: Iterable[str]) -> dict[str, str]:
+        """Geocode every distinct location, local hits first, and return {location: "lat,lng"}."""
+        resolved, remaining = self.resolve_local(dict.fromkeys(locations))
+        self._finish(resolved)
+        print(f"  Resolved {len(resolved)} locations locally, asking Gemini for {len(remaining)}")
+
+        done = 0
+
+        async def geocode_one(location: str) -> None:
+            nonlocal done
+            resolved[location] = await self.geocode(location)
+            self._finish({location: resolved[location]})
+            done += 1
+            print(f"  [{done}/{len(remaining)}] {location} -> {resolved[location]} ({self.limiter.summary()})")
+
+        try:
+            await asyncio.gather(*(geocode_one(location) for location in remaining))
+        finally:
+            self.flush()
+        return resolved
+
@@ -0,0 +1,136 @@
+"""
+Coordinates of place names
+
+Places in the gazetteer are resolved locally. Other places are asked to
+Gemini, and answers are only accepted inside the region of interest, on
+land, and in the region the place is known to be in: the one a land named
+in it stands for ("بصرى الشام"), or that of a weaker gazetteer match.
+"""
+
+import json
+import re
+from functools import cache
+
+from google import genai
+from google.genai import types
+
+from common.limiter import AdaptiveLimiter, call_limited
+
+from .config import (
+    MAX_RETRIES,
+    MAX_THROTTLE_RETRIES,
+    MODEL_NAME,
+    REFERENCE_MIN_SIMILARITY,
+    REGION_HINTS,
+    RETRY_DELAY,
+)
+from .gazetteer import Gazetteer, normalize_arabic
+from .regions import get_region_index
+
+GEOCODE_PROMPT = """أنت خبير في الجغرافيا التاريخية الإسلامية.
+أعطني الإحداثيات الجغرافية (خط العرض وخط الطول) للمكان التالي.
+
+أمثلة مرجعية:
+- مكة المكرمة: {{"lat": 21.4225, "lng": 39.8262}}
+- المدينة المنورة: {{"lat": 24.4686, "lng": 39.6142}}
+- غار حراء: {{"lat": 21.4573, "lng": 39.8593}}
+- بدر: {{"lat": 23.7667, "lng": 38.7917}}
+- أحد: {{"lat": 24.5036, "lng": 39.6136}}
+- الحبشة: {{"lat": 9.0, "lng": 38.75}}
+- بصرى الشام: {{"lat": 32.5167, "lng": 36.4833}}
+
+القواعد:
+1. أجب فقط بصيغة JSON: {{"lat": رقم, "lng": رقم}}
+2. إذا كان المكان جزءاً من مدينة معروفة، أعط إحداثيات المدينة
+3. إذا لم تعرف المكان بالضبط، أعط أقرب تقدير معقول
+4. لا تضف أي نص إضافي
+
+المكان: {location}
+
+الإحداثيات:"""
+
+
+@cache
+def get_gazetteer() -> Gazetteer:
+    """Load the gazetteer of verified places once."""
+    return Gazetteer.load()
+
+
+def normalize_location(location: str) -> str:
+    """Normalize location name for matching."""
+    return normalize_arabic(location)
+
+
+def get_reference_coords(location: str) -> tuple[float, float] | None:
+    """Check if location matches a place in the gazetteer."""
+    match = get_gazetteer().lookup(location)
+    if match is None:
+        return None
+    return (match.place.lat, match.place.lng)
+
+
+def reference_regions(location: str) -> tuple[str, ...] | None:
+    """Names of the regions a location must fall in, or None if nothing tells."""
+    words = normalize_arabic(location).split()
+    for land, regions in REGION_HINTS.items():
+        if normalize_arabic(land) in words:
+            return regions
+    match = get_gazetteer().lookup(location, REFERENCE_MIN_SIMILARITY)
+    if match is None:
+        return None
+    region = get_region_index().locate(match.place.lat, match.place.lng)
+    return tuple(region.names) if region and region.names else None
+
+
+def parse_coordinates(response_text: str, regions: tuple[str, ...] | None = None) -> tuple[float, float] | None:
+    """
+    Parse JSON coordinates from Gemini response, rejecting points in the
+    sea and, when `regions` are given, points outside all of them.
+    """
+    try:
+        # Try to extract JSON from response
+        json_match = re.search(r'\{[^}]+\}', response_text)
+        if json_match:
+            data = json.loads(json_match.group())
+            lat = float(data.get("lat", 0))
+            lng = float(data.get("lng", 0))
+
+            # Validate bounds (Arabia + surrounding regions), and that the point is on land
+            if not (5 <= lat <= 45 and 25 <= lng <= 60 and get_region_index().is_on_land(lat, lng)):
+                return None
+            if regions and not get_region_index().is_within(lat, lng, regions):
+                return None
+            return (lat, lng)
+    except (json.JSONDecodeError, ValueError, TypeError):
+        pass
+    return None
+
+
+def format_coordinates(coords: tuple[float, float]) -> str:
+    """Format coordinates as stored in the geo_coordinates column."""
+    return f"{coords[0]},{coords[1]}"
+
+
+async def geocode_with_gemini(
+    client: genai.Client, location: str, limiter: AdaptiveLimiter, model_name: str = MODEL_NAME
+) -> tuple[float, float] | None:
+    """
+    Ask Gemini for the coordinates of a location, holding a limiter slot per request.
+
+    Replies without valid coordinates, or with coordinates outside the
+    location's reference regions, count as failed attempts. Returns None if
+    no attempt gave valid coordinates.
+    """
+    prompt = GEOCODE_PROMPT.format(location=location)
+    regions = reference_regions(location)
+    config = types.GenerateContentConfig(temperature=0.1, max_output_tokens=100)
+
+    async def request() -> tuple[float, float]:
+        response = await client.aio.models.generate_content(model=model_name, contents=prompt, config=config)
+        coords = parse_coordinates(response.text or "", regions)
+        if coords is None:
+            expected = f" in {' / '.join(regions)}" if regions else ""
+            raise ValueError(f"no valid coordinates{expected} in {response.text!r}")
+        return coords
+
+    return await call_limited(limiter, request, MAX_RETRIES, MAX_THROTTLE_RETRIES, RETRY_DELAY, location)
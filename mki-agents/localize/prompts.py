@@ -15,3 +15,9 @@ USER_PROMPT_TEMPLATE = """استخرج اسم المكان الرئيسي من 
 تفاصيل الحدث: {details}
 
 اسم المكان:"""
+
+BATCH_PROMPT_TEMPLATE = """استخرج اسم المكان الرئيسي لكل حدث تاريخي في مصفوفة JSON التالية.
+أجب بمصفوفة JSON تحتوي لكل حدث على "event_id" نفسه واسم المكان في "location".
+لا تُغفل أي حدث.
+
+{events}"""
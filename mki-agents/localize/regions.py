@@ -0,0 +1,114 @@
+"""
+Spatial index over the historical world borders
+
+Loads a historical-basemaps FeatureCollection (world_500.geojson by
+default, the map shown on the site) into a shapely STRtree once, and
+answers point-in-polygon queries against it, one point or many at a time.
+Geocoding uses it to reject coordinates that land in the sea or outside
+the region a place is known to be in, and to annotate each event with the
+historical region it falls in. Land the map leaves unnamed (Arabia among
+it) is labelled from UNNAMED_REGIONS.
+"""
+
+import json
+from collections.abc import Iterable
+from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
+
+import numpy as np
+import shapely
+from shapely import STRtree
+
+from .config import COAST_TOLERANCE, REGIONS_GEOJSON, UNNAMED_REGIONS
+
+
+@dataclass(frozen=True)
+class Region:
+    """A polygon of the historical map and its names."""
+
+    name: str | None  # NAME, or ABBREVN like the site's map labels, or a label from UNNAMED_REGIONS
+    part_of: str | None
+    subject_to: str | None
+    area: float
+
+    @property
+    def names(self) -> set[str]:
+        """Every name the region goes by, including the realm it belongs to."""
+        return {name for name in (self.name, self.part_of, self.subject_to) if name}
+
+
+class RegionIndex:
+    """STRtree of historical region polygons."""
+
+    def __init__(self, path: Path = REGIONS_GEOJSON):
+        with open(path, "r", encoding="utf-8") as f:
+            features = json.load(f)["features"]
+
+        self.geometries = np.array([shapely.from_geojson(json.dumps(f["geometry"])) for f in features])
+        shapely.prepare(self.geometries)
+        self.tree = STRtree(self.geometries)
+
+        names = [f["properties"].get("NAME") or f["properties"].get("ABBREVN") for f in features]
+        for label, (lat, lng) in UNNAMED_REGIONS.items():
+            for i in self.tree.query(shapely.points(lng, lat), predicate="intersects"):
+                if names[i] is None:
+                    names[i] = label
+        self.regions = [
+            Region(
+                name=name,
+                part_of=f["properties"].get("PARTOF"),
+                subject_to=f["properties"].get("SUBJECTO"),
+                area=float(geometry.area),
+            )
+            for f, name, geometry in zip(features, names, self.geometries)
+        ]
+
+    def _best(self, candidates: list[int]) -> Region | None:
+        """Prefer named regions, then the smallest (most specific) one."""
+        if not candidates:
+            return None
+        return min((self.regions[i] for i in candidates), key=lambda r: (r.name is None, r.area))
+
+    def locate(self, lat: float, lng: float) -> Region | None:
+        """Get the region containing a point, or None if it is in the sea."""
+        return self.locate_many([lat], [lng])[0]
+
+    def _candidates(self, lats, lngs) -> list[list[int]]:
+        """Indexes of the polygons each point falls in.
+
+        Points just off the (coarse) coastline are matched to the nearest
+        polygon within COAST_TOLERANCE degrees.
+        """
+        points = shapely.points(np.asarray(lngs, dtype=float), np.asarray(lats, dtype=float))
+        candidates: list[list[int]] = [[] for _ in range(len(points))]
+
+        point_idx, geom_idx = self.tree.query(points, predicate="intersects")
+        for p, g in zip(point_idx, geom_idx):
+            candidates[p].append(g)
+
+        offshore = np.array([i for i, found in enumerate(candidates) if not found], dtype=int)
+        if len(offshore):
+            near_idx, geom_idx = self.tree.query_nearest(points[offshore], max_distance=COAST_TOLERANCE)
+            for p, g in zip(near_idx, geom_idx):
+                candidates[offshore[p]].append(g)
+        return candidates
+
+    def locate_many(self, lats, lngs) -> list[Region | None]:
+        """Get the region of many points at once."""
+        return [self._best(found) for found in self._candidates(lats, lngs)]
+
+    def is_within(self, lat: float, lng: float, names: Iterable[str]) -> bool:
+        """Check whether a point falls in a region going by any of the names."""
+        names = set(names)
+        return any(self.regions[i].names & names for i in self._candidates([lat], [lng])[0])
+
+    def is_on_land(self, lat: float, lng: float) -> bool:
+        """Check whether a point falls on any land polygon."""
+        return self.locate(lat, lng) is not None
+
+
+@cache
+def get_region_index(path: Path = REGIONS_GEOJSON) -> RegionIndex:
+    """Load a region index once per file."""
+    return RegionIndex(path)
@@ -0,0 +1,37 @@
+import unittest
+
+from localize.gazetteer import Gazetteer
+
+
+class GazetteerTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.gazetteer = Gazetteer.load()
+
+    def assertResolves(self, name: str, place: str, method: str):
+        match = self.gazetteer.lookup(name)
+        self.assertIsNotNone(match, name)
+        self.assertEqual((match.place.name, match.method), (place, method))
+
+    def test_spelling_variants(self):
+        self.assertResolves("أُحُدٍ", "أحد", "exact")
+        self.assertResolves("المدينة", "المدينة المنورة", "exact")
+        self.assertResolves("غزوة بدر الكبرى", "بدر", "contained")
+
+    def test_generic_noun_is_not_a_place_inside_a_name(self):
+        # "مدينة" is "city"; only the whole name "المدينة" means Medina
+        self.assertIsNone(self.gazetteer.lookup("مدينة بغداد"))
+        self.assertIsNone(self.gazetteer.lookup("مدينة دمشق"))
+
+    def test_specific_place_wins_over_generic_noun(self):
+        self.assertResolves("مدينة الطائف", "الطائف", "contained")
+
+    def test_generic_noun_is_not_a_fuzzy_match(self):
+        self.assertIsNone(self.gazetteer.lookup("مدينة بغداد", min_similarity=0.5))
+
+    def test_generic_noun_is_not_a_prefix(self):
+        self.assertIsNone(self.gazetteer.lookup("الغار"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,30 @@
+import sqlite3
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from common.memory import TranslationMemory
+
+
+class TranslationMemoryTest(unittest.TestCase):
+    def test_put_waits_for_another_writer(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "memory.sqlite3"
+            memory = TranslationMemory(path)
+            scope = memory.scope("translate", "en", "model", "prompt")
+
+            # Another shard's process holding the write lock for longer than
+            # sqlite3's default 5 s busy timeout
+            writer = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+            writer.execute("BEGIN IMMEDIATE")
+            threading.Timer(6, writer.execute, ("COMMIT",)).start()
+
+            scope.put("نص", "text")
+            writer.close()
+            self.assertEqual(scope.get("نص"), "text")
+            memory.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import dataclasses
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+
+from localize.geocode_locations import annotate_regions
+
+# The incremental merge lives in mki-etl, next to this package
+sys.path.append(str(Path(__file__).resolve().parents[2] / "mki-etl"))
+try:
+    from dorar.incremental import load_previous, update_events
+    from dorar.profiles import SEERA
+except ImportError:
+    SEERA = None
+
+
+@unittest.skipIf(SEERA is None, "mki-etl and its dependencies are not importable")
+class RegionMergeTest(unittest.TestCase):
+    def event(self, event_id: int, title: str) -> dict:
+        row = dict.fromkeys(SEERA.columns, "")
+        row.update(event_id=event_id, title=title, source_url=f"https://dorar.net/history/event/{event_id}")
+        return row
+
+    def test_incremental_rescrape_keeps_region(self):
+        with tempfile.TemporaryDirectory() as directory:
+            profile = dataclasses.replace(SEERA, output_file=Path(directory) / "seera_events.csv")
+            df = pd.DataFrame([self.event(1, "old"), self.event(2, "kept")])
+            df["geo_coordinates"] = ["24.47,39.61", "21.42,39.83"]
+            df["region"] = annotate_regions(df["geo_coordinates"])
+            df.to_csv(profile.output_file, index=False, encoding="utf-8-sig")
+
+            crawl = mock.AsyncMock(return_value=([self.event(1, "new")], []))
+            with mock.patch("dorar.incremental.crawl_incremental", crawl), redirect_stdout(StringIO()):
+                update_events(profile, load_previous(profile.output_file))
+
+            merged = pd.read_csv(profile.output_file, dtype=str, encoding="utf-8-sig")
+        self.assertEqual(list(merged["title"]), ["new", "kept"])
+        self.assertEqual(list(merged["geo_coordinates"]), ["24.47,39.61", "21.42,39.83"])
+        self.assertEqual(list(merged["region"]), ["Arabia", "Arabia"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,27 @@
+import unittest
+
+from localize.geocoder import parse_coordinates, reference_regions
+from localize.regions import get_region_index
+
+
+class RegionsTest(unittest.TestCase):
+    def test_unnamed_land_is_labelled(self):
+        index = get_region_index()
+        self.assertEqual(index.locate(24.47, 39.61).name, "Arabia")
+        self.assertEqual(index.locate(21.42, 39.83).name, "Arabia")
+
+    def test_point_in_the_sea_is_rejected(self):
+        self.assertIsNone(parse_coordinates('{"lat": 22.0, "lng": 38.0}'))
+
+    def test_point_in_the_wrong_region_is_rejected(self):
+        regions = reference_regions("قرية بالشام")
+        self.assertEqual(parse_coordinates('{"lat": 33.5, "lng": 36.3}', regions), (33.5, 36.3))
+        self.assertIsNone(parse_coordinates('{"lat": 24.47, "lng": 39.61}', regions))
+
+    def test_unknown_region_accepts_any_land(self):
+        self.assertIsNone(reference_regions("مدينة بغداد"))
+        self.assertEqual(parse_coordinates('{"lat": 33.3, "lng": 44.4}'), (33.3, 44.4))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Output Assembly Benchmark on Synthetic Events
+
+Builds synthetic source events and stored translations of increasing size,
+assembles the translated output with the columnar build_output and with
+the previous row-by-row loop, checks that both agree, and reports the time
+per row of each. The per-row time of build_output should stay flat as the
+dataset grows.
+
+Usage:
+    uv run python -m translate.benchmark_output
+    uv run python -m translate.benchmark_output --rows 25000 50000 100000 --no-rowwise
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from common.progress import ProgressStore
+
+from .config import TRANSLATE_COLUMNS
+from .translate_seera import build_output
+
+
+def build_output_rowwise(df: pd.DataFrame, translations: dict) -> pd.DataFrame:
+    """The previous row-by-row assembly, kept as the baseline."""
+    output_rows = []
+    for _, row in df.iterrows():
+        event_id = str(row["event_id"])
+        new_row = row.to_dict()
+        if event_id in translations:
+            for col in TRANSLATE_COLUMNS:
+                if col in translations[event_id]:
+                    new_row[col] = translations[event_id][col]
+        output_rows.append(new_row)
+    return pd.DataFrame(output_rows)
+
+
+def synthetic_events(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Make source events shaped like history_events.csv."""
+    rng = np.random.default_rng(seed)
+    ids = np.arange(1, rows + 1)
+    return pd.DataFrame({
+        "event_id": ids,
+        "title": [f"حدث رقم {i}" for i in ids],
+        "hijri_year": rng.integers(1, 1400, rows).astype(str),
+        "lunar_month": rng.choice(["محرم", "صفر", "رجب", "شعبان", "رمضان"], rows),
+        "gregorian_year": rng.integers(600, 2000, rows).astype(str),
+        "details": [f"تفاصيل الحدث {i} " * 8 for i in ids],
+        "source_url": [f"https://dorar.net/history/event/{i}" for i in ids],
+        "location_name": rng.choice(["مكة المكرمة", "المدينة المنورة", "بغداد", "دمشق", "غير محدد"], rows),
+        "geo_coordinates": "21.4225,39.8262",
+    })
+
+
+def store_translations(store: ProgressStore, df: pd.DataFrame, fraction: float = 0.9) -> None:
+    """Record translations for most events, leaving the rest untranslated."""
+    translated = df.head(int(len(df) * fraction))
+    store.put_many({
+        str(event_id): {col: f"EN {value}" for col, value in zip(TRANSLATE_COLUMNS, values)}
+        for event_id, *values in translated[["event_id", *TRANSLATE_COLUMNS]].itertuples(index=False)
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark translated output assembly on synthetic events")
+    parser.add_argument("--rows", type=int, nargs="+", default=[25_000, 50_000, 100_000], help="Dataset sizes")
+    parser.add_argument("--no-rowwise", action="store_true", help="Skip the slow row-by-row baseline")
+    args = parser.parse_args()
+
+    print(f"{'rows':>8}  {'columnar':>10}  {'per row':>9}  {'row-by-row':>10}  {'per row':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            df = synthetic_events(rows)
+            store = ProgressStore(Path(tmp) / f"bench_{rows}.sqlite3", "en")
+            store_translations(store, df)
+
+            started = time.perf_counter()
+            output = build_output(df, store.to_frame(TRANSLATE_COLUMNS))
+            columnar = time.perf_counter() - started
+
+            line = f"{rows:>8}  {columnar:>9.3f}s  {columnar / rows * 1e6:>7.2f}us"
+            if not args.no_rowwise:
+                started = time.perf_counter()
+                baseline = build_output_rowwise(df, store.items())
+                rowwise = time.perf_counter() - started
+                pd.testing.assert_frame_equal(output, baseline, check_dtype=False)
+                line += f"  {rowwise:>9.3f}s  {rowwise / rows * 1e6:>7.2f}us"
+            print(line)
+            store.close()
+
+
+if __name__ == "__main__":
+    main()
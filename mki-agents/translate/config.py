@@ -1,10 +1,13 @@
 from pathlib import Path
 
+from common.config import PROGRESS_DIR
+
 # Paths
 AGENT_DIR = Path(__file__).parent
 PROJECT_ROOT = AGENT_DIR.parent.parent  # mki-agents -> mki
 INPUT_CSV = PROJECT_ROOT / "mki-datasets" / "seera" / "seera_events.csv"
 OUTPUT_DIR = PROJECT_ROOT / "mki-datasets" / "seera"
+MERGED_CSV = OUTPUT_DIR / "seera_events_all.csv"  # Arabic plus every translation, with a locale column
 
 # Supported languages
 SUPPORTED_LANGUAGES = {
@@ -18,19 +21,29 @@ def get_output_csv(lang: str) -> Path:
     return OUTPUT_DIR / f"seera_events_{lang}.csv"
 
 
-def get_progress_file(lang: str) -> Path:
-    """Get progress file path for a given language."""
+# Progress store, one namespace per language
+PROGRESS_DB = PROGRESS_DIR / "translate.sqlite3"
+
+
+def get_legacy_progress_file(lang: str) -> Path:
+    """Get the JSON progress file used before the progress store, for a given language."""
     return AGENT_DIR / f".progress_{lang}.json"
 
 
 # API Settings
 MODEL_NAME = "gemini-2.5-flash-lite"
-REQUEST_DELAY = 0.5  # seconds between API calls
 MAX_RETRIES = 3
 RETRY_DELAY = 2.0  # seconds between retries
 
-# Batch settings
-BATCH_SIZE = 10  # Save progress every N events
+# Concurrency settings (requests in flight adapt to the quota between these bounds)
+MAX_CONCURRENCY = 8
+MIN_CONCURRENCY = 1
+MAX_THROTTLE_RETRIES = 10  # rate-limited retries that don't count towards MAX_RETRIES
+
+# Batch settings (progress is saved after every batch)
+TRANSLATE_BATCH_EVENTS = 20  # events packed into one request
+TRANSLATE_BATCH_CHARS = 20_000  # source characters per request, to stay within the output limit
+BATCH_MAX_OUTPUT_TOKENS = 32_768
 
 # Columns to translate
 TRANSLATE_COLUMNS = ["title", "details", "location_name"]
@@ -1,30 +1,105 @@
+import asyncio
+import json
 import time
 
 from google import genai
 from google.genai import types
 
-from .config import MAX_RETRIES, RETRY_DELAY
+from common.limiter import AdaptiveLimiter, is_rate_limited
+from common.memory import TranslationMemory
+
+from .config import BATCH_MAX_OUTPUT_TOKENS, MAX_RETRIES, MAX_THROTTLE_RETRIES, RETRY_DELAY, TRANSLATE_BATCH_CHARS
 from .prompts import get_prompts
 
+# (event_id, column) of one text in a batch
+BatchKey = tuple[str, str]
+
+BATCH_SCHEMA = types.Schema(
+    type=types.Type.ARRAY,
+    items=types.Schema(
+        type=types.Type.OBJECT,
+        properties={
+            "event_id": types.Schema(type=types.Type.STRING),
+            "column": types.Schema(type=types.Type.STRING),
+            "translation": types.Schema(type=types.Type.STRING),
+        },
+        required=["event_id", "column", "translation"],
+    ),
+)
+
+
+def chunk_items(items: dict[BatchKey, str], max_chars: int = TRANSLATE_BATCH_CHARS) -> list[dict[BatchKey, str]]:
+    """Split batch items into requests of at most max_chars source characters."""
+    chunks = []
+    chunk = {}
+    size = 0
+    for key, text in items.items():
+        if chunk and size + len(text) > max_chars:
+            chunks.append(chunk)
+            chunk = {}
+            size = 0
+        chunk[key] = text
+        size += len(text)
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def parse_batch_response(response_text: str, expected: dict[BatchKey, str]) -> dict[BatchKey, str]:
+    """Parse a batch reply, keeping only non-empty translations of expected keys."""
+    try:
+        data = json.loads(response_text)
+    except (json.JSONDecodeError, TypeError):
+        return {}
+    if not isinstance(data, list):
+        return {}
+
+    results = {}
+    for item in data:
+        if not isinstance(item, dict):
+            continue
+        key = (str(item.get("event_id", "")), str(item.get("column", "")))
+        translation = item.get("translation")
+        if key in expected and isinstance(translation, str) and translation.strip():
+            results[key] = translation.strip()
+    return results
+
 
 class GeminiTranslator:
-    def __init__(self, api_key: str, model_name: str, lang: str):
-        self.client = genai.Client(api_key=api_key)
+    def __init__(
+        self,
+        api_key: str,
+        model_name: str,
+        lang: str,
+        client: genai.Client | None = None,
+        memory: TranslationMemory | None = None,
+    ):
+        self.client = client or genai.Client(api_key=api_key)
         self.model_name = model_name
         self.lang = lang
         prompts = get_prompts(lang)
         self.system_prompt = prompts["system"]
         self.user_template = prompts["user_template"]
+        self.batch_template = prompts["batch_template"]
+        self.request_count = 0
+        # Every template is part of the prompt identity, so editing any of them invalidates cached answers
+        prompt = "\n".join((self.system_prompt, self.user_template, self.batch_template))
+        self.memory = memory.scope("translate", lang, model_name, prompt) if memory is not None else None
 
     def translate_text(self, text: str) -> str | None:
         """Translate Arabic text to target language with retry logic."""
         if not text or not text.strip():
             return text
+        if self.memory is not None:
+            remembered = self.memory.get(text)
+            if remembered is not None:
+                return remembered
 
         prompt = self.user_template.format(text=text)
 
         for attempt in range(MAX_RETRIES):
             try:
+                self.request_count += 1
                 response = self.client.models.generate_content(
                     model=self.model_name,
                     contents=prompt,
@@ -35,7 +110,11 @@ class GeminiTranslator:
                     ),
                 )
                 translation = response.text.strip()
-                return translation if translation else text
+                if not translation:
+                    return text
+                if self.memory is not None:
+                    self.memory.put(text, translation)
+                return translation
 
             except Exception as e:
                 print(f"  Attempt {attempt + 1}/{MAX_RETRIES} failed: {e}")
@@ -43,3 +122,136 @@ class GeminiTranslator:
                     time.sleep(RETRY_DELAY)
 
         return None
+
+    def _lookup(self, items: dict[BatchKey, str]) -> tuple[dict[BatchKey, str], dict[str, str]]:
+        """
+        Find the texts that need a request.
+
+        Returns one item per distinct text that is neither blank nor in the
+        translation memory, and the translations already known by text.
+        """
+        known = {text: text for text in items.values() if not text or not text.strip()}
+        if self.memory is not None:
+            known.update(self.memory.get_many({text for text in items.values() if text not in known}))
+
+        pending = {}
+        queued = set()
+        for key, text in items.items():
+            if text not in known and text not in queued:
+                pending[key] = text
+                queued.add(text)
+        return pending, known
+
+    def _resolve(
+        self,
+        items: dict[BatchKey, str],
+        known: dict[str, str],
+        sent: dict[BatchKey, str],
+        translated: dict[BatchKey, str],
+    ) -> dict[BatchKey, str]:
+        """Remember new translations and map every item whose text was translated."""
+        new = {sent[key]: translation for key, translation in translated.items()}
+        if self.memory is not None:
+            self.memory.put_many(new)
+        known = {**known, **new}
+        return {key: known[text] for key, text in items.items() if text in known}
+
+    def _batch_request(self, items: dict[BatchKey, str]) -> tuple[str, types.GenerateContentConfig]:
+        """Build the prompt and config of one structured-output batch request."""
+        payload = [{"event_id": event_id, "column": col, "text": text} for (event_id, col), text in items.items()]
+        prompt = self.batch_template.format(items=json.dumps(payload, ensure_ascii=False, indent=1))
+        config = types.GenerateContentConfig(
+            system_instruction=self.system_prompt,
+            temperature=0.3,
+            max_output_tokens=BATCH_MAX_OUTPUT_TOKENS,
+            response_mime_type="application/json",
+            response_schema=BATCH_SCHEMA,
+        )
+        return prompt, config
+
+    def _request_batch(self, items: dict[BatchKey, str]) -> str:
+        """Send one batch request."""
+        prompt, config = self._batch_request(items)
+        self.request_count += 1
+        response = self.client.models.generate_content(model=self.model_name, contents=prompt, config=config)
+        return response.text
+
+    async def _request_batch_async(self, items: dict[BatchKey, str]) -> str:
+        """Send one batch request through the async client."""
+        prompt, config = self._batch_request(items)
+        self.request_count += 1
+        response = await self.client.aio.models.generate_content(model=self.model_name, contents=prompt, config=config)
+        return response.text
+
+    def translate_batch(self, items: dict[BatchKey, str]) -> dict[BatchKey, str]:
+        """
+        Translate many (event_id, column) texts with as few requests as possible.
+
+        Texts found in the translation memory are not sent, and repeated
+        texts are sent once. Each attempt only resends the items missing from
+        the previous replies. Items still missing after MAX_RETRIES attempts
+        are left out of the result, so the caller can decide how to handle them.
+        """
+        pending, known = self._lookup(items)
+        sent = pending
+        results = {}
+
+        for attempt in range(MAX_RETRIES):
+            if not pending:
+                break
+            for chunk in chunk_items(pending):
+                try:
+                    results.update(parse_batch_response(self._request_batch(chunk), chunk))
+                except Exception as e:
+                    print(f"  Batch of {len(chunk)} items failed: {e}")
+
+            pending = {key: text for key, text in pending.items() if key not in results}
+            if pending:
+                print(f"  Attempt {attempt + 1}/{MAX_RETRIES}: {len(pending)} items missing")
+                if attempt < MAX_RETRIES - 1:
+                    time.sleep(RETRY_DELAY)
+
+        return self._resolve(items, known, sent, results)
+
+    async def translate_batch_async(self, items: dict[BatchKey, str], limiter: AdaptiveLimiter) -> dict[BatchKey, str]:
+        """
+        Async version of translate_batch that holds a limiter slot per request.
+
+        Rate-limited requests are retried after the limiter's cooldown without
+        using up one of the MAX_RETRIES attempts (up to MAX_THROTTLE_RETRIES).
+        """
+        pending, known = self._lookup(items)
+        sent = pending
+        results = {}
+        attempt = 0
+        throttle_retries = 0
+
+        while pending and attempt < MAX_RETRIES:
+            throttled = False
+            for chunk in chunk_items(pending):
+                async with limiter:
+                    try:
+                        reply = await self._request_batch_async(chunk)
+                    except Exception as e:
+                        if is_rate_limited(e):
+                            limiter.on_rate_limited()
+                            throttled = True
+                        else:
+                            print(f"  Batch of {len(chunk)} items failed: {e}")
+                        continue
+                limiter.on_success()
+                results.update(parse_batch_response(reply, chunk))
+
+            pending = {key: text for key, text in pending.items() if key not in results}
+            if not pending:
+                break
+            if throttled and throttle_retries < MAX_THROTTLE_RETRIES:
+                throttle_retries += 1
+                continue
+
+            attempt += 1
+            print(f"  Attempt {attempt}/{MAX_RETRIES}: {len(pending)} items missing")
+            if attempt < MAX_RETRIES:
+                await asyncio.sleep(RETRY_DELAY)
+
+        return self._resolve(items, known, sent, results)
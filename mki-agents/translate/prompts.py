@@ -15,6 +15,12 @@ USER_PROMPT_TEMPLATE_FR = """Traduis le texte arabe suivant en français:
 
 Traduction française:"""
 
+BATCH_PROMPT_TEMPLATE_FR = """Traduis en français le champ "text" de chaque élément du tableau JSON suivant.
+Réponds par un tableau JSON contenant, pour chaque élément, les mêmes "event_id" et "column"
+et la traduction dans "translation". N'omets aucun élément.
+
+{items}"""
+
 # English prompts
 SYSTEM_PROMPT_EN = """You are an expert translator specialized in Islamic history and Arabic religious texts.
 Your task is to translate Arabic texts into English accurately and faithfully.
@@ -32,15 +38,23 @@ USER_PROMPT_TEMPLATE_EN = """Translate the following Arabic text into English:
 
 English translation:"""
 
+BATCH_PROMPT_TEMPLATE_EN = """Translate the "text" field of every item in the following JSON array into English.
+Reply with a JSON array holding, for each item, the same "event_id" and "column"
+and the translation in "translation". Do not leave out any item.
+
+{items}"""
+
 # Prompt mapping by language code
 PROMPTS = {
     "fr": {
         "system": SYSTEM_PROMPT_FR,
         "user_template": USER_PROMPT_TEMPLATE_FR,
+        "batch_template": BATCH_PROMPT_TEMPLATE_FR,
     },
     "en": {
         "system": SYSTEM_PROMPT_EN,
         "user_template": USER_PROMPT_TEMPLATE_EN,
+        "batch_template": BATCH_PROMPT_TEMPLATE_EN,
     },
 }
 
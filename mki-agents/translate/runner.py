@@ -0,0 +1,72 @@
+"""
+Async translation runner
+
+Events are grouped into batches, and every (language, batch) job goes
+through one shared work queue drained by concurrent workers using the
+async genai client. An AdaptiveLimiter bounds the requests in flight, so
+throughput follows the actual quota rather than a fixed sleep, and adding
+a language adds jobs to the same queue instead of another serial run.
+Each job's results are handed back as soon as it finishes, so the caller
+can checkpoint them while the other jobs are still running.
+"""
+
+from collections.abc import Callable
+from itertools import zip_longest
+
+from common.jobs import run_queue
+from common.limiter import AdaptiveLimiter
+
+from .config import TRANSLATE_BATCH_EVENTS, TRANSLATE_COLUMNS
+from .gemini_client import GeminiTranslator
+
+
+async def translate_events(
+    translators: dict[str, GeminiTranslator],
+    pending: dict[str, list[dict]],
+    limiter: AdaptiveLimiter,
+    on_done: Callable[[str, dict[str, dict]], None],
+    columns: list[str] = TRANSLATE_COLUMNS,
+    batch_events: int = TRANSLATE_BATCH_EVENTS,
+) -> None:
+    """
+    Translate events into several languages concurrently, batch by batch.
+
+    `pending` maps each language to the events still to translate, as dicts
+    with a string event_id and the source text of each column. `on_done`
+    receives the language and {event_id: {column: translation}} for every
+    finished batch; texts that could not be translated keep their original.
+    """
+    per_lang = [
+        [(lang, events[i:i + batch_events]) for i in range(0, len(events), batch_events)]
+        for lang, events in pending.items()
+    ]
+    # Interleave languages so each one makes progress from the start
+    jobs = [job for round_jobs in zip_longest(*per_lang) for job in round_jobs if job is not None]
+
+    total = sum(len(events) for events in pending.values())
+    done = 0
+
+    async def run_job(job: tuple[str, list[dict]]) -> None:
+        nonlocal done
+        lang, batch = job
+        translator = translators[lang]
+        items = {(event["event_id"], col): event[col] for event in batch for col in columns}
+        translated = await translator.translate_batch_async(items, limiter)
+
+        results = {}
+        for event in batch:
+            event_id = event["event_id"]
+            results[event_id] = {}
+            for col in columns:
+                key = (event_id, col)
+                if key not in translated:
+                    print(f"    FAILED to translate '{col}' of event {event_id} ({lang})")
+                results[event_id][col] = translated.get(key, items[key])  # Keep original on failure
+
+        done += len(batch)
+        requests = sum(t.request_count for t in translators.values())
+        print(f"  [{done}/{total}] {lang}: events {batch[0]['event_id']}-{batch[-1]['event_id']} done "
+              f"({requests} requests, {limiter.summary()})")
+        on_done(lang, results)
+
+    await run_queue(jobs, run_job, limiter.max_concurrency)
@@ -2,65 +2,151 @@
 """
 Translation Agent for Seera Events
 
-Translates seera_events.csv from Arabic to target language using Google Gemini API.
-Keeps the exact same CSV structure.
+Translates seera_events.csv from Arabic to target languages using Google Gemini API.
+Keeps the exact same CSV structure, and writes seera_events_all.csv with
+the Arabic source and every translation tagged by locale.
 
 Usage:
-    uv run python -m translate.translate_seera --lang en  # English
-    uv run python -m translate.translate_seera --lang fr  # French
+    uv run python -m translate.translate_seera --lang en     # English
+    uv run python -m translate.translate_seera --lang fr     # French
+    uv run python -m translate.translate_seera --lang en fr  # Both in one pass
 """
 
 import argparse
-import json
+import asyncio
 import os
-import time
+from pathlib import Path
 
 import pandas as pd
 from dotenv import load_dotenv
 
+from common.limiter import AdaptiveLimiter
+from common.memory import TranslationMemory
+from common.progress import ProgressStore, dataset_namespace
+
 from .config import (
     AGENT_DIR,
     INPUT_CSV,
+    MAX_CONCURRENCY,
+    MERGED_CSV,
+    MIN_CONCURRENCY,
     MODEL_NAME,
-    REQUEST_DELAY,
-    BATCH_SIZE,
+    PROGRESS_DB,
+    RETRY_DELAY,
     TRANSLATE_COLUMNS,
     SUPPORTED_LANGUAGES,
     get_output_csv,
-    get_progress_file,
+    get_legacy_progress_file,
 )
 from .gemini_client import GeminiTranslator
+from .runner import translate_events
+
+
+def build_output(df: pd.DataFrame, translations: pd.DataFrame) -> pd.DataFrame:
+    """
+    Apply translations to the source events, keeping the same CSV structure.
+
+    `translations` is indexed by event_id (as text) with one column per
+    translated field. Each column is joined onto the source by event_id as
+    a whole, keeping the source value where there is no translation.
+    """
+    output = df.copy()
+    keys = df["event_id"].astype(str)
+    for col in TRANSLATE_COLUMNS:
+        if col in translations.columns:
+            translated = keys.map(translations[col])
+            output[col] = translated.where(translated.notna(), df[col])
+    return output
+
+
+def write_merged(df: pd.DataFrame, outputs: dict[str, pd.DataFrame]) -> None:
+    """Write the Arabic source and every translated language to the merged CSV."""
+    frames = [df.assign(locale="ar")]
+    for lang in SUPPORTED_LANGUAGES:
+        if lang in outputs:
+            frames.append(outputs[lang].assign(locale=lang))
+        elif get_output_csv(lang).exists():
+            # Languages not translated in this run come from their last output
+            frames.append(pd.read_csv(get_output_csv(lang)).assign(locale=lang))
+
+    merged = pd.concat(frames, ignore_index=True)
+    # Without a BOM, like the committed file; readers accept either
+    merged.to_csv(MERGED_CSV, index=False, encoding="utf-8")
+    print(f"Merged {', '.join(frame['locale'].iloc[0] for frame in frames)} into: {MERGED_CSV}")
+
+
+def translate_frame(
+    df: pd.DataFrame,
+    langs: list[str],
+    api_key: str,
+    concurrency: int = MAX_CONCURRENCY,
+    dataset: Path = INPUT_CSV,
+) -> dict[str, pd.DataFrame]:
+    """
+    Translate events into each language, resuming from the progress store.
+
+    Progress is kept per dataset, so the same event IDs in another CSV are
+    translated separately. Returns the translated events of each language.
+    """
+    # Initialize one translator per language, sharing the translation memory
+    memory = TranslationMemory()
+    translators = {lang: GeminiTranslator(api_key, MODEL_NAME, lang, memory=memory) for lang in langs}
+
+    print(f"Target languages: {', '.join(f'{SUPPORTED_LANGUAGES[lang]} ({lang})' for lang in langs)}")
+    print(f"Columns to translate: {TRANSLATE_COLUMNS}")
 
-
-def load_progress(progress_file) -> dict:
-    """Load progress from checkpoint file."""
-    if progress_file.exists():
-        with open(progress_file, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return {"processed_ids": [], "translations": {}}
-
-
-def save_progress(progress: dict, progress_file) -> None:
-    """Save progress to checkpoint file."""
-    with open(progress_file, "w", encoding="utf-8") as f:
-        json.dump(progress, f, ensure_ascii=False, indent=2)
+    # Load progress for resumability
+    source = df[["event_id", *TRANSLATE_COLUMNS]].fillna("").astype(str).to_dict("records")
+    progress = {lang: ProgressStore(PROGRESS_DB, dataset_namespace(lang, dataset, INPUT_CSV)) for lang in langs}
+    pending = {}
+    for lang in langs:
+        if progress[lang].namespace == lang:
+            imported = progress[lang].import_json(get_legacy_progress_file(lang), "translations")
+            if imported:
+                print(f"Imported {imported} events from {get_legacy_progress_file(lang).name}")
+        processed_ids = progress[lang].keys()
+        pending[lang] = [event for event in source if event["event_id"] not in processed_ids]
+        print(f"Previously processed ({lang}): {len(source) - len(pending[lang])} events")
+
+    def checkpoint(lang: str, results: dict[str, dict]) -> None:
+        progress[lang].put_many(results)
+
+    # Translate every (language, batch) job through one shared concurrent queue
+    limiter = AdaptiveLimiter(concurrency, MIN_CONCURRENCY, cooldown=RETRY_DELAY)
+    print(f"\nTranslating {sum(len(events) for events in pending.values())} events "
+          f"with up to {concurrency} concurrent requests...")
+    asyncio.run(translate_events(translators, pending, limiter, checkpoint))
+    print(f"Translation memory: {memory.summary()}")
+    memory.close()
+
+    outputs = {}
+    for lang in langs:
+        translations = progress[lang].to_frame(TRANSLATE_COLUMNS)
+        progress[lang].close()
+        outputs[lang] = build_output(df, translations)
+        translated = df["event_id"].astype(str).isin(translations.index).sum()
+        print(f"Successfully processed {translated}/{len(df)} events ({lang})")
+    return outputs
 
 
 def main():
-    parser = argparse.ArgumentParser(description="Translate Seera events to target language")
+    parser = argparse.ArgumentParser(description="Translate Seera events to target languages")
     parser.add_argument(
         "--lang",
         type=str,
-        default="en",
+        nargs="+",
+        default=["en"],
         choices=list(SUPPORTED_LANGUAGES.keys()),
-        help=f"Target language code. Supported: {list(SUPPORTED_LANGUAGES.keys())}",
+        help=f"Target language codes. Supported: {list(SUPPORTED_LANGUAGES.keys())}",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=MAX_CONCURRENCY,
+        help="Maximum concurrent requests (lowered automatically when rate limited)",
     )
     args = parser.parse_args()
-
-    lang = args.lang
-    lang_name = SUPPORTED_LANGUAGES[lang]
-    output_csv = get_output_csv(lang)
-    progress_file = get_progress_file(lang)
+    langs = list(dict.fromkeys(args.lang))
 
     # Load environment variables from mki-agents/.env
     env_path = AGENT_DIR.parent / ".env"
@@ -70,89 +156,21 @@ def main():
     if not api_key:
         raise ValueError("GOOGLE_AI environment variable not set")
 
-    # Initialize translator
-    translator = GeminiTranslator(api_key, MODEL_NAME, lang)
-
-    # Load CSV
+    # Load CSV once for every language
     print(f"Loading events from {INPUT_CSV}")
     df = pd.read_csv(INPUT_CSV)
-    total_events = len(df)
-    print(f"Found {total_events} events")
-    print(f"Target language: {lang_name} ({lang})")
-    print(f"Columns to translate: {TRANSLATE_COLUMNS}")
+    print(f"Found {len(df)} events")
 
-    # Load progress for resumability
-    progress = load_progress(progress_file)
-    processed_ids = set(progress["processed_ids"])
-    translations = progress["translations"]
-
-    print(f"Previously processed: {len(processed_ids)} events")
-
-    # Process events
-    print(f"\nTranslating to {lang_name}...")
-    for idx, row in df.iterrows():
-        event_id = str(row["event_id"])
-
-        # Skip already processed
-        if event_id in processed_ids:
-            continue
-
-        title = row["title"] if pd.notna(row["title"]) else ""
-        print(f"  [{idx + 1}/{total_events}] Event {event_id}: {title[:50]}...")
-
-        event_translations = {}
-
-        for col in TRANSLATE_COLUMNS:
-            original_text = row[col] if pd.notna(row[col]) else ""
-            if original_text:
-                print(f"    Translating '{col}'...")
-                translated = translator.translate_text(original_text)
-                if translated:
-                    event_translations[col] = translated
-                else:
-                    print(f"    FAILED to translate '{col}'")
-                    event_translations[col] = original_text  # Keep original on failure
-                time.sleep(REQUEST_DELAY)
-            else:
-                event_translations[col] = original_text
-
-        translations[event_id] = event_translations
-        processed_ids.add(event_id)
-        print(f"    Done!")
-
-        # Save progress periodically
-        if (idx + 1) % BATCH_SIZE == 0:
-            progress["processed_ids"] = list(processed_ids)
-            progress["translations"] = translations
-            save_progress(progress, progress_file)
-            print(f"  [Checkpoint saved: {len(processed_ids)} events processed]")
-
-    # Final save of progress
-    progress["processed_ids"] = list(processed_ids)
-    progress["translations"] = translations
-    save_progress(progress, progress_file)
-
-    # Build output DataFrame
-    output_rows = []
-    for idx, row in df.iterrows():
-        event_id = str(row["event_id"])
-        new_row = row.to_dict()
-
-        # Apply translations
-        if event_id in translations:
-            for col in TRANSLATE_COLUMNS:
-                if col in translations[event_id]:
-                    new_row[col] = translations[event_id][col]
-
-        output_rows.append(new_row)
-
-    output_df = pd.DataFrame(output_rows)
-
-    # Save to output CSV
-    output_df.to_csv(output_csv, index=False, encoding="utf-8-sig")
-    print(f"\nTranslation complete!")
-    print(f"Output saved to: {output_csv}")
-    print(f"Successfully processed {len(processed_ids)}/{total_events} events")
+    outputs = translate_frame(df, langs, api_key, args.concurrency)
+
+    # Save one CSV per language, then the merged CSV
+    for lang, output in outputs.items():
+        output_csv = get_output_csv(lang)
+        output.to_csv(output_csv, index=False, encoding="utf-8-sig")
+        print(f"\n{SUPPORTED_LANGUAGES[lang]} output saved to: {output_csv}")
+
+    write_merged(df, outputs)
+    print("\nTranslation complete!")
 
 
 if __name__ == "__main__":
@@ -0,0 +1 @@
+"""Read API over the seerah events, history events and narrators."""
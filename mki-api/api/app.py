@@ -0,0 +1,289 @@
+"""
+HTTP routes of the read API
+
+Every response body is assembled from rows serialized at startup and
+carries an ETag (a hash of the body), so clients and caches revalidate
+with If-None-Match and get an empty 304 when nothing changed.
+
+    GET /health
+    GET /events                               collections, locales and counts
+    GET /events/{collection}?locale=&year_from=&year_to=&after=&limit=
+    GET /events/{collection}/{event_id}?locale=
+    GET /narrators?after=&limit=
+    GET /narrators/{rawi_index}
+    GET /search?q=&collection=&locale=&limit=      ranked events and narrators
+    GET /graph                                     narrator and link counts
+    GET /graph/narrators/{rawi_index}?direction=&depth=&limit=   narrators within depth links
+    GET /graph/path?from=&to=&direction=           shortest teacher/student path
+    GET /graph/shared-teachers?a=&b=
+    GET /graph/chain?ids=                          continuity of a chain, student first
+
+The graph routes need the dataset bundle, and answer 503 without it.
+"""
+
+import hashlib
+import json
+
+from aiohttp import web
+
+from .config import (
+    CACHE_MAX_AGE,
+    DEFAULT_LOCALE,
+    DEFAULT_PAGE_SIZE,
+    DEFAULT_GRAPH_DEPTH,
+    DEFAULT_SEARCH_RESULTS,
+    MAX_GRAPH_DEPTH,
+    MAX_GRAPH_RESULTS,
+    MAX_PAGE_SIZE,
+    MAX_SEARCH_RESULTS,
+)
+from .graph import DIRECTIONS, NarratorGraph
+from .search import NARRATORS, SearchIndex
+from .store import Key, Page, Store, parse_cursor
+
+STORE = web.AppKey("store", Store)
+SEARCH = web.AppKey("search", SearchIndex)
+GRAPH = web.AppKey("graph", NarratorGraph)
+
+
+def json_error(status: int, message: str) -> web.Response:
+    return web.json_response({"error": message}, status=status)
+
+
+def bad_request(message: str) -> web.HTTPBadRequest:
+    return web.HTTPBadRequest(text=json.dumps({"error": message}), content_type="application/json")
+
+
+def cached_response(request: web.Request, body: bytes) -> web.Response:
+    """Send a JSON body with its ETag, or 304 if the client already has it."""
+    etag = '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={CACHE_MAX_AGE}"}
+    if etag in request.headers.get("If-None-Match", ""):
+        return web.Response(status=304, headers=headers)
+    return web.Response(body=body, content_type="application/json", charset="utf-8", headers=headers)
+
+
+def page_body(page: Page) -> bytes:
+    return b'{"items":[' + b",".join(page.items) + b'],"next":' + json.dumps(page.next_cursor).encode() + b"}"
+
+
+def int_param(request: web.Request, name: str) -> int | None:
+    value = request.query.get(name)
+    if value is None or value == "":
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise bad_request(f"{name} must be an integer") from None
+
+
+def paging_params(request: web.Request) -> tuple[int, Key | None]:
+    """The page size and the cursor of a list request."""
+    limit = int_param(request, "limit") or DEFAULT_PAGE_SIZE
+    after = request.query.get("after")
+    try:
+        cursor = parse_cursor(after) if after else None
+    except ValueError:
+        raise bad_request("invalid cursor") from None
+    return max(1, min(limit, MAX_PAGE_SIZE)), cursor
+
+
+async def health(request: web.Request) -> web.Response:
+    store = request.app[STORE]
+    return web.json_response({"status": "ok", "version": store.version})
+
+
+async def list_collections(request: web.Request) -> web.Response:
+    store = request.app[STORE]
+    body = {
+        "collections": {
+            name: {"locales": collection.locales, "count": len(collection)}
+            for name, collection in store.events.items()
+        },
+        "narrators": len(store.narrators),
+    }
+    return cached_response(request, json.dumps(body).encode())
+
+
+async def list_events(request: web.Request) -> web.Response:
+    collection = request.app[STORE].events.get(request.match_info["collection"])
+    if collection is None:
+        return json_error(404, "unknown collection")
+    limit, after = paging_params(request)
+    page = collection.page(
+        request.query.get("locale", DEFAULT_LOCALE),
+        limit,
+        after,
+        int_param(request, "year_from"),
+        int_param(request, "year_to"),
+    )
+    return cached_response(request, page_body(page))
+
+
+async def get_event(request: web.Request) -> web.Response:
+    collection = request.app[STORE].events.get(request.match_info["collection"])
+    if collection is None:
+        return json_error(404, "unknown collection")
+    try:
+        event_id = int(request.match_info["event_id"])
+    except ValueError:
+        return json_error(400, "event_id must be an integer")
+    body = collection.get(event_id, request.query.get("locale", DEFAULT_LOCALE))
+    if body is None:
+        return json_error(404, "event not found")
+    return cached_response(request, body)
+
+
+async def list_narrators(request: web.Request) -> web.Response:
+    limit, after = paging_params(request)
+    return cached_response(request, page_body(request.app[STORE].narrators.page(limit, after)))
+
+
+async def get_narrator(request: web.Request) -> web.Response:
+    try:
+        rawi_index = int(request.match_info["rawi_index"])
+    except ValueError:
+        return json_error(400, "rawi_index must be an integer")
+    body = request.app[STORE].narrators.get(rawi_index)
+    if body is None:
+        return json_error(404, "narrator not found")
+    return cached_response(request, body)
+
+
+async def search(request: web.Request) -> web.Response:
+    query = request.query.get("q", "").strip()
+    if not query:
+        return json_error(400, "q is required")
+    limit = max(1, min(int_param(request, "limit") or DEFAULT_SEARCH_RESULTS, MAX_SEARCH_RESULTS))
+    results = request.app[SEARCH].search(
+        query,
+        limit,
+        collection=request.query.get("collection"),
+        locale=request.query.get("locale", DEFAULT_LOCALE),
+    )
+
+    store = request.app[STORE]
+    items = []
+    for (collection, locale, key), score in results:
+        if collection == NARRATORS:
+            body = store.narrators.get(key)
+        else:
+            body = store.events[collection].get(key, locale)
+        head = json.dumps({"collection": collection, "score": round(score, 4)}, separators=(",", ":"))
+        items.append(head[:-1].encode() + b',"item":' + body + b"}")
+    return cached_response(request, b'{"items":[' + b",".join(items) + b"]}")
+
+
+def narrator_item(store: Store, rawi_index: int, **fields) -> bytes:
+    """{"id": ..., **fields, "item": narrator row}, the row as serialized by the store."""
+    head = json.dumps({"id": rawi_index, **fields}, ensure_ascii=False, separators=(",", ":"))
+    return head[:-1].encode() + b',"item":' + (store.narrators.get(rawi_index) or b"null") + b"}"
+
+
+def items_body(items: list[bytes], **fields) -> bytes:
+    head = json.dumps(fields, ensure_ascii=False, separators=(",", ":"))[1:-1]
+    return b"{" + (head.encode() + b"," if head else b"") + b'"items":[' + b",".join(items) + b"]}"
+
+
+def narrator_graph(request: web.Request) -> NarratorGraph:
+    graph = request.app.get(GRAPH)
+    if graph is None:
+        raise web.HTTPServiceUnavailable(
+            text=json.dumps({"error": "the narrator graph needs the dataset bundle"}), content_type="application/json"
+        )
+    return graph
+
+
+def required_int(request: web.Request, name: str) -> int:
+    value = int_param(request, name)
+    if value is None:
+        raise bad_request(f"{name} is required")
+    return value
+
+
+def direction_param(request: web.Request) -> str:
+    direction = request.query.get("direction", "any")
+    if direction not in DIRECTIONS:
+        raise bad_request(f"direction must be one of {', '.join(DIRECTIONS)}")
+    return direction
+
+
+async def graph_summary(request: web.Request) -> web.Response:
+    graph = narrator_graph(request)
+    return cached_response(request, json.dumps({"narrators": len(graph), "links": graph.edge_count}).encode())
+
+
+async def graph_neighbourhood(request: web.Request) -> web.Response:
+    graph = narrator_graph(request)
+    try:
+        rawi_index = int(request.match_info["rawi_index"])
+    except ValueError:
+        return json_error(400, "rawi_index must be an integer")
+    depth = max(1, min(int_param(request, "depth") or DEFAULT_GRAPH_DEPTH, MAX_GRAPH_DEPTH))
+    limit = max(1, min(int_param(request, "limit") or MAX_GRAPH_RESULTS, MAX_GRAPH_RESULTS))
+    reached = graph.neighbourhood(rawi_index, depth, direction_param(request))
+    if reached is None:
+        return json_error(404, "narrator not found")
+    store = request.app[STORE]
+    items = [narrator_item(store, narrator_id, hops=hops) for narrator_id, hops in reached[:limit]]
+    return cached_response(request, items_body(items, total=len(reached)))
+
+
+async def graph_path(request: web.Request) -> web.Response:
+    graph = narrator_graph(request)
+    path = graph.shortest_path(
+        required_int(request, "from"), required_int(request, "to"), direction_param(request), MAX_GRAPH_DEPTH * 2
+    )
+    if path is None:
+        return json_error(404, "no path between the narrators")
+    store = request.app[STORE]
+    return cached_response(request, items_body([narrator_item(store, narrator_id) for narrator_id in path]))
+
+
+async def graph_shared_teachers(request: web.Request) -> web.Response:
+    graph = narrator_graph(request)
+    shared = graph.shared_teachers(required_int(request, "a"), required_int(request, "b"))
+    store = request.app[STORE]
+    return cached_response(request, items_body([narrator_item(store, narrator_id) for narrator_id in shared]))
+
+
+async def graph_chain(request: web.Request) -> web.Response:
+    graph = narrator_graph(request)
+    try:
+        chain = [int(part) for part in request.query.get("ids", "").split(",") if part.strip()]
+    except ValueError:
+        return json_error(400, "ids must be comma-separated integers")
+    if len(chain) < 2:
+        return json_error(400, "ids needs at least two narrators")
+    links = graph.check_chain(chain[:MAX_GRAPH_RESULTS])
+    # A chain is continuous when every link is recorded and none contradicts the narrators' years
+    continuous = all(link["recorded"] and link["plausible"] is not False for link in links)
+    body = {"continuous": continuous, "links": links}
+    return cached_response(request, json.dumps(body, ensure_ascii=False).encode())
+
+
+def create_app(
+    store: Store, search_index: SearchIndex | None = None, graph: NarratorGraph | None = None
+) -> web.Application:
+    """
+    Build the application over a loaded store, indexing it for search unless
+    an index is given. The graph routes are served if a graph is given.
+    """
+    app = web.Application()
+    app[STORE] = store
+    app[SEARCH] = search_index if search_index is not None else SearchIndex.from_store(store)
+    if graph is not None:
+        app[GRAPH] = graph
+    app.router.add_get("/health", health)
+    app.router.add_get("/events", list_collections)
+    app.router.add_get("/events/{collection}", list_events)
+    app.router.add_get("/events/{collection}/{event_id}", get_event)
+    app.router.add_get("/narrators", list_narrators)
+    app.router.add_get("/narrators/{rawi_index}", get_narrator)
+    app.router.add_get("/search", search)
+    app.router.add_get("/graph", graph_summary)
+    app.router.add_get("/graph/narrators/{rawi_index}", graph_neighbourhood)
+    app.router.add_get("/graph/path", graph_path)
+    app.router.add_get("/graph/shared-teachers", graph_shared_teachers)
+    app.router.add_get("/graph/chain", graph_chain)
+    return app
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Load test of the read API
+
+Serves the datasets on a local port and sends requests from concurrent
+clients, reporting throughput and latency percentiles per route.
+
+Usage:
+    uv run python -m api.benchmark
+    uv run python -m api.benchmark --requests 5000 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from urllib.parse import urlencode
+
+import aiohttp
+from aiohttp import web
+
+from .app import create_app
+from .config import BUNDLE_PATH
+from .search import store_documents
+from .search_benchmark import sample_queries
+from .store import Store
+
+BENCH_PORT = 8089
+
+
+def sample_paths(store: Store, count: int, seed: int = 0) -> dict[str, list[str]]:
+    """Request paths for each route, spread over the datasets."""
+    rng = random.Random(seed)
+    narrator_ids = list(store.narrators.by_id)
+    queries = sample_queries(list(store_documents(store)), count, seed)
+    paths = {
+        "narrator": [f"/narrators/{rng.choice(narrator_ids)}" for _ in range(count)],
+        "narrators page": [f"/narrators?limit=50&after={rng.choice(narrator_ids)}" for _ in range(count)],
+        "search": [f"/search?{urlencode({'q': query})}" for query in queries],
+    }
+    for name, collection in store.events.items():
+        event_keys = list(collection.by_id)
+        paths[f"{name} event"] = [
+            f"/events/{name}/{event_id}?locale={locale}" for locale, event_id in rng.choices(event_keys, k=count)
+        ]
+        paths[f"{name} years"] = [
+            f"/events/{name}?locale={rng.choice(collection.locales)}&year_from={year}&year_to={year + 5}"
+            for year in (rng.randint(-13, 11) for _ in range(count))
+        ]
+    return paths
+
+
+async def run_route(session: aiohttp.ClientSession, base: str, paths: list[str], concurrency: int) -> tuple[float, list[float]]:
+    """Send every path with `concurrency` clients, returning the elapsed seconds and each latency."""
+    queue = list(reversed(paths))
+    latencies = []
+
+    async def client() -> None:
+        while queue:
+            path = queue.pop()
+            started = time.perf_counter()
+            async with session.get(base + path) as response:
+                await response.read()
+                if response.status != 200:
+                    raise RuntimeError(f"{path} returned {response.status}")
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return time.perf_counter() - started, latencies
+
+
+def percentile(values: list[float], q: int) -> float:
+    return statistics.quantiles(values, n=100)[q - 1]
+
+
+async def benchmark(store: Store, requests: int, concurrency: int, port: int) -> None:
+    runner = web.AppRunner(create_app(store), access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", port).start()
+    try:
+        connector = aiohttp.TCPConnector(limit=concurrency)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            base = f"http://127.0.0.1:{port}"
+            await run_route(session, base, ["/health"] * concurrency, concurrency)  # warm up connections
+            print(f"{'route':<16} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8}")
+            for route, paths in sample_paths(store, requests).items():
+                elapsed, latencies = await run_route(session, base, paths, concurrency)
+                print(f"{route:<16} {len(paths) / elapsed:>8.0f} "
+                      f"{percentile(latencies, 50) * 1000:>8.2f} {percentile(latencies, 99) * 1000:>8.2f}")
+    finally:
+        await runner.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the read API")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per route")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent clients")
+    parser.add_argument("--port", type=int, default=BENCH_PORT, help="Local port to serve on")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    store = Store.load_bundle() if BUNDLE_PATH.exists() else Store.load()
+    print(f"Loaded store {store.version} in {time.perf_counter() - started:.2f}s")
+    asyncio.run(benchmark(store, args.requests, args.concurrency, args.port))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# Settings for the read API
+from pathlib import Path
+
+# Paths
+API_DIR = Path(__file__).parent
+PROJECT_ROOT = API_DIR.parent.parent  # mki-api -> mki
+DATASETS_DIR = PROJECT_ROOT / "mki-datasets"
+
+# Event collections served under /events/{collection}, loaded if the file exists
+EVENT_SOURCES = {
+    "seera": DATASETS_DIR / "seera" / "seera_events_all.csv",
+    "history": DATASETS_DIR / "history" / "history_events.csv",
+}
+NARRATORS_CSV = DATASETS_DIR / "hadith" / "rawi_data.csv"
+
+# Dataset bundle compiled by mki-etl (uv run python -m bundle.compile_bundle),
+# served instead of the CSVs when it exists
+BUNDLE_PATH = DATASETS_DIR / "bundle" / "mki.sqlite"
+BUNDLED_EVENTS = {"seera": "seerah_events"}  # event collections read from bundle tables
+
+DEFAULT_LOCALE = "ar"  # locale of CSVs without a locale column
+
+# Server
+HOST = "127.0.0.1"
+PORT = 8080
+
+# Responses carry an ETag; caches may reuse them this long before revalidating
+CACHE_MAX_AGE = 300  # seconds
+
+# Pagination
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# Search: weight of each searched column in a document's term frequencies,
+# under the column names of both the CSVs and the bundle
+EVENT_SEARCH_FIELDS = {"title": 3, "location_name": 2, "details": 1, "description": 1}
+NARRATOR_SEARCH_FIELDS = {
+    "name": 3, "name_ar": 3, "shuhrah": 3, "kunyah": 2, "laqab": 2, "nasab": 1,
+    "place_iqama": 1, "place_birth": 1, "place_death": 1, "places_of_stay": 1, "birth_place": 1, "death_place": 1,
+}
+BM25_K1 = 1.2
+BM25_B = 0.75
+DEFAULT_SEARCH_RESULTS = 10
+MAX_SEARCH_RESULTS = 100
+
+# Narrator graph: CSR arrays built from the bundle, opened memory-mapped
+GRAPH_DIR = BUNDLE_PATH.parent / "graph"
+DEFAULT_GRAPH_DEPTH = 2
+MAX_GRAPH_DEPTH = 6
+MAX_GRAPH_RESULTS = 500
+# Chain continuity: a narrator hears from a teacher at this age at the
+# earliest, and lives this long at the most when only death years are known
+MIN_HEARING_AGE = 5
+MAX_LIFESPAN = 100
@@ -0,0 +1,291 @@
+"""
+Teacher/student graph of the narrators
+
+Edges are "heard from" links, from the narrator_relationships table of the
+dataset bundle and from each pair of consecutive narrators in a chain of
+hadith_chains (the narrator at a position heard from the one after it,
+chains running from the collector's teacher toward the Prophet). They are
+kept as compressed sparse row (CSR) arrays over narrator positions: the
+teachers of the narrator at position i are
+teachers[teacher_offsets[i]:teacher_offsets[i + 1]], and the students are
+the same edges reversed. Narrator ids map to positions through the sorted
+`ids` array.
+
+The arrays are written once as .npy files next to the bundle and opened
+memory-mapped, so every worker of the API reads the same pages of the OS
+cache instead of holding its own copy. Traversals are level-synchronous
+BFS over the arrays: the neighbours of a whole frontier are gathered at
+once, so a query costs a few numpy calls per hop.
+"""
+
+import json
+import os
+import shutil
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .config import BUNDLE_PATH, GRAPH_DIR, MAX_LIFESPAN, MIN_HEARING_AGE
+
+GRAPH_FORMAT = 1  # bumped when the arrays change, to rebuild saved graphs
+ARRAYS = ("ids", "teacher_offsets", "teachers", "student_offsets", "students", "birth_year", "death_year")
+UNKNOWN_YEAR = np.iinfo(np.int16).min
+DIRECTIONS = ("teachers", "students", "any")
+
+
+def bundle_stamp(bundle: Path) -> str:
+    """Identifies a version of the bundle file without reading it."""
+    stat = bundle.stat()
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def query_array(conn: sqlite3.Connection, sql: str, columns: int) -> np.ndarray:
+    return np.array(conn.execute(sql).fetchall(), dtype=np.int64).reshape(-1, columns)
+
+
+def relationship_links(conn: sqlite3.Connection) -> tuple[np.ndarray, np.ndarray]:
+    """(student, teacher) id pairs of narrator_relationships, whichever side each row is written from."""
+    rows = query_array(
+        conn, "SELECT narrator_id, related_id, relationship_type = 'teacher' FROM narrator_relationships", 3
+    )
+    is_teacher = rows[:, 2] == 1
+    return np.where(is_teacher, rows[:, 0], rows[:, 1]), np.where(is_teacher, rows[:, 1], rows[:, 0])
+
+
+def chain_links(conn: sqlite3.Connection) -> tuple[np.ndarray, np.ndarray]:
+    """(student, teacher) id pairs of consecutive narrators in the same chain."""
+    rows = query_array(
+        conn, "SELECT hadith_id, narrator_id FROM hadith_chains ORDER BY hadith_id, chain_position", 2
+    )
+    same_chain = rows[1:, 0] == rows[:-1, 0]
+    return rows[:-1, 1][same_chain], rows[1:, 1][same_chain]
+
+
+def positions(ids: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Positions of the values in the sorted ids, -1 for values not in them."""
+    index = np.searchsorted(ids, values).clip(max=len(ids) - 1)
+    return np.where(ids[index] == values, index, -1)
+
+
+def csr(sources: np.ndarray, targets: np.ndarray, size: int) -> tuple[np.ndarray, np.ndarray]:
+    """Offsets and sorted, deduplicated targets of each source position."""
+    order = np.lexsort((targets, sources))
+    sources, targets = sources[order], targets[order]
+    unique = np.ones(len(sources), dtype=bool)
+    unique[1:] = (sources[1:] != sources[:-1]) | (targets[1:] != targets[:-1])
+    sources, targets = sources[unique], targets[unique]
+    offsets = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=size), out=offsets[1:])
+    return offsets, targets.astype(np.int32)
+
+
+def gather(offsets: np.ndarray, targets: np.ndarray, frontier: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Every (node, neighbour) pair of the frontier nodes, in one pass over the CSR arrays."""
+    starts = offsets[frontier]
+    counts = offsets[frontier + 1] - starts
+    total = int(counts.sum())
+    if total == 0:
+        return frontier[:0], targets[:0]
+    # Index of each neighbour: its rank within the output, shifted from the
+    # start of its node's block in the output to the start of its CSR slice
+    block_starts = np.cumsum(counts) - counts
+    index = np.arange(total) + np.repeat(starts - block_starts, counts)
+    return np.repeat(frontier, counts), targets[index]
+
+
+def build_graph(bundle: Path = BUNDLE_PATH, directory: Path = GRAPH_DIR) -> dict:
+    """Compute the graph arrays from the bundle and write them to `directory`. Returns its metadata."""
+    with closing(sqlite3.connect(f"file:{bundle}?mode=ro", uri=True)) as conn:
+        narrators = pd.read_sql_query(
+            "SELECT scholar_indx, birth_year_hijri, death_year_hijri FROM narrators ORDER BY scholar_indx", conn
+        )
+        relationship_students, relationship_teachers = relationship_links(conn)
+        chain_students, chain_teachers = chain_links(conn)
+
+    ids = narrators["scholar_indx"].to_numpy(dtype=np.int64)
+    students = positions(ids, np.concatenate((relationship_students, chain_students)))
+    teachers = positions(ids, np.concatenate((relationship_teachers, chain_teachers)))
+    # Links to narrators missing from the table, and narrators citing themselves, are dropped
+    known = (students >= 0) & (teachers >= 0) & (students != teachers)
+    students, teachers = students[known], teachers[known]
+
+    teacher_offsets, teacher_targets = csr(students, teachers, len(ids))
+    student_offsets, student_targets = csr(teachers, students, len(ids))
+    arrays = {
+        "ids": ids,
+        "teacher_offsets": teacher_offsets,
+        "teachers": teacher_targets,
+        "student_offsets": student_offsets,
+        "students": student_targets,
+        "birth_year": narrators["birth_year_hijri"].to_numpy(dtype=np.int16, na_value=UNKNOWN_YEAR),
+        "death_year": narrators["death_year_hijri"].to_numpy(dtype=np.int16, na_value=UNKNOWN_YEAR),
+    }
+    meta = {
+        "format": GRAPH_FORMAT,
+        "bundle": bundle_stamp(bundle),
+        "narrators": len(ids),
+        "edges": len(teacher_targets),
+        "relationship_links": len(relationship_students),
+        "chain_links": len(chain_students),
+    }
+
+    # Written aside and moved into place, so a reader never opens a half-written graph
+    building = directory.with_name(directory.name + ".building")
+    shutil.rmtree(building, ignore_errors=True)
+    building.mkdir(parents=True)
+    for name, array in arrays.items():
+        np.save(building / f"{name}.npy", array)
+    (building / "meta.json").write_text(json.dumps(meta, indent=2))
+    shutil.rmtree(directory, ignore_errors=True)
+    os.replace(building, directory)
+    return meta
+
+
+class NarratorGraph:
+    """Memory-mapped CSR graph of the narrators, queried by narrator id."""
+
+    def __init__(self, arrays: dict[str, np.ndarray], meta: dict):
+        self.ids = arrays["ids"]
+        self.teacher_offsets = arrays["teacher_offsets"]
+        self.teachers = arrays["teachers"]
+        self.student_offsets = arrays["student_offsets"]
+        self.students = arrays["students"]
+        self.birth_year = arrays["birth_year"]
+        self.death_year = arrays["death_year"]
+        self.meta = meta
+
+    @classmethod
+    def open(cls, directory: Path = GRAPH_DIR) -> "NarratorGraph":
+        """Map saved arrays into memory; pages are read on first use and shared between processes."""
+        meta = json.loads((directory / "meta.json").read_text())
+        arrays = {name: np.load(directory / f"{name}.npy", mmap_mode="r") for name in ARRAYS}
+        return cls(arrays, meta)
+
+    @classmethod
+    def load(cls, bundle: Path = BUNDLE_PATH, directory: Path = GRAPH_DIR) -> "NarratorGraph":
+        """Open the saved graph of the bundle, building it first if it is missing or out of date."""
+        meta_path = directory / "meta.json"
+        meta = json.loads(meta_path.read_text()) if meta_path.exists() else {}
+        if meta.get("format") != GRAPH_FORMAT or meta.get("bundle") != bundle_stamp(bundle):
+            build_graph(bundle, directory)
+        return cls.open(directory)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.teachers)
+
+    def position(self, narrator_id: int) -> int | None:
+        index = int(np.searchsorted(self.ids, narrator_id))
+        if index < len(self.ids) and self.ids[index] == narrator_id:
+            return index
+        return None
+
+    def _neighbours(self, frontier: np.ndarray, direction: str) -> tuple[np.ndarray, np.ndarray]:
+        pairs = []
+        if direction in ("teachers", "any"):
+            pairs.append(gather(self.teacher_offsets, self.teachers, frontier))
+        if direction in ("students", "any"):
+            pairs.append(gather(self.student_offsets, self.students, frontier))
+        if len(pairs) == 1:
+            return pairs[0]
+        return np.concatenate([pair[0] for pair in pairs]), np.concatenate([pair[1] for pair in pairs])
+
+    def _bfs(
+        self, start: int, direction: str, max_depth: int, target: int | None = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Hop count from start of every position reached (-1 elsewhere), and the position each was reached from."""
+        distance = np.full(len(self.ids), -1, dtype=np.int32)
+        parent = np.full(len(self.ids), -1, dtype=np.int32)
+        distance[start] = 0
+        frontier = np.array([start], dtype=np.int32)
+        for depth in range(1, max_depth + 1):
+            sources, found = self._neighbours(frontier, direction)
+            new = distance[found] < 0
+            found, first = np.unique(found[new], return_index=True)
+            if not len(found):
+                break
+            distance[found] = depth
+            parent[found] = sources[new][first]
+            if target is not None and distance[target] >= 0:
+                break
+            frontier = found
+        return distance, parent
+
+    def neighbourhood(self, narrator_id: int, depth: int, direction: str = "any") -> list[tuple[int, int]] | None:
+        """(id, hops) of the narrators within `depth` hops, nearest first; None if the narrator is unknown."""
+        start = self.position(narrator_id)
+        if start is None:
+            return None
+        distance, _ = self._bfs(start, direction, depth)
+        reached = np.flatnonzero(distance > 0)
+        reached = reached[np.argsort(distance[reached], kind="stable")]
+        return list(zip(self.ids[reached].tolist(), distance[reached].tolist()))
+
+    def shortest_path(
+        self, source_id: int, target_id: int, direction: str = "any", max_depth: int | None = None
+    ) -> list[int] | None:
+        """
+        Ids along a shortest path from one narrator to another, both
+        included; None if either is unknown or no path is within max_depth.
+        "teachers" follows links from students to their teachers only.
+        """
+        source, target = self.position(source_id), self.position(target_id)
+        if source is None or target is None:
+            return None
+        distance, parent = self._bfs(source, direction, max_depth or len(self.ids), target)
+        if distance[target] < 0:
+            return None
+        path = [target]
+        while path[-1] != source:
+            path.append(int(parent[path[-1]]))
+        return self.ids[path[::-1]].tolist()
+
+    def _teacher_positions(self, narrator_id: int) -> np.ndarray:
+        index = self.position(narrator_id)
+        if index is None:
+            return self.teachers[:0]
+        return self.teachers[self.teacher_offsets[index]:self.teacher_offsets[index + 1]]
+
+    def shared_teachers(self, first_id: int, second_id: int) -> list[int]:
+        """Ids of the narrators both heard from."""
+        first, second = self._teacher_positions(first_id), self._teacher_positions(second_id)
+        shared = np.intersect1d(first, second, assume_unique=True)
+        return self.ids[shared].tolist()
+
+    def check_chain(self, chain: list[int]) -> list[dict]:
+        """
+        Check each link of a chain, given student first, for a recorded
+        teacher/student edge and for whether the two lifetimes allow a
+        meeting. A link is implausible if the student was born less than
+        MIN_HEARING_AGE years before the teacher died or, with only death
+        years known, died more than MAX_LIFESPAN years after the teacher.
+        `plausible` is None when the years needed are unknown.
+        """
+        links = []
+        for student_id, teacher_id in zip(chain, chain[1:]):
+            student, teacher = self.position(student_id), self.position(teacher_id)
+            link = {"student": student_id, "teacher": teacher_id, "recorded": False, "plausible": None, "reason": None}
+            links.append(link)
+            if student is None or teacher is None:
+                link["reason"] = "unknown narrator"
+                continue
+            link["recorded"] = bool(teacher in self._teacher_positions(student_id))
+            born, died = int(self.birth_year[student]), int(self.death_year[student])
+            teacher_died = int(self.death_year[teacher])
+            if teacher_died == UNKNOWN_YEAR:
+                continue
+            if born != UNKNOWN_YEAR:
+                link["plausible"] = born + MIN_HEARING_AGE <= teacher_died
+                if not link["plausible"]:
+                    link["reason"] = f"student born {born}, teacher died {teacher_died}"
+            elif died != UNKNOWN_YEAR:
+                link["plausible"] = died - MAX_LIFESPAN <= teacher_died
+                if not link["plausible"]:
+                    link["reason"] = f"student died {died - teacher_died} years after the teacher"
+        return links
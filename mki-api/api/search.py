@@ -0,0 +1,258 @@
+"""
+In-process full-text search over the events and narrators
+
+An inverted index from each analyzed term (see text.py) to its posting
+list: the documents containing the term and its weighted frequency in
+each. Posting lists are compressed as LEB128 varints of (document id gap,
+frequency) pairs, most of which fit in one byte, and are decoded with
+numpy when a query reads them. Results are ranked by BM25, scored for all
+the postings of a query term at once.
+
+Documents get increasing ids as they are added, so adding documents only
+appends to the end of posting lists: the index is updated in place when
+a dataset grows instead of being rebuilt. A changed or removed document is
+tombstoned, and its postings are skipped until the index is rebuilt.
+"""
+
+import hashlib
+import json
+import math
+from array import array
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+
+import numpy as np
+
+from .config import BM25_B, BM25_K1, EVENT_SEARCH_FIELDS, NARRATOR_SEARCH_FIELDS
+from .store import Store
+from .text import analyze
+
+NARRATORS = "narrators"  # collection of narrator documents
+
+DocKey = tuple[str, str, int]  # (collection, locale, id), with locale "" for narrators
+
+
+def encode_varints(values: Iterable[int]) -> bytes:
+    """LEB128: seven bits per byte, low bits first, the high bit set on all but the last byte."""
+    out = bytearray()
+    for value in values:
+        while value >= 0x80:
+            out.append(value & 0x7F | 0x80)
+            value >>= 7
+        out.append(value)
+    return bytes(out)
+
+
+def decode_varints(data: bytes | bytearray) -> np.ndarray:
+    """Every varint in data, decoded at once."""
+    raw = np.frombuffer(data, dtype=np.uint8)
+    ends = np.flatnonzero(raw < 0x80)
+    if len(ends) == len(raw):
+        return raw.astype(np.int64)
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    shifts = np.arange(len(raw)) - np.repeat(starts, ends - starts + 1)
+    return np.add.reduceat((raw & 0x7F).astype(np.int64) << (7 * shifts), starts)
+
+
+class PostingList:
+    """Documents containing a term, in increasing id order, with the term's frequency in each."""
+
+    __slots__ = ("data", "last_doc")
+
+    def __init__(self):
+        self.data = bytearray()
+        self.last_doc = -1
+
+    def extend(self, docs: list[int], freqs: list[int]) -> None:
+        """Append postings of documents with ids above every id already in the list."""
+        pairs = []
+        last = self.last_doc
+        for doc, freq in zip(docs, freqs):
+            pairs += (doc - last, freq)
+            last = doc
+        self.data += encode_varints(pairs)
+        self.last_doc = last
+
+    def decode(self) -> tuple[np.ndarray, np.ndarray]:
+        values = decode_varints(self.data)
+        return np.cumsum(values[0::2]) - 1, values[1::2]
+
+
+@dataclass
+class Document:
+    """A row to index: its key, and its texts with the weight of each."""
+
+    key: DocKey
+    texts: list[tuple[str, int]]
+
+    @classmethod
+    def from_row(cls, key: DocKey, row: dict, fields: dict[str, int]) -> "Document":
+        texts = [(row[field], weight) for field, weight in fields.items() if isinstance(row.get(field), str)]
+        return cls(key, texts)
+
+    def fingerprint(self) -> bytes:
+        digest = hashlib.blake2b(digest_size=8)
+        for text, weight in self.texts:
+            digest.update(f"{weight}:{len(text)}:{text}".encode("utf-8"))
+        return digest.digest()
+
+    def terms(self) -> Counter:
+        """Frequency of each term, each occurrence counting the weight of its text."""
+        counts = Counter()
+        for text, weight in self.texts:
+            for term in analyze(text):
+                counts[term] += weight
+        return counts
+
+
+def store_documents(store: Store) -> Iterator[Document]:
+    """A document for every event in every locale and every narrator of the store."""
+    for name, collection in store.events.items():
+        for (locale, event_id), body in collection.by_id.items():
+            yield Document.from_row((name, locale, event_id), json.loads(body), EVENT_SEARCH_FIELDS)
+    for index, body in store.narrators.by_id.items():
+        yield Document.from_row((NARRATORS, "", index), json.loads(body), NARRATOR_SEARCH_FIELDS)
+
+
+class SearchIndex:
+    """BM25-ranked inverted index, updated in place as documents are added or removed."""
+
+    def __init__(self, k1: float = BM25_K1, b: float = BM25_B):
+        self.k1 = k1
+        self.b = b
+        self.postings: dict[str, PostingList] = {}
+        self.keys: list[DocKey] = []
+        self.ids: dict[DocKey, int] = {}  # live documents only
+        self.fingerprints: list[bytes] = []
+        self.lengths = array("f")
+        self.alive = bytearray()
+        # Collection and locale of each document, as codes into these lists
+        self.collections: list[str] = []
+        self.locales: list[str] = [""]
+        self.collection_codes = bytearray()
+        self.locale_codes = bytearray()
+        self.total_length = 0.0
+
+    @classmethod
+    def from_store(cls, store: Store) -> "SearchIndex":
+        index = cls()
+        index.add(store_documents(store))
+        return index
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _code(self, values: list[str], value: str) -> int:
+        if value not in values:
+            values.append(value)
+        return values.index(value)
+
+    def add(self, documents: Iterable[Document]) -> int:
+        """
+        Index new documents, and re-index documents whose text changed.
+        Unchanged documents are skipped. Returns the number indexed.
+        """
+        pending: dict[str, tuple[list[int], list[int]]] = {}
+        indexed = 0
+        for document in documents:
+            fingerprint = document.fingerprint()
+            existing = self.ids.get(document.key)
+            if existing is not None:
+                if self.fingerprints[existing] == fingerprint:
+                    continue
+                self.remove(document.key)
+
+            doc_id = len(self.keys)
+            terms = document.terms()
+            length = sum(terms.values())
+            collection, locale, _ = document.key
+            self.keys.append(document.key)
+            self.ids[document.key] = doc_id
+            self.fingerprints.append(fingerprint)
+            self.lengths.append(length)
+            self.alive.append(1)
+            self.collection_codes.append(self._code(self.collections, collection))
+            self.locale_codes.append(self._code(self.locales, locale))
+            self.total_length += length
+            for term, freq in terms.items():
+                docs, freqs = pending.setdefault(term, ([], []))
+                docs.append(doc_id)
+                freqs.append(freq)
+            indexed += 1
+
+        for term, (docs, freqs) in pending.items():
+            posting = self.postings.get(term)
+            if posting is None:
+                posting = self.postings[term] = PostingList()
+            posting.extend(docs, freqs)
+        return indexed
+
+    def remove(self, key: DocKey) -> bool:
+        """Tombstone a document; returns False if it is not in the index."""
+        doc_id = self.ids.pop(key, None)
+        if doc_id is None:
+            return False
+        self.alive[doc_id] = 0
+        self.total_length -= self.lengths[doc_id]
+        return True
+
+    def sync(self, documents: Iterable[Document]) -> tuple[int, int]:
+        """
+        Update the index to exactly these documents: index new and changed
+        ones, and remove the ones missing. Returns (indexed, removed).
+        """
+        documents = list(documents)
+        indexed = self.add(documents)
+        current = {document.key for document in documents}
+        missing = [key for key in self.ids if key not in current]
+        for key in missing:
+            self.remove(key)
+        return indexed, len(missing)
+
+    def search(
+        self, query: str, limit: int = 10, collection: str | None = None, locale: str | None = None
+    ) -> list[tuple[DocKey, float]]:
+        """
+        The best matches of a query by BM25, as (key, score). Documents
+        matching any query term are candidates. `locale` keeps documents of
+        that locale and documents without one (narrators).
+        """
+        terms = set(analyze(query))
+        live = len(self.ids)
+        if not terms or not live:
+            return []
+
+        alive = np.frombuffer(self.alive, dtype=np.bool_)
+        lengths = np.frombuffer(self.lengths, dtype=np.float32)
+        average_length = self.total_length / live
+        scores = np.zeros(len(self.keys), dtype=np.float32)
+        for term in terms:
+            posting = self.postings.get(term)
+            if posting is None:
+                continue
+            docs, freqs = posting.decode()
+            count = int(np.count_nonzero(alive[docs]))
+            if count == 0:
+                continue
+            idf = math.log(1 + (live - count + 0.5) / (count + 0.5))
+            norm = self.k1 * (1 - self.b + self.b * lengths[docs] / average_length)
+            scores[docs] += idf * freqs * (self.k1 + 1) / (freqs + norm)
+
+        mask = alive & (scores > 0)
+        if collection is not None:
+            if collection not in self.collections:
+                return []
+            mask &= np.frombuffer(self.collection_codes, dtype=np.uint8) == self.collections.index(collection)
+        if locale is not None:
+            codes = np.frombuffer(self.locale_codes, dtype=np.uint8)
+            matching = codes == 0
+            if locale in self.locales:
+                matching |= codes == self.locales.index(locale)
+            mask &= matching
+
+        candidates = np.flatnonzero(mask)
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+        ranked = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [(self.keys[doc], float(scores[doc])) for doc in ranked]
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the search index
+
+Indexes the store and reports the build time, the index size, the latency
+of queries taken from the corpus itself (words of random documents, with
+their diacritics, as users paste them), and the cost of an incremental
+update: appending new events and syncing an unchanged corpus, against a
+full rebuild.
+
+Usage:
+    uv run python -m api.search_benchmark
+    uv run python -m api.search_benchmark --queries 5000 --append 200
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from .config import BUNDLE_PATH
+from .search import Document, SearchIndex, store_documents
+from .store import Store
+
+
+def sample_queries(documents: list[Document], count: int, seed: int = 0) -> list[str]:
+    """One to three consecutive words of random documents."""
+    rng = random.Random(seed)
+    queries = []
+    while len(queries) < count:
+        texts = rng.choice(documents).texts
+        if not texts:
+            continue
+        words = rng.choice(texts)[0].split()
+        size = rng.randint(1, 3)
+        start = rng.randrange(max(len(words) - size, 0) + 1)
+        queries.append(" ".join(words[start:start + size]))
+    return queries
+
+
+def report(label: str, latencies: list[float]) -> None:
+    cuts = statistics.quantiles(latencies, n=100)
+    print(f"{label:<28} p50 {cuts[49] * 1000:6.3f}ms  p99 {cuts[98] * 1000:6.3f}ms  max {max(latencies) * 1000:6.3f}ms")
+
+
+def time_queries(index: SearchIndex, queries: list[str], **filters) -> list[float]:
+    latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        index.search(query, **filters)
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the search index")
+    parser.add_argument("--queries", type=int, default=2000, help="Queries to time")
+    parser.add_argument("--append", type=int, default=100, help="Events to append for the incremental update")
+    args = parser.parse_args()
+
+    store = Store.load_bundle() if BUNDLE_PATH.exists() else Store.load()
+    documents = list(store_documents(store))
+
+    started = time.perf_counter()
+    index = SearchIndex()
+    index.add(documents)
+    build = time.perf_counter() - started
+    posting_bytes = sum(len(posting.data) for posting in index.postings.values())
+    postings = sum(len(posting.decode()[0]) for posting in index.postings.values())
+    print(f"Indexed {len(index)} documents in {build:.2f}s: {len(index.postings)} terms, "
+          f"{postings:,} postings in {posting_bytes:,} bytes ({posting_bytes / postings:.2f} bytes per posting)")
+
+    queries = sample_queries(documents, args.queries)
+    report("all collections", time_queries(index, queries))
+    report("events, ar", time_queries(index, queries, collection=next(iter(store.events)), locale="ar"))
+    report("narrators", time_queries(index, queries, collection="narrators"))
+
+    # Events appended by the ETL: copies of existing events under new ids
+    events = [document for document in documents if document.key[0] != "narrators"]
+    next_id = max(key[2] for key in index.keys if key[0] != "narrators") + 1
+    copied = random.Random(1).sample(events, min(args.append, len(events)))
+    appended = [
+        Document((document.key[0], document.key[1], next_id + i), document.texts)
+        for i, document in enumerate(copied)
+    ]
+    started = time.perf_counter()
+    index.add(appended)
+    print(f"Appended {len(appended)} events in {(time.perf_counter() - started) * 1000:.1f}ms "
+          f"(full rebuild {build * 1000:.0f}ms)")
+    started = time.perf_counter()
+    indexed, removed = index.sync(documents + appended)
+    print(f"Synced the unchanged corpus in {(time.perf_counter() - started) * 1000:.1f}ms "
+          f"({indexed} indexed, {removed} removed)")
+    report("all collections, appended", time_queries(index, queries))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""
+Indexed in-memory store of the datasets
+
+The CSVs are read once at startup. Every row is serialized to JSON once,
+and kept in a list sorted by the key its queries page through, so a page
+is a binary search and a slice, with no parsing or serialization per
+request. Pages are keyset-paginated: the cursor is the sort key of the
+last row returned, so a page costs the same wherever it starts and stays
+stable while paging.
+"""
+
+import hashlib
+import io
+import json
+import re
+import sqlite3
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+
+import pandas as pd
+
+from .config import BUNDLE_PATH, BUNDLED_EVENTS, DEFAULT_LOCALE, EVENT_SOURCES, NARRATORS_CSV
+
+# Sort key of events without a hijri year, after every real year
+UNKNOWN_YEAR = 10**9
+
+HIJRI_YEAR_RE = re.compile(r"(\d+)")
+BEFORE_HIJRA = "ق"  # "53 ق هـ" is 53 years before the Hijra
+
+Key = tuple[int, ...]
+
+
+def parse_hijri_year(text: str | None) -> int | None:
+    """Read a hijri year like "1 هـ", "53 ق هـ" (negative, before the Hijra) or "0"."""
+    if not isinstance(text, str):
+        return None
+    match = HIJRI_YEAR_RE.search(text)
+    if match is None:
+        return None
+    year = int(match.group(1))
+    return -year if BEFORE_HIJRA in text.split() else year
+
+
+def parse_cursor(text: str) -> Key:
+    """Read a cursor written by format_cursor."""
+    return tuple(int(part) for part in text.split("."))
+
+
+def format_cursor(key: Key) -> str:
+    return ".".join(str(part) for part in key)
+
+
+def serialize(row: dict) -> bytes:
+    return json.dumps(row, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def records(df: pd.DataFrame) -> list[dict]:
+    """Rows of a frame as dicts, with missing values as None."""
+    return df.astype(object).where(df.notna(), None).to_dict("records")
+
+
+@dataclass
+class Page:
+    """Serialized rows of one page and the cursor of the next page (None on the last page)."""
+
+    items: list[bytes]
+    next_cursor: str | None
+
+
+class SortedIndex:
+    """Serialized rows sorted by an integer key, paged by keyset."""
+
+    def __init__(self, rows: Iterable[tuple[Key, bytes]]):
+        ordered = sorted(rows, key=lambda row: row[0])
+        self.keys = [key for key, _ in ordered]
+        self.rows = [row for _, row in ordered]
+
+    def page(self, limit: int, after: Key | None = None, low: Key | None = None, high: Key | None = None) -> Page:
+        """
+        Rows with low <= key < high (either bound optional), starting after the cursor.
+
+        Bounds and cursors may be key prefixes: (year,) sorts before every
+        (year, event_id).
+        """
+        start = bisect_left(self.keys, low) if low is not None else 0
+        if after is not None:
+            start = max(start, bisect_right(self.keys, after))
+        end = bisect_left(self.keys, high) if high is not None else len(self.keys)
+        stop = min(end, start + limit)
+        next_cursor = format_cursor(self.keys[stop - 1]) if stop < end else None
+        return Page(self.rows[start:stop], next_cursor)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+
+class EventCollection:
+    """Events of one dataset in every locale, by event_id and by hijri year."""
+
+    def __init__(self, df: pd.DataFrame):
+        if "locale" not in df.columns:
+            df = df.assign(locale=DEFAULT_LOCALE)
+        if "year_hijri" not in df.columns:
+            df = df.assign(year_hijri=df["hijri_year"].map(parse_hijri_year))
+        df = df.assign(event_id=df["event_id"].astype(int), year_hijri=df["year_hijri"].astype("Int64"))
+
+        self.by_id: dict[tuple[str, int], bytes] = {}
+        by_year: dict[str, list[tuple[Key, bytes]]] = {}
+        for row in records(df):
+            body = serialize(row)
+            locale = row["locale"]
+            year = row["year_hijri"] if row["year_hijri"] is not None else UNKNOWN_YEAR
+            self.by_id[(locale, row["event_id"])] = body
+            by_year.setdefault(locale, []).append(((int(year), row["event_id"]), body))
+        self.by_year = {locale: SortedIndex(rows) for locale, rows in by_year.items()}
+
+    @property
+    def locales(self) -> list[str]:
+        return sorted(self.by_year)
+
+    def get(self, event_id: int, locale: str) -> bytes | None:
+        return self.by_id.get((locale, event_id))
+
+    def page(
+        self,
+        locale: str,
+        limit: int,
+        after: Key | None = None,
+        year_from: int | None = None,
+        year_to: int | None = None,
+    ) -> Page:
+        """Events of a locale ordered by (hijri year, event_id), optionally within a year range."""
+        index = self.by_year.get(locale)
+        if index is None:
+            return Page([], None)
+        low = (year_from,) if year_from is not None else None
+        high = (year_to + 1,) if year_to is not None else None
+        return index.page(limit, after, low, high)
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+
+class NarratorIndex:
+    """Narrators by index (rawi_index in the CSV, scholar_indx in the bundle)."""
+
+    def __init__(self, df: pd.DataFrame, key: str = "rawi_index"):
+        df = df.assign(**{key: df[key].astype(int)})
+        rows = [(row[key], serialize(row)) for row in records(df)]
+        self.by_id = dict(rows)
+        self.sorted = SortedIndex(((rawi_index,), body) for rawi_index, body in rows)
+
+    def get(self, rawi_index: int) -> bytes | None:
+        return self.by_id.get(rawi_index)
+
+    def page(self, limit: int, after: Key | None = None) -> Page:
+        return self.sorted.page(limit, after)
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+
+class Store:
+    """Every dataset served by the API, and a version that changes when any source file does."""
+
+    def __init__(self, events: dict[str, EventCollection], narrators: NarratorIndex, version: str):
+        self.events = events
+        self.narrators = narrators
+        self.version = version
+
+    @classmethod
+    def load(cls, event_sources: dict[str, Path] = EVENT_SOURCES, narrators_csv: Path = NARRATORS_CSV) -> "Store":
+        """Read the dataset CSVs, skipping event collections whose file does not exist."""
+        digest = hashlib.blake2b(digest_size=8)
+        events = read_event_csvs(event_sources, digest)
+        narrators = NarratorIndex(read_csv(narrators_csv, digest))
+        return cls(events, narrators, digest.hexdigest())
+
+    @classmethod
+    def load_bundle(cls, bundle: Path = BUNDLE_PATH, event_sources: dict[str, Path] = EVENT_SOURCES) -> "Store":
+        """
+        Read the narrators and seerah events from the compiled dataset bundle
+        (mki-etl/bundle), and event collections it does not hold from their CSVs.
+        """
+        digest = hashlib.blake2b(digest_size=8)
+        digest.update(bundle.read_bytes())
+        with closing(sqlite3.connect(f"file:{bundle}?mode=ro", uri=True)) as conn:
+            events = {
+                name: EventCollection(pd.read_sql_query(f"SELECT * FROM {table}", conn))
+                for name, table in BUNDLED_EVENTS.items()
+            }
+            narrators = NarratorIndex(pd.read_sql_query("SELECT * FROM narrators", conn), key="scholar_indx")
+        others = {name: path for name, path in event_sources.items() if name not in events}
+        events.update(read_event_csvs(others, digest))
+        return cls(events, narrators, digest.hexdigest())
+
+
+def read_csv(path: Path, digest: hashlib.blake2b) -> pd.DataFrame:
+    """Read a CSV, adding its bytes to the store version digest."""
+    raw = path.read_bytes()
+    digest.update(raw)
+    return pd.read_csv(io.BytesIO(raw), encoding="utf-8-sig")
+
+
+def read_event_csvs(event_sources: dict[str, Path], digest: hashlib.blake2b) -> dict[str, EventCollection]:
+    return {name: EventCollection(read_csv(path, digest)) for name, path in event_sources.items() if path.exists()}
@@ -0,0 +1,64 @@
+"""
+Text analysis for search
+
+Arabic text is normalized (tashkeel and tatweel removed, hamza and alef
+forms folded, alef maqsura and taa marbuta unified) and lightly stemmed by
+stripping common prefixes and suffixes, in the manner of the Light10
+stemmer, so "وِلادتِه" and "ولادة" share a term. Latin text is lowercased
+and its accents removed.
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+
+# Tashkeel, Quranic marks and tatweel
+ARABIC_MARKS = re.compile(r"[\u0610-\u061a\u064b-\u065f\u0670\u06d6-\u06ed\u0640]")
+ARABIC_LETTERS = str.maketrans({
+    "أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا",
+    "ؤ": "و", "ئ": "ي", "ى": "ي", "ة": "ه",
+})
+TOKEN = re.compile(r"\w{2,}")
+ARABIC = re.compile(r"[\u0621-\u064a]")
+
+# Stripped in this order; a stem keeps at least MIN_STEM letters
+ARTICLES = ("وال", "بال", "كال", "فال", "لل", "ال")
+SUFFIXES = ("ها", "ان", "ات", "ون", "ين", "يه", "ه", "ي")
+# A taa marbuta before a pronoun is written as taa ("ولادة", "ولادته"); stripped
+# only from longer words, so "بيته" keeps the taa of "بيت"
+TAA_SUFFIXES = ("تها", "ته")
+MIN_STEM = 2
+
+
+def normalize(text: str) -> str:
+    """Fold the forms of letters that vary in writing, for Arabic and Latin text."""
+    text = ARABIC_MARKS.sub("", text).translate(ARABIC_LETTERS).lower()
+    if text.isascii():
+        return text
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(char for char in decomposed if not unicodedata.combining(char) or ARABIC.match(char))
+
+
+@lru_cache(maxsize=200_000)
+def stem(token: str) -> str:
+    """Light stem of a normalized Arabic token; other tokens are returned unchanged."""
+    if not ARABIC.match(token):
+        return token
+    if len(token) > 3 and token.startswith("و"):
+        token = token[1:]
+    for article in ARTICLES:
+        if token.startswith(article) and len(token) - len(article) >= MIN_STEM:
+            token = token[len(article):]
+            break
+    for suffix in TAA_SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) > MIN_STEM:
+            return token[:-len(suffix)]
+    for suffix in SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= MIN_STEM:
+            token = token[:-len(suffix)]
+    return token
+
+
+def analyze(text: str) -> list[str]:
+    """The search terms of a text, in order."""
+    return [stem(token) for token in TOKEN.findall(normalize(text))]
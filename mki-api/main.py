@@ -1,5 +1,86 @@
+#!/usr/bin/env python3
+"""
+MKI read API
+
+Loads the datasets into an indexed in-memory store once, then serves the
+events and narrators over HTTP. Reads the compiled dataset bundle when it
+exists, and the mki-datasets CSVs otherwise.
+
+With --workers, that many processes serve the same port (SO_REUSEPORT).
+The narrator graph is built once, before they start, and each maps the
+same files, so the graph is held in memory once whatever their number.
+
+Usage:
+    uv run main.py
+    uv run main.py --host 0.0.0.0 --port 8000
+    uv run main.py --workers 4
+"""
+
+import argparse
+import multiprocessing
+import time
+from pathlib import Path
+
+from aiohttp import web
+
+from api.app import create_app
+from api.config import BUNDLE_PATH, GRAPH_DIR, HOST, PORT
+from api.graph import NarratorGraph
+from api.search import SearchIndex
+from api.store import Store
+
+
+def serve(args: argparse.Namespace, use_bundle: bool) -> None:
+    """Load the datasets and serve them; run once per worker process."""
+    started = time.perf_counter()
+    if use_bundle:
+        print(f"Reading {args.bundle}")
+        store = Store.load_bundle(args.bundle)
+    else:
+        store = Store.load()
+    counts = ", ".join(f"{len(collection)} {name}" for name, collection in store.events.items())
+    print(f"Loaded {counts} events and {len(store.narrators)} narrators in {time.perf_counter() - started:.2f}s")
+
+    started = time.perf_counter()
+    search_index = SearchIndex.from_store(store)
+    print(f"Indexed {len(search_index)} documents ({len(search_index.postings)} terms) "
+          f"for search in {time.perf_counter() - started:.2f}s")
+
+    graph = NarratorGraph.open(GRAPH_DIR) if use_bundle else None
+    web.run_app(
+        create_app(store, search_index, graph), host=args.host, port=args.port, reuse_port=args.workers > 1
+    )
+
+
 def main():
-    print("Hello from mki-api!")
+    parser = argparse.ArgumentParser(description="Serve the MKI datasets over HTTP")
+    parser.add_argument("--host", type=str, default=HOST, help="Interface to listen on")
+    parser.add_argument("--port", type=int, default=PORT, help="Port to listen on")
+    parser.add_argument("--bundle", type=Path, default=BUNDLE_PATH, help="Compiled dataset bundle")
+    parser.add_argument("--csv", action="store_true", help="Read the CSVs even if the bundle exists")
+    parser.add_argument("--workers", type=int, default=1, help="Processes serving the port")
+    args = parser.parse_args()
+
+    use_bundle = args.bundle.exists() and not args.csv
+    if use_bundle:
+        started = time.perf_counter()
+        meta = NarratorGraph.load(args.bundle, GRAPH_DIR).meta
+        print(f"Narrator graph: {meta['narrators']} narrators, {meta['edges']} links "
+              f"({time.perf_counter() - started:.2f}s)")
+
+    if args.workers <= 1:
+        serve(args, use_bundle)
+        return
+    workers = [
+        multiprocessing.Process(target=serve, args=(args, use_bundle), daemon=True) for _ in range(args.workers)
+    ]
+    for worker in workers:
+        worker.start()
+    try:
+        for worker in workers:
+            worker.join()
+    except KeyboardInterrupt:
+        pass
 
 
 if __name__ == "__main__":
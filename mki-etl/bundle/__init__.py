@@ -0,0 +1 @@
+"""Compiles the dataset CSVs into one indexed SQLite bundle, and batched SQL for D1."""
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Dataset Bundle Compiler
+
+Builds one SQLite file from the dataset CSVs, with the schema of the
+mki-web D1 migrations (tables, covering indexes and full-text search), so
+the API and the site query one artifact instead of parsing CSVs:
+
+    mki.sqlite     the bundle, for mki-api and local development
+    mki.d1.sql     the same rows as batched INSERTs, for `wrangler d1 execute`
+
+Rows are reshaped with vectorized pandas operations and inserted with
+executemany inside one transaction, so a build takes seconds. The
+full-text tables are contentless and hold text normalized by
+normalize_search_text; queries are normalized by normalize_search_query
+before MATCH. The hadith tables are created but stay empty until
+a hadith dataset lands in mki-datasets.
+
+Usage:
+    uv run python -m bundle.compile_bundle
+    uv run python -m bundle.compile_bundle --output-dir /tmp/bundle --no-d1
+"""
+
+import argparse
+import sqlite3
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import pandas as pd
+
+from .config import (
+    BUNDLE_FILE,
+    D1_FILE,
+    D1_MAX_ROWS,
+    D1_MAX_STATEMENT_BYTES,
+    GENERATION_BY_TABAQAH,
+    HIJRA_YEAR,
+    MIGRATIONS_DIR,
+    NARRATORS_CSV,
+    OUTPUT_DIR,
+    PROPHETHOOD_YEAR,
+    SEERA_CSV,
+    STATUS_BY_GRADE,
+)
+
+from narrators.parse import parse_tabaqah, parse_years
+
+# Tashkeel, Quranic marks and tatweel
+ARABIC_MARKS = "[\u0610-\u061a\u064b-\u065f\u0670\u06d6-\u06ed\u0640]"
+ARABIC_LETTERS = str.maketrans({
+    "أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا",
+    "ؤ": "و", "ئ": "ي", "ى": "ي", "ة": "ه",
+})
+# A joining "و" on words of four letters or more, then the article, possibly
+# after a one-letter preposition, when two letters remain: the same prefixes
+# as mki-api's text.py, so "والبصرة" and "بصرة" index alike. The lookarounds
+# make pandas use Python's re, whose \w matches Arabic letters.
+JOINING_WAW = r"(?<!\w)و(?=\w{3})"
+ARTICLE = r"(?<!\w)(?:[بكف]?ال|لل)(?=\w\w)"
+
+# Lunar years per solar year, to estimate gregorian years of hijri dates
+LUNAR_TO_SOLAR = 354.367 / 365.2425
+HIJRA_EPOCH = 621.57
+
+# Columns of each table as filled by the compiler, in insert order (parents first)
+SEERAH_COLUMNS = [
+    "id", "event_id", "locale", "year_hijri", "year_gregorian", "title", "description",
+    "location_name", "latitude", "longitude", "era", "event_type",
+]
+NARRATOR_COLUMNS = [
+    "scholar_indx", "name_en", "name_ar", "grade", "status", "generation",
+    "birth_year_hijri", "birth_year_gregorian", "death_year_hijri", "death_year_gregorian",
+    "birth_place", "death_place", "death_reason", "teachers", "students", "parents", "spouse",
+    "siblings", "children", "places_of_stay", "area_of_interest", "tags", "books",
+]
+
+
+def normalize_search_text(text: pd.Series) -> pd.Series:
+    """
+    Text as stored in the full-text tables: without tashkeel, with one
+    form per letter, without the article and joining "و", lowercased.
+    """
+    return (
+        text.fillna("")
+        .str.replace(ARABIC_MARKS, "", regex=True)
+        .str.translate(ARABIC_LETTERS)
+        .str.replace(JOINING_WAW, "", regex=True)
+        .str.replace(ARTICLE, "", regex=True)
+        .str.lower()
+    )
+
+
+def normalize_search_query(query: str) -> str:
+    """A query normalized like the indexed text, to MATCH against the full-text tables."""
+    return normalize_search_text(pd.Series([query], dtype="str")).iloc[0]
+
+
+def hijri_to_gregorian(years: pd.Series) -> pd.Series:
+    """Gregorian year in which most of each hijri year falls."""
+    return (years.astype("Float64") * LUNAR_TO_SOLAR + HIJRA_EPOCH).round().astype("Int64")
+
+
+def seerah_rows(df: pd.DataFrame) -> pd.DataFrame:
+    """seerah_events rows of the merged seera CSV, ordered by event and locale."""
+    df = df.sort_values(["event_id", "locale"], kind="stable", ignore_index=True)
+    coords = df["geo_coordinates"].str.split(",", n=1, expand=True)
+    year_gregorian = pd.to_numeric(df["gregorian_year"], errors="coerce").astype("Int64")
+    era = pd.Series(pd.NA, index=df.index, dtype="object")
+    era[year_gregorian < PROPHETHOOD_YEAR] = "Pre-Prophethood"
+    era[(year_gregorian >= PROPHETHOOD_YEAR) & (year_gregorian < HIJRA_YEAR)] = "Meccan"
+    era[year_gregorian >= HIJRA_YEAR] = "Medinan"
+    return pd.DataFrame({
+        "id": df.index + 1,
+        "event_id": df["event_id"].astype(str),
+        "locale": df["locale"],
+        "year_hijri": parse_years(df["hijri_year"])["min"],
+        "year_gregorian": year_gregorian,
+        "title": df["title"].fillna(""),
+        "description": df["details"],
+        "location_name": df["location_name"],
+        "latitude": pd.to_numeric(coords[0], errors="coerce"),
+        "longitude": pd.to_numeric(coords[1], errors="coerce"),
+        "era": era,
+        "event_type": pd.NA,
+    })[SEERAH_COLUMNS]
+
+
+def narrator_rows(df: pd.DataFrame) -> pd.DataFrame:
+    """narrators rows of rawi_data.csv, ordered by index."""
+    df = df.sort_values("rawi_index", ignore_index=True)
+    grade_word = df["grade_ibn_hajar"].str.extract(r"^\s*([^\s.،,]+)", expand=False)
+    # The earliest year of dates given as alternatives or ranges
+    birth_year = parse_years(df["date_birth"])["min"]
+    death_year = parse_years(df["date_death"])["min"]
+    rows = pd.DataFrame({
+        "scholar_indx": df["rawi_index"].astype(int),
+        "name_en": df["name"],  # the dataset has no transliterated names yet
+        "name_ar": df["name"],
+        "grade": df["grade_ibn_hajar"],
+        "status": grade_word.map(STATUS_BY_GRADE),
+        "generation": parse_tabaqah(df["tabaqah"])["number"].map(GENERATION_BY_TABAQAH),
+        "birth_year_hijri": birth_year,
+        "birth_year_gregorian": hijri_to_gregorian(birth_year),
+        "death_year_hijri": death_year,
+        "death_year_gregorian": hijri_to_gregorian(death_year),
+        "birth_place": df["place_birth"],
+        "death_place": df["place_death"],
+        "places_of_stay": df["place_iqama"],
+    })
+    return rows.reindex(columns=NARRATOR_COLUMNS)
+
+
+def search_rows(seerah: pd.DataFrame, narrators: pd.DataFrame) -> dict[str, pd.DataFrame]:
+    """Rows of each full-text table, keyed by the rowid of the row they index."""
+    places = narrators["birth_place"].fillna("").str.cat(narrators[["death_place", "places_of_stay"]].fillna(""), sep=" ")
+    return {
+        "seerah_events_fts": pd.DataFrame({
+            "rowid": seerah["id"],
+            "title": normalize_search_text(seerah["title"]),
+            "description": normalize_search_text(seerah["description"]),
+            "location_name": normalize_search_text(seerah["location_name"]),
+        }),
+        "narrators_fts": pd.DataFrame({
+            "rowid": narrators["scholar_indx"],
+            "name_ar": normalize_search_text(narrators["name_ar"]),
+            "name_en": normalize_search_text(narrators["name_en"]),
+            "grade": normalize_search_text(narrators["grade"]),
+            "places": normalize_search_text(places),
+        }),
+    }
+
+
+def rows(df: pd.DataFrame) -> Iterator[tuple]:
+    """Rows as tuples of plain Python values, with missing values as None."""
+    return df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+
+
+def insert_sql(table: str, columns: list[str]) -> str:
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+
+
+def create_bundle(path: Path, tables: dict[str, pd.DataFrame]) -> dict[str, int]:
+    """
+    Write the bundle: the migrations, then every table in one transaction.
+
+    The file is built next to `path` and moved into place when complete.
+    Returns the row count of each table.
+    """
+    building = path.with_suffix(".building")
+    building.unlink(missing_ok=True)
+    conn = sqlite3.connect(building)
+    try:
+        # Nothing to recover from a half-built file, so skip the journal
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        for migration in sorted(MIGRATIONS_DIR.glob("*.sql")):
+            conn.executescript(migration.read_text(encoding="utf-8"))
+
+        counts = {}
+        with conn:
+            for table, df in tables.items():
+                conn.executemany(insert_sql(table, list(df.columns)), rows(df))
+                counts[table] = len(df)
+        for table in tables:
+            if table.endswith("_fts"):
+                conn.execute(f"INSERT INTO {table}({table}) VALUES ('optimize')")
+        conn.execute("ANALYZE")
+        conn.commit()
+    finally:
+        conn.close()
+    building.replace(path)
+    return counts
+
+
+def sql_literal(value) -> str:
+    if value is None:
+        return "NULL"
+    if isinstance(value, str):
+        return "'" + value.replace("'", "''") + "'"
+    if isinstance(value, float):
+        return repr(value)
+    return str(int(value))
+
+
+def insert_batches(table: str, df: pd.DataFrame) -> Iterator[str]:
+    """Multi-row INSERTs of a table, each under D1's statement size and row limits."""
+    head = f"INSERT INTO {table} ({', '.join(df.columns)}) VALUES\n"
+    values = []
+    size = len(head)
+    for row in rows(df):
+        value = "(" + ",".join(sql_literal(v) for v in row) + ")"
+        value_size = len(value.encode("utf-8")) + 2
+        if values and (size + value_size > D1_MAX_STATEMENT_BYTES or len(values) == D1_MAX_ROWS):
+            yield head + ",\n".join(values) + ";\n"
+            values = []
+            size = len(head)
+        values.append(value)
+        size += value_size
+    if values:
+        yield head + ",\n".join(values) + ";\n"
+
+
+def write_d1_sql(path: Path, tables: dict[str, pd.DataFrame]) -> int:
+    """
+    Write SQL replacing the rows of every table, for a D1 database migrated
+    to the same schema. D1 runs a file as one batch and rejects explicit
+    transactions, so there is no BEGIN/COMMIT. Returns the number of INSERTs.
+    """
+    statements = 0
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write("-- Generated by mki-etl/bundle/compile_bundle.py, do not edit\n")
+        for table in reversed(list(tables)):
+            if table.endswith("_fts"):
+                f.write(f"INSERT INTO {table}({table}) VALUES ('delete-all');\n")
+            else:
+                f.write(f"DELETE FROM {table};\n")
+        for table, df in tables.items():
+            for statement in insert_batches(table, df):
+                f.write(statement)
+                statements += 1
+    return statements
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile the dataset CSVs into an indexed SQLite bundle")
+    parser.add_argument("--seera", type=Path, default=SEERA_CSV, help="Merged seera events CSV")
+    parser.add_argument("--narrators", type=Path, default=NARRATORS_CSV, help="Narrators CSV")
+    parser.add_argument("--output-dir", type=Path, default=OUTPUT_DIR, help="Output directory")
+    parser.add_argument("--no-d1", action="store_true", help="Skip the D1 SQL export")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    seerah = seerah_rows(pd.read_csv(args.seera, encoding="utf-8-sig"))
+    narrators = narrator_rows(pd.read_csv(args.narrators, encoding="utf-8-sig"))
+    tables = {"narrators": narrators, "seerah_events": seerah, **search_rows(seerah, narrators)}
+    print(f"Read and reshaped the CSVs in {time.perf_counter() - started:.2f}s")
+
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    bundle = args.output_dir / BUNDLE_FILE
+    step = time.perf_counter()
+    counts = create_bundle(bundle, tables)
+    for table, count in counts.items():
+        print(f"  {table}: {count:,} rows")
+    print(f"Wrote {bundle} ({bundle.stat().st_size:,} bytes) in {time.perf_counter() - step:.2f}s")
+
+    if not args.no_d1:
+        d1_sql = args.output_dir / D1_FILE
+        step = time.perf_counter()
+        statements = write_d1_sql(d1_sql, tables)
+        print(f"Wrote {d1_sql} ({statements} INSERTs, {d1_sql.stat().st_size:,} bytes) "
+              f"in {time.perf_counter() - step:.2f}s")
+
+    print(f"Done in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
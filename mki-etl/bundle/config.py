@@ -0,0 +1,54 @@
+# Settings for the dataset bundle compiler
+from pathlib import Path
+
+# Paths
+PACKAGE_DIR = Path(__file__).parent
+PROJECT_ROOT = PACKAGE_DIR.parent.parent  # mki-etl -> mki
+DATASETS_DIR = PROJECT_ROOT / "mki-datasets"
+SEERA_CSV = DATASETS_DIR / "seera" / "seera_events_all.csv"
+NARRATORS_CSV = DATASETS_DIR / "hadith" / "rawi_data.csv"
+
+# The bundle is built from the same migrations D1 runs, in filename order
+MIGRATIONS_DIR = PROJECT_ROOT / "mki-web" / "migrations"
+
+OUTPUT_DIR = DATASETS_DIR / "bundle"
+BUNDLE_FILE = "mki.sqlite"
+D1_FILE = "mki.d1.sql"
+
+# D1 rejects statements over 100 KB; multi-row INSERTs are cut below that
+D1_MAX_STATEMENT_BYTES = 90_000
+D1_MAX_ROWS = 500
+
+# Gregorian years the Meccan and Medinan eras start (the first revelation and the Hijra)
+PROPHETHOOD_YEAR = 610
+HIJRA_YEAR = 622
+
+# Narrator status by the first word of Ibn Hajar's grade (see NarratorStatus in mki-web)
+STATUS_BY_GRADE = {
+    "صحابي": "companion",
+    "صحابية": "companion",
+    "ثقة": "trustworthy",
+    "صدوق": "truthful",
+    "مقبول": "unknown",
+    "مقبولة": "unknown",
+    "مجهول": "unknown",
+    "مجهولة": "unknown",
+    "مستور": "unknown",
+    "مستورة": "unknown",
+    "ضعيف": "weak",
+    "ضعيفة": "weak",
+    "لين": "weak",
+    "متروك": "weak",
+    "منكر": "weak",
+    "كذاب": "weak",
+}
+
+# Narrator generation by Ibn Hajar's tabaqah number (see NarratorGeneration in
+# mki-web): the first is the companions, the second to fifth the successors,
+# the sixth to ninth those who did not meet a companion, and the rest later
+GENERATION_BY_TABAQAH = {
+    1: "sahaba",
+    2: "tabieen", 3: "tabieen", 4: "tabieen", 5: "tabieen",
+    6: "atba_tabieen", 7: "atba_tabieen", 8: "atba_tabieen", 9: "atba_tabieen",
+    10: "later", 11: "later", 12: "later",
+}
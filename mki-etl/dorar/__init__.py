@@ -0,0 +1,34 @@
+"""Shared scraping library for the Dorar.net Historical Encyclopedia."""
+
+from .backends import PARSERS, ParserBackend, get_parser
+from .cache import ResponseCache
+from .crawler import AsyncCrawler, TokenBucket
+from .journal import CrawlJournal
+from .parser import parse_event_details, parse_event_ids
+from .profiles import HISTORY, PROFILES, SEERA, EraProfile, get_profile
+from .scraper import get_event_details, get_event_ids_from_page, save_to_csv, scrape_all_events
+from .sink import CsvSink, ParquetSink, external_sort
+
+__all__ = [
+    "AsyncCrawler",
+    "TokenBucket",
+    "ResponseCache",
+    "CrawlJournal",
+    "ParserBackend",
+    "PARSERS",
+    "get_parser",
+    "EraProfile",
+    "HISTORY",
+    "SEERA",
+    "PROFILES",
+    "get_profile",
+    "parse_event_ids",
+    "parse_event_details",
+    "get_event_ids_from_page",
+    "get_event_details",
+    "scrape_all_events",
+    "save_to_csv",
+    "CsvSink",
+    "ParquetSink",
+    "external_sort",
+]
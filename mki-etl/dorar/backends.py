@@ -0,0 +1,39 @@
+"""Registry of interchangeable HTML parser backends."""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from . import lxml_parser, parser
+from .profiles import EraProfile
+
+
+@dataclass(frozen=True)
+class ParserBackend:
+    """Functions turning raw listing and event pages into IDs and event rows."""
+
+    name: str
+    parse_listing: Callable[[bytes | str, EraProfile], list[int]]
+    parse_event: Callable[[bytes | str, int, str, EraProfile], dict]
+
+
+PARSERS = {
+    "bs4": ParserBackend("bs4", parser.parse_listing, parser.parse_event),
+    "lxml": ParserBackend("lxml", lxml_parser.parse_listing, lxml_parser.parse_event),
+}
+
+
+def get_parser(name: str) -> ParserBackend:
+    """Get a parser backend by name."""
+    if name not in PARSERS:
+        raise ValueError(f"Unknown parser: {name}. Supported: {list(PARSERS.keys())}")
+    return PARSERS[name]
+
+
+def parse_listing_page(parser: str, profile: EraProfile, body: bytes) -> list[int]:
+    """Parse a listing page by backend name (picklable for worker processes)."""
+    return get_parser(parser).parse_listing(body, profile)
+
+
+def parse_event_page(parser: str, profile: EraProfile, event_id: int, url: str, body: bytes) -> dict:
+    """Parse an event page by backend name (picklable for worker processes)."""
+    return get_parser(parser).parse_event(body, event_id, url, profile)
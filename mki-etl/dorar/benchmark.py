@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Parser Benchmark over Saved Pages
+
+Parses the listing and event pages stored in the response cache with every
+parser backend, checks that all backends produce identical output, and
+reports the per-page parse time of each.
+
+Usage:
+    uv run python -m dorar.benchmark
+    uv run python -m dorar.benchmark --era seera --repeat 5
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from .backends import PARSERS, ParserBackend
+from .cache import ResponseCache
+from .config import CACHE_DIR
+from .parser import EVENT_LINK_RE
+from .profiles import PROFILES, EraProfile
+
+
+def time_backend(backend: ParserBackend, pages: list[tuple[str, bytes]], profile: EraProfile, repeat: int) -> tuple[float, list]:
+    """Parse every page `repeat` times and return seconds per page and the results."""
+    results = []
+    started = time.perf_counter()
+    for _ in range(repeat):
+        results = []
+        for url, body in pages:
+            match = EVENT_LINK_RE.search(url)
+            if match:
+                results.append(backend.parse_event(body, int(match.group(1)), url, profile))
+            else:
+                results.append(backend.parse_listing(body, profile))
+    elapsed = time.perf_counter() - started
+    return elapsed / (repeat * len(pages)), results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the HTML parser backends on cached pages")
+    parser.add_argument("--cache-dir", type=Path, default=CACHE_DIR, help="Response cache directory")
+    parser.add_argument("--era", type=str, default="history", choices=list(PROFILES.keys()), help="Era profile")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes over the pages per backend")
+    args = parser.parse_args()
+
+    profile = PROFILES[args.era]
+    cache = ResponseCache(args.cache_dir, offline=True)
+    urls = cache.urls("/history")
+    pages = [(url, entry.body) for url in urls if (entry := cache.get(url)) is not None]
+    cache.close()
+
+    if not pages:
+        print(f"No cached pages in {args.cache_dir}. Run a scraper first.")
+        return
+
+    event_count = sum(1 for url, _ in pages if EVENT_LINK_RE.search(url))
+    print(f"Benchmarking {len(pages)} cached pages ({event_count} event, {len(pages) - event_count} listing)")
+
+    baseline = None
+    for name, backend in PARSERS.items():
+        per_page, results = time_backend(backend, pages, profile, args.repeat)
+        print(f"  {name:>5}: {per_page * 1000:.3f} ms/page ({1 / per_page:,.0f} pages/s)")
+
+        if baseline is None:
+            baseline = (name, results)
+            continue
+        mismatches = [url for (url, _), a, b in zip(pages, baseline[1], results) if a != b]
+        if mismatches:
+            print(f"         {len(mismatches)} pages differ from {baseline[0]}, e.g. {mismatches[0]}")
+        else:
+            print(f"         identical to {baseline[0]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+On-disk HTTP response cache for the Dorar.net scrapers
+
+Response bodies are stored content-addressed (by SHA-256 of the body) under
+the cache directory, and a small SQLite index maps each URL to its body along
+with the ETag/Last-Modified validators needed for conditional revalidation.
+The cache is bounded in size and evicts least recently used entries first.
+"""
+
+import hashlib
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from .config import CACHE_DIR, CACHE_MAX_BYTES, CACHE_TTL
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+  url TEXT PRIMARY KEY,
+  digest TEXT NOT NULL,
+  size INTEGER NOT NULL,
+  etag TEXT,
+  last_modified TEXT,
+  fetched_at REAL NOT NULL,
+  accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at);
+CREATE INDEX IF NOT EXISTS idx_responses_digest ON responses(digest);
+"""
+
+
+@dataclass
+class CachedResponse:
+    """A cached response body and its revalidation metadata."""
+
+    url: str
+    body: bytes
+    etag: str | None
+    last_modified: str | None
+    fetched_at: float
+
+    def conditional_headers(self) -> dict[str, str]:
+        """Get the headers for a conditional GET of this response."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """Content-addressed response store with TTL, LRU eviction and offline replay."""
+
+    def __init__(
+        self,
+        cache_dir: Path = CACHE_DIR,
+        ttl: float | None = CACHE_TTL,
+        max_bytes: int = CACHE_MAX_BYTES,
+        offline: bool = False,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.objects_dir = self.cache_dir / "objects"
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl  # seconds; None means entries never go stale
+        self.max_bytes = max_bytes
+        self.offline = offline  # replay only, never touch the network
+        self.hits = 0
+        self.revalidated = 0
+        self.fetched = 0
+
+        self._db = sqlite3.connect(self.cache_dir / "index.sqlite3", isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+        self._total_bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def _object_path(self, digest: str) -> Path:
+        """Get the file path of a stored body."""
+        return self.objects_dir / digest[:2] / digest
+
+    def get(self, url: str) -> CachedResponse | None:
+        """Look up a cached response, marking it as recently used."""
+        row = self._db.execute(
+            "SELECT digest, etag, last_modified, fetched_at FROM responses WHERE url = ?", (url,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        digest, etag, last_modified, fetched_at = row
+        try:
+            body = self._object_path(digest).read_bytes()
+        except FileNotFoundError:
+            self._delete(url, digest)
+            return None
+
+        self._db.execute("UPDATE responses SET accessed_at = ? WHERE url = ?", (time.time(), url))
+        return CachedResponse(url, body, etag, last_modified, fetched_at)
+
+    def is_fresh(self, entry: CachedResponse) -> bool:
+        """Check whether a cached response can be served without revalidation."""
+        if self.offline or self.ttl is None:
+            return True
+        return time.time() - entry.fetched_at < self.ttl
+
+    def lookup(self, url: str, revalidate: bool = False) -> tuple[CachedResponse | None, bool]:
+        """Get a cached response and whether it can be served as is, counting hits.
+
+        With `revalidate`, entries are never served as is (except offline),
+        so the caller always makes a conditional request.
+        """
+        entry = self.get(url)
+        fresh = entry is not None and (self.offline or (not revalidate and self.is_fresh(entry)))
+        if fresh:
+            self.hits += 1
+        return entry, fresh
+
+    def put(self, url: str, body: bytes, etag: str | None = None, last_modified: str | None = None) -> None:
+        """Store a response body, evicting old entries if over the size limit."""
+        self.fetched += 1
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._object_path(digest)
+        if not path.exists():
+            path.parent.mkdir(exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_bytes(body)
+            os.replace(tmp_path, path)
+
+        previous = self._db.execute("SELECT digest, size FROM responses WHERE url = ?", (url,)).fetchone()
+        now = time.time()
+        self._db.execute(
+            "INSERT OR REPLACE INTO responses (url, digest, size, etag, last_modified, fetched_at, accessed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (url, digest, len(body), etag, last_modified, now, now),
+        )
+        self._total_bytes += len(body)
+        if previous:
+            self._total_bytes -= previous[1]
+            if previous[0] != digest:
+                self._delete_object_if_unused(previous[0])
+
+        if self._total_bytes > self.max_bytes:
+            self.evict()
+
+    def touch(self, url: str) -> None:
+        """Mark a cached response as revalidated (server answered 304)."""
+        now = time.time()
+        self._db.execute("UPDATE responses SET fetched_at = ?, accessed_at = ? WHERE url = ?", (now, now, url))
+        self.revalidated += 1
+
+    def evict(self) -> None:
+        """Drop least recently used entries until the cache fits in max_bytes."""
+        rows = self._db.execute("SELECT url, digest FROM responses ORDER BY accessed_at").fetchall()
+        for url, digest in rows:
+            if self._total_bytes <= self.max_bytes:
+                break
+            self._delete(url, digest)
+
+    def _delete(self, url: str, digest: str) -> None:
+        """Remove an index entry and its body if no other URL shares it."""
+        row = self._db.execute("SELECT size FROM responses WHERE url = ?", (url,)).fetchone()
+        self._db.execute("DELETE FROM responses WHERE url = ?", (url,))
+        if row:
+            self._total_bytes -= row[0]
+        self._delete_object_if_unused(digest)
+
+    def _delete_object_if_unused(self, digest: str) -> None:
+        """Delete a stored body once no URL references it."""
+        in_use = self._db.execute("SELECT 1 FROM responses WHERE digest = ? LIMIT 1", (digest,)).fetchone()
+        if not in_use:
+            self._object_path(digest).unlink(missing_ok=True)
+
+    def urls(self, contains: str = "") -> list[str]:
+        """List cached URLs, optionally only those containing a substring."""
+        rows = self._db.execute("SELECT url FROM responses WHERE instr(url, ?) > 0 ORDER BY url", (contains,))
+        return [row[0] for row in rows]
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def summary(self) -> str:
+        """Describe cache usage for progress output."""
+        return (
+            f"{self.hits} hits, {self.revalidated} revalidated, {self.fetched} fetched; "
+            f"{len(self)} entries, {self._total_bytes / 1_000_000:.1f} MB"
+        )
+
+    def close(self) -> None:
+        """Close the index database."""
+        self._db.close()
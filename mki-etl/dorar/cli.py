@@ -0,0 +1,49 @@
+"""Command-line entry point shared by the era scripts."""
+
+import argparse
+from pathlib import Path
+
+from .backends import PARSERS
+from .cache import ResponseCache
+from .config import BASE_URL, CACHE_DIR, CACHE_TTL, DEFAULT_PARSER, MAX_CONNECTIONS, PARSE_WORKERS, REQUESTS_PER_SECOND
+from .profiles import EraProfile
+from .scraper import run
+from .sink import OUTPUT_FORMATS
+
+
+def main(profile: EraProfile) -> None:
+    """Parse scraper options and scrape the given era."""
+    parser = argparse.ArgumentParser(description=f"Scrape {profile.description} events from Dorar.net")
+    parser.add_argument("--rps", type=float, default=REQUESTS_PER_SECOND, help="Target requests per second")
+    parser.add_argument("--connections", type=int, default=MAX_CONNECTIONS, help="Maximum concurrent connections")
+    parser.add_argument("--base-url", type=str, default=BASE_URL, help="Site root (e.g. a local stub server)")
+    parser.add_argument("--cache-dir", type=Path, default=CACHE_DIR, help="Response cache directory")
+    parser.add_argument("--cache-ttl", type=float, default=CACHE_TTL / 86400, help="Days before cached pages are revalidated")
+    parser.add_argument("--no-cache", action="store_true", help="Always fetch from the network")
+    parser.add_argument("--offline", action="store_true", help="Replay from the cache only, without network access")
+    parser.add_argument("--incremental", action="store_true", help="Only fetch new or changed events and merge them into the existing CSV")
+    parser.add_argument("--parser", type=str, default=DEFAULT_PARSER, choices=list(PARSERS.keys()), help="HTML parser backend")
+    parser.add_argument("--workers", type=int, default=PARSE_WORKERS, help="Parser processes (0 parses in the event loop)")
+    parser.add_argument(
+        "--format",
+        type=str,
+        nargs="+",
+        default=["csv"],
+        choices=OUTPUT_FORMATS,
+        help="Output formats (parquet is written next to the CSV)",
+    )
+    parser.add_argument("--fresh", action="store_true", help="Discard the progress journal of an interrupted run")
+    args = parser.parse_args()
+
+    if args.no_cache and args.offline:
+        parser.error("--offline needs the cache")
+
+    cache = None
+    if not args.no_cache:
+        cache = ResponseCache(args.cache_dir, ttl=args.cache_ttl * 86400, offline=args.offline)
+
+    try:
+        run(profile, args.rps, args.connections, args.base_url, cache, args.incremental, args.fresh, args.parser, args.workers, args.format)
+    finally:
+        if cache is not None:
+            cache.close()
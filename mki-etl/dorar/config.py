@@ -0,0 +1,64 @@
+# Shared settings for the Dorar.net scrapers
+import os
+from pathlib import Path
+
+# Paths
+PACKAGE_DIR = Path(__file__).parent
+PROJECT_ROOT = PACKAGE_DIR.parent.parent  # mki-etl -> mki
+DATASETS_DIR = PROJECT_ROOT / "mki-datasets"
+
+CACHE_DIR = PACKAGE_DIR.parent / ".cache" / "dorar"
+JOURNAL_DIR = PACKAGE_DIR.parent / ".cache" / "journal"
+
+# Site
+BASE_URL = "https://dorar.net"
+EVENT_PATH_TEMPLATE = "/history/event/{event_id}"
+
+# HTTP headers to mimic browser
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.5,ar;q=0.3",
+}
+
+# HTTP Settings
+REQUESTS_PER_SECOND = 2.0  # per-host rate limit
+MAX_CONNECTIONS = 8  # connection pool size
+MAX_RETRIES = 3
+RETRY_BACKOFF = 1.0  # seconds, doubled after each failed attempt
+REQUEST_TIMEOUT = 30.0  # seconds
+EVENT_MAX_ATTEMPTS = 3  # crawl runs an event may fail in (404, unparseable page) before it is given up
+
+# Parser settings
+DEFAULT_PARSER = "lxml"  # "lxml" or "bs4", see backends.py
+PARSE_WORKERS = os.cpu_count() or 1  # parser processes (0 parses in the event loop)
+
+# Response cache settings
+CACHE_TTL = 30 * 24 * 3600.0  # seconds before a cached page is revalidated
+CACHE_MAX_BYTES = 2_000_000_000  # evict least recently used pages beyond this
+
+# Output settings
+SORT_RUN_SIZE = 10_000  # rows sorted in memory before spilling a run to disk
+ARROW_BATCH_SIZE = 1_000  # rows per Parquet record batch
+
+# Incremental crawl settings
+PROBE_WINDOW = 5  # event IDs probed per round above the highest known ID
+
+# Output columns shared by every era
+EVENT_COLUMNS = (
+    "event_id",
+    "title",
+    "hijri_year",
+    "lunar_month",
+    "gregorian_year",
+    "details",
+    "source_url",
+    "location_name",
+    "geo_coordinates",
+)
+
+# Columns scraped from the event page (the rest are filled by mki-agents)
+CONTENT_COLUMNS = ("title", "hijri_year", "lunar_month", "gregorian_year", "details")
+
+# Repetitive text columns stored dictionary-encoded in columnar output
+DICTIONARY_COLUMNS = ("hijri_year", "lunar_month", "gregorian_year", "location_name", "geo_coordinates")
@@ -0,0 +1,282 @@
+"""
+Async crawl engine for Dorar.net
+
+Fetches listing pages and event pages concurrently over a bounded pool of
+connections. Requests are throttled by a per-host token bucket, and event
+pages start downloading as soon as their IDs come out of a listing page.
+HTML parsing runs in a separate process pool so it never stalls fetching.
+"""
+
+import asyncio
+import time
+from collections.abc import AsyncIterator, Callable
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from .cache import ResponseCache
+from .config import (
+    MAX_CONNECTIONS,
+    MAX_RETRIES,
+    PARSE_WORKERS,
+    REQUEST_TIMEOUT,
+    REQUESTS_PER_SECOND,
+    RETRY_BACKOFF,
+)
+from .journal import CrawlJournal
+
+# Status codes worth retrying (rate limited or server-side failures)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Token-bucket rate limiter allowing `rate` requests per second.
+
+    `capacity` sets how many requests may burst after an idle period;
+    the default of one keeps the long-run rate exactly at `rate`.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and consume it."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class AsyncCrawler:
+    """Crawl listing pages and their event pages with overlapping phases."""
+
+    def __init__(
+        self,
+        headers: dict[str, str],
+        requests_per_second: float = REQUESTS_PER_SECOND,
+        max_connections: int = MAX_CONNECTIONS,
+        listing_concurrency: int = 2,
+        retries: int = MAX_RETRIES,
+        timeout: float = REQUEST_TIMEOUT,
+        cache: ResponseCache | None = None,
+        parse_workers: int = PARSE_WORKERS,
+    ):
+        self.headers = headers
+        self.requests_per_second = requests_per_second
+        self.max_connections = max_connections
+        self.listing_concurrency = listing_concurrency
+        self.retries = retries
+        self.timeout = timeout
+        self.cache = cache
+        self.parse_workers = parse_workers  # 0 parses in the event loop
+        self.parser_tasks = 2 * max(1, parse_workers)  # keeps every worker busy
+        self._buckets: dict[str, TokenBucket] = {}
+        self.request_count = 0
+
+    def _bucket_for(self, url: str) -> TokenBucket:
+        """Get the rate limiter for the host of a URL."""
+        host = urlsplit(url).netloc
+        if host not in self._buckets:
+            self._buckets[host] = TokenBucket(self.requests_per_second)
+        return self._buckets[host]
+
+    @asynccontextmanager
+    async def open_session(self) -> AsyncIterator[aiohttp.ClientSession]:
+        """Open a client session over the bounded connection pool."""
+        connector = aiohttp.TCPConnector(limit=self.max_connections)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        async with aiohttp.ClientSession(headers=self.headers, connector=connector, timeout=timeout) as session:
+            yield session
+
+    async def fetch(self, session: aiohttp.ClientSession, url: str, revalidate: bool = False) -> bytes | None:
+        """Fetch a URL and return the raw body, retrying with backoff.
+
+        Fresh cached responses are returned without touching the network,
+        and stale ones (or all of them, with `revalidate`) are revalidated
+        with a conditional GET. Client errors such as 404 are not retried.
+        """
+        cached = None
+        if self.cache is not None:
+            cached, fresh = self.cache.lookup(url, revalidate)
+            if fresh:
+                return cached.body
+            if self.cache.offline:
+                print(f"  Not cached (offline): {url}")
+                return None
+
+        headers = cached.conditional_headers() if cached is not None else {}
+        bucket = self._bucket_for(url)
+        for attempt in range(self.retries):
+            await bucket.acquire()
+            self.request_count += 1
+            try:
+                async with session.get(url, headers=headers) as response:
+                    if response.status == 304 and cached is not None:
+                        self.cache.touch(url)
+                        return cached.body
+                    if response.status >= 400 and response.status not in RETRY_STATUSES:
+                        print(f"  HTTP {response.status} for {url}")
+                        return None
+                    response.raise_for_status()
+                    body = await response.read()
+                    if self.cache is not None:
+                        self.cache.put(url, body, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+                    return body
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                print(f"  Attempt {attempt + 1}/{self.retries} failed for {url}: {e!r}")
+                if attempt < self.retries - 1:
+                    await asyncio.sleep(RETRY_BACKOFF * 2 ** attempt)
+        return None
+
+    async def crawl(
+        self,
+        listing_urls: list[str],
+        extract_ids: Callable[[bytes], list[int]],
+        event_url: Callable[[int], str],
+        parse_event: Callable[[int, str, bytes], dict | None],
+        journal: CrawlJournal | None = None,
+    ) -> list[dict]:
+        """
+        Crawl all listing URLs and the events they link to.
+
+        Work flows through a pipeline: fetchers put raw pages on a bounded
+        queue, parsers turn them into event dicts (in a process pool when
+        `parse_workers` > 0, so parsing never blocks the network), and a
+        single writer collects the results.
+
+        Events are returned in listing order (page, then position on page),
+        the same order a sequential crawl would produce.
+
+        With a journal, pages and events already recorded there are skipped,
+        as are events it has given up on; new ones are recorded as they
+        complete instead of being kept in memory (the returned list is then
+        empty), and events that fail are recorded as failures. The parse callables must
+        be picklable when a process pool is used.
+        """
+        page_queue: asyncio.Queue[tuple[int, str] | None] = asyncio.Queue()
+        event_queue: asyncio.Queue[int | None] = asyncio.Queue()
+        parse_queue: asyncio.Queue[tuple[int, str, bytes] | None] = asyncio.Queue(maxsize=4 * self.parser_tasks)
+        write_queue: asyncio.Queue[dict | None] = asyncio.Queue()
+        order: dict[int, tuple[int, int]] = {}
+        events: dict[int, dict] = {}
+        pages_done = 0
+        events_done = 0
+
+        recorded_pages = journal.completed_pages() if journal is not None else {}
+        recorded_events = journal.completed_event_ids() if journal is not None else set()
+        given_up = set(journal.given_up_events()) if journal is not None else set()
+        if recorded_pages or recorded_events:
+            print(f"Resuming from journal: {len(recorded_pages)} listing pages, {len(recorded_events)} events done"
+                  + (f", {len(given_up)} given up" if given_up else ""))
+        recorded_events |= given_up
+
+        for page_index, url in enumerate(listing_urls):
+            page_queue.put_nowait((page_index, url))
+        for _ in range(self.listing_concurrency):
+            page_queue.put_nowait(None)
+
+        loop = asyncio.get_running_loop()
+        pool = ProcessPoolExecutor(self.parse_workers) if self.parse_workers > 0 else None
+
+        async def run_parser(func: Callable, *args):
+            if pool is None:
+                return func(*args)
+            return await loop.run_in_executor(pool, func, *args)
+
+        async def listing_worker(session: aiohttp.ClientSession) -> None:
+            nonlocal pages_done
+            while (item := await page_queue.get()) is not None:
+                page_index, url = item
+                if url in recorded_pages:
+                    page_ids = recorded_pages[url]
+                else:
+                    body = await self.fetch(session, url)
+                    if body is None:
+                        print(f"  Failed to fetch listing page {url}")
+                        continue
+                    page_ids = await run_parser(extract_ids, body)
+                    if journal is not None:
+                        journal.record_page(url, page_ids)
+                new_ids = 0
+                for position, event_id in enumerate(page_ids):
+                    if event_id in order:
+                        continue
+                    order[event_id] = (page_index, position)
+                    if event_id not in recorded_events:
+                        event_queue.put_nowait(event_id)
+                    new_ids += 1
+                pages_done += 1
+                print(f"  Listing {pages_done}/{len(listing_urls)}: {new_ids} new events from {url}")
+
+        async def fetch_worker(session: aiohttp.ClientSession) -> None:
+            while (event_id := await event_queue.get()) is not None:
+                url = event_url(event_id)
+                body = await self.fetch(session, url)
+                if body is None:
+                    print(f"  Failed to fetch event {event_id}")
+                    if journal is not None:
+                        journal.record_failure(event_id, "fetch")
+                    continue
+                await parse_queue.put((event_id, url, body))
+
+        async def parse_worker() -> None:
+            while (item := await parse_queue.get()) is not None:
+                event = await run_parser(parse_event, *item)
+                if event:
+                    write_queue.put_nowait(event)
+                elif journal is not None:
+                    journal.record_failure(item[0], "parse")
+
+        async def writer() -> None:
+            nonlocal events_done
+            while (event := await write_queue.get()) is not None:
+                if journal is not None:
+                    journal.record_event(event)
+                else:
+                    events[event["event_id"]] = event
+                events_done += 1
+                if events_done % 100 == 0:
+                    print(f"  Progress: {events_done}/{len(order) - len(recorded_events)} events fetched")
+
+        started = time.monotonic()
+
+        try:
+            async with self.open_session() as session:
+                writer_task = asyncio.create_task(writer())
+                parse_tasks = [asyncio.create_task(parse_worker()) for _ in range(self.parser_tasks)]
+                fetch_tasks = [asyncio.create_task(fetch_worker(session)) for _ in range(self.max_connections)]
+
+                # Shut each stage down once the one feeding it has finished
+                await asyncio.gather(*(listing_worker(session) for _ in range(self.listing_concurrency)))
+                for _ in fetch_tasks:
+                    event_queue.put_nowait(None)
+                await asyncio.gather(*fetch_tasks)
+                for _ in parse_tasks:
+                    await parse_queue.put(None)
+                await asyncio.gather(*parse_tasks)
+                write_queue.put_nowait(None)
+                await writer_task
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+
+        elapsed = time.monotonic() - started
+        rate = self.request_count / elapsed if elapsed else 0.0
+        print(f"\nCrawled {events_done} events with {self.request_count} requests in {elapsed:.1f}s ({rate:.2f} req/s)")
+        if self.cache is not None:
+            print(f"Cache: {self.cache.summary()}")
+
+        return [events[eid] for eid in sorted(events, key=order.__getitem__)]
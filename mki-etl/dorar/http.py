@@ -0,0 +1,53 @@
+"""Pooled, retrying HTTP fetching for one-off (synchronous) requests."""
+
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .cache import ResponseCache
+from .config import HEADERS, MAX_CONNECTIONS, MAX_RETRIES, REQUEST_TIMEOUT, RETRY_BACKOFF
+
+_session: requests.Session | None = None
+
+
+def get_session() -> requests.Session:
+    """Get the shared keep-alive session, creating it on first use."""
+    global _session
+    if _session is None:
+        _session = requests.Session()
+        _session.headers.update(HEADERS)
+        adapter = HTTPAdapter(pool_connections=MAX_CONNECTIONS, pool_maxsize=MAX_CONNECTIONS)
+        _session.mount("https://", adapter)
+        _session.mount("http://", adapter)
+    return _session
+
+
+def fetch(url: str, retries: int = MAX_RETRIES, cache: ResponseCache | None = None) -> bytes | None:
+    """Fetch a URL and return the raw body, retrying with exponential backoff."""
+    cached = None
+    if cache is not None:
+        cached, fresh = cache.lookup(url)
+        if fresh:
+            return cached.body
+        if cache.offline:
+            print(f"  Not cached (offline): {url}")
+            return None
+
+    headers = cached.conditional_headers() if cached is not None else {}
+    session = get_session()
+    for attempt in range(retries):
+        try:
+            response = session.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+            if response.status_code == 304 and cached is not None:
+                cache.touch(url)
+                return cached.body
+            response.raise_for_status()
+            if cache is not None:
+                cache.put(url, response.content, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+            return response.content
+        except requests.RequestException as e:
+            print(f"  Attempt {attempt + 1}/{retries} failed for {url}: {e}")
+            if attempt < retries - 1:
+                time.sleep(RETRY_BACKOFF * 2 ** attempt)
+    return None
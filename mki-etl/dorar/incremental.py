@@ -0,0 +1,230 @@
+"""
+Incremental crawl that only fetches new or changed events
+
+The previous CSV tells us which events we already have, the highest event
+ID and a hash of each event's scraped content. Listing pages are walked
+from the most recent end, and paging stops at the first page whose events
+are all known. Event IDs above the highest known one are probed directly,
+since new events get new IDs wherever they fall in the timeline. Only the
+events found this way are fetched, and new or changed rows are merged back
+into the existing CSV.
+"""
+
+import asyncio
+import hashlib
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+import aiohttp
+import pandas as pd
+
+from .backends import ParserBackend, get_parser
+from .cache import ResponseCache
+from .config import (
+    BASE_URL,
+    CONTENT_COLUMNS,
+    DEFAULT_PARSER,
+    HEADERS,
+    MAX_CONNECTIONS,
+    PROBE_WINDOW,
+    REQUESTS_PER_SECOND,
+)
+from .crawler import AsyncCrawler
+from .profiles import EraProfile
+from .sink import open_sinks, write_events
+
+
+def content_hashes(df: pd.DataFrame) -> pd.Series:
+    """Hash the scraped content columns of each row."""
+    joined = df.reindex(columns=list(CONTENT_COLUMNS)).fillna("").astype(str).agg("\x1f".join, axis=1)
+    return joined.map(lambda text: hashlib.sha1(text.encode("utf-8")).hexdigest())
+
+
+@dataclass
+class PreviousEvents:
+    """Events from the previous run and the hash of their content."""
+
+    df: pd.DataFrame
+    hashes: dict[int, str]
+
+    @property
+    def max_id(self) -> int:
+        return max(self.hashes, default=0)
+
+    def is_known(self, event_id: int) -> bool:
+        return event_id in self.hashes
+
+
+def load_previous(path: Path) -> PreviousEvents | None:
+    """Load the previous output CSV, keeping every value as text."""
+    if not path.exists():
+        return None
+
+    df = pd.read_csv(path, dtype=str, encoding="utf-8-sig")
+    if df.empty:
+        return None
+    df["event_id"] = df["event_id"].astype(int)
+    hashes = dict(zip(df["event_id"], content_hashes(df)))
+    return PreviousEvents(df, hashes)
+
+
+async def discover_listing_ids(
+    crawler: AsyncCrawler,
+    session: aiohttp.ClientSession,
+    profile: EraProfile,
+    previous: PreviousEvents,
+    base_url: str,
+    backend: ParserBackend,
+) -> list[int]:
+    """Walk listing pages from the last one back until a page has only known events."""
+    event_ids = []
+    seen = set()
+
+    for page in range(profile.total_pages, 0, -1):
+        body = await crawler.fetch(session, profile.listing_url(page, base_url), revalidate=True)
+        if body is None:
+            continue
+
+        page_ids = backend.parse_listing(body, profile)
+        event_ids.extend(eid for eid in page_ids if eid not in seen)
+        seen.update(page_ids)
+
+        if page_ids and all(previous.is_known(eid) for eid in page_ids):
+            print(f"  Listing page {page} has no new events, stopping")
+            break
+
+    return event_ids
+
+
+async def probe_new_ids(
+    crawler: AsyncCrawler,
+    session: aiohttp.ClientSession,
+    profile: EraProfile,
+    previous: PreviousEvents,
+    base_url: str,
+    backend: ParserBackend,
+) -> dict[int, dict]:
+    """Fetch event IDs above the highest known one until a whole window is missing."""
+    events = {}
+    next_id = previous.max_id + 1
+
+    while True:
+        window = [eid for eid in range(next_id, next_id + PROBE_WINDOW) if profile.accepts(eid)]
+        if not window:
+            break
+
+        urls = [profile.event_url(eid, base_url) for eid in window]
+        bodies = await asyncio.gather(*(crawler.fetch(session, url, revalidate=True) for url in urls))
+
+        found = 0
+        for event_id, url, body in zip(window, urls, bodies):
+            if body is None:
+                continue
+            event = backend.parse_event(body, event_id, url, profile)
+            if event["title"]:
+                events[event_id] = event
+                found += 1
+
+        if not found:
+            break
+        next_id += PROBE_WINDOW
+
+    return events
+
+
+async def crawl_incremental(
+    crawler: AsyncCrawler,
+    profile: EraProfile,
+    previous: PreviousEvents,
+    base_url: str = BASE_URL,
+    parser: str = DEFAULT_PARSER,
+) -> tuple[list[dict], list[int]]:
+    """
+    Fetch the events that may be new or changed since the previous run.
+    Returns them with the IDs that could not be fetched or parsed to an
+    event with a title (error or challenge pages), which are left as they were.
+    """
+    backend = get_parser(parser)
+    failed = []
+    async with crawler.open_session() as session:
+        listing_ids = await discover_listing_ids(crawler, session, profile, previous, base_url, backend)
+        events = await probe_new_ids(crawler, session, profile, previous, base_url, backend)
+
+        async def fetch_event(event_id: int) -> None:
+            url = profile.event_url(event_id, base_url)
+            body = await crawler.fetch(session, url, revalidate=True)
+            event = backend.parse_event(body, event_id, url, profile) if body is not None else None
+            if event is not None and event["title"]:
+                events[event_id] = event
+            else:
+                failed.append(event_id)
+
+        await asyncio.gather(*(fetch_event(eid) for eid in listing_ids if eid not in events))
+
+    return [events[eid] for eid in sorted(events)], sorted(failed)
+
+
+def merge_events(previous: PreviousEvents, events: list[dict], profile: EraProfile) -> tuple[pd.DataFrame, int, int]:
+    """
+    Merge fetched events into the previous rows.
+
+    Changed events only overwrite their scraped columns, so values added
+    later by mki-agents (location_name, geo_coordinates, region) are kept.
+    Returns the merged frame and the number of new and changed events.
+    """
+    if not events:
+        return previous.df, 0, 0
+
+    updates = pd.DataFrame(events).astype({"event_id": int}).set_index("event_id")
+    update_hashes = content_hashes(updates)
+
+    is_new = ~updates.index.isin(list(previous.hashes))
+    is_changed = ~is_new & (update_hashes != updates.index.map(previous.hashes.get))
+    changed_ids = updates.index[is_changed]
+
+    merged = previous.df.set_index("event_id")
+    scraped_columns = [*CONTENT_COLUMNS, "source_url"]
+    merged.loc[changed_ids, scraped_columns] = updates.loc[changed_ids, scraped_columns].astype(object)
+
+    new_rows = updates[is_new].reindex(columns=merged.columns)
+    merged = pd.concat([merged, new_rows]).sort_index().reset_index()
+
+    # Keep any extra columns, but make sure the shared layout comes first
+    columns = [*profile.columns, *(col for col in merged.columns if col not in profile.columns)]
+    return merged.reindex(columns=columns), int(is_new.sum()), len(changed_ids)
+
+
+def update_events(
+    profile: EraProfile,
+    previous: PreviousEvents,
+    requests_per_second: float = REQUESTS_PER_SECOND,
+    max_connections: int = MAX_CONNECTIONS,
+    base_url: str = BASE_URL,
+    cache: ResponseCache | None = None,
+    parser: str = DEFAULT_PARSER,
+    formats: Iterable[str] = ("csv",),
+) -> None:
+    """Fetch new or changed events and merge them into the era's outputs."""
+    print(f"Previous run: {len(previous.hashes)} events, highest ID {previous.max_id}")
+
+    crawler = AsyncCrawler(
+        HEADERS,
+        requests_per_second=requests_per_second,
+        max_connections=max_connections,
+        cache=cache,
+    )
+    events, failed = asyncio.run(crawl_incremental(crawler, profile, previous, base_url, parser))
+    merged, new_count, changed_count = merge_events(previous, events, profile)
+
+    print(f"\nChecked {len(events)} events with {crawler.request_count} requests: "
+          f"{new_count} new, {changed_count} changed, {len(failed)} failed")
+    if failed:
+        print(f"Kept the previous rows of events that failed: {failed[:20]}{' ...' if len(failed) > 20 else ''}")
+
+    if new_count or changed_count:
+        rows = merged.astype(object).where(merged.notna(), None).to_dict("records")
+        count = write_events(rows, open_sinks(profile, formats, columns=list(merged.columns)))
+        print(f"Saved {count} events to {profile.output_file} ({', '.join(formats)})")
+    else:
+        print("Nothing to update")
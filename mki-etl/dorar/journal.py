@@ -0,0 +1,106 @@
+"""
+Crash-safe progress journal for the Dorar.net scrapers
+
+Every listing page and every parsed event is appended to a SQLite journal
+as soon as it completes, so a crashed or interrupted crawl resumes where it
+stopped, and events never have to be held in memory. The CSV is written
+from the journal once the crawl finishes, and the journal is then removed.
+
+Events that could not be fetched or parsed are recorded with the number of
+runs they failed in, so a resumed crawl retries them, but gives up on the
+ones that failed EVENT_MAX_ATTEMPTS times (a 404, or a page that never
+parses) instead of retrying them forever.
+"""
+
+import json
+import sqlite3
+from collections.abc import Iterator
+from pathlib import Path
+
+from .config import EVENT_MAX_ATTEMPTS
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+  url TEXT PRIMARY KEY,
+  event_ids TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS events (
+  event_id INTEGER PRIMARY KEY,
+  data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS failed (
+  event_id INTEGER PRIMARY KEY,
+  status TEXT NOT NULL,
+  attempts INTEGER NOT NULL
+);
+"""
+
+
+class CrawlJournal:
+    """Append-only record of completed listing pages and parsed events."""
+
+    def __init__(self, path: Path, max_attempts: int = EVENT_MAX_ATTEMPTS):
+        self.path = Path(path)
+        self.max_attempts = max_attempts
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+
+    def completed_pages(self) -> dict[str, list[int]]:
+        """Get the event IDs found on each listing page already collected."""
+        rows = self._db.execute("SELECT url, event_ids FROM pages")
+        return {url: json.loads(event_ids) for url, event_ids in rows}
+
+    def completed_event_ids(self) -> set[int]:
+        """Get the IDs of events already parsed."""
+        return {row[0] for row in self._db.execute("SELECT event_id FROM events")}
+
+    def pending_event_ids(self) -> set[int]:
+        """Get IDs found on collected listing pages that have no parsed event yet and are not given up."""
+        listed = {eid for event_ids in self.completed_pages().values() for eid in event_ids}
+        return listed - self.completed_event_ids() - set(self.given_up_events())
+
+    def given_up_events(self) -> dict[int, str]:
+        """Get the status of the last failure of each event that failed max_attempts times."""
+        rows = self._db.execute("SELECT event_id, status FROM failed WHERE attempts >= ?", (self.max_attempts,))
+        return dict(rows.fetchall())
+
+    def record_failure(self, event_id: int, status: str) -> None:
+        """Record that an event could not be fetched or parsed in this run."""
+        self._db.execute(
+            "INSERT INTO failed (event_id, status, attempts) VALUES (?, ?, 1) "
+            "ON CONFLICT(event_id) DO UPDATE SET status = excluded.status, attempts = attempts + 1",
+            (event_id, status),
+        )
+
+    def record_page(self, url: str, event_ids: list[int]) -> None:
+        """Record a collected listing page."""
+        self._db.execute("INSERT OR REPLACE INTO pages (url, event_ids) VALUES (?, ?)", (url, json.dumps(event_ids)))
+
+    def record_event(self, event: dict) -> None:
+        """Record a parsed event, clearing any failure recorded for it."""
+        self._db.execute(
+            "INSERT OR REPLACE INTO events (event_id, data) VALUES (?, ?)",
+            (event["event_id"], json.dumps(event, ensure_ascii=False)),
+        )
+        self._db.execute("DELETE FROM failed WHERE event_id = ?", (event["event_id"],))
+
+    def iter_events(self) -> Iterator[dict]:
+        """Stream the recorded events ordered by event ID."""
+        for (data,) in self._db.execute("SELECT data FROM events ORDER BY event_id"):
+            yield json.loads(data)
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the journal database."""
+        self._db.close()
+
+    def remove(self) -> None:
+        """Close and delete the journal once its events have been saved."""
+        self.close()
+        for suffix in ("", "-wal", "-shm"):
+            Path(f"{self.path}{suffix}").unlink(missing_ok=True)
@@ -0,0 +1,94 @@
+"""
+lxml-native parser backend for Dorar.net pages
+
+Produces exactly the same output as the BeautifulSoup backend in parser.py,
+but queries the lxml tree directly with precompiled XPath expressions
+instead of building and walking a BeautifulSoup tree.
+"""
+
+import lxml.html
+from lxml import etree
+
+from .parser import DETAILS_MARKER, EVENT_LINK_RE, PANEL_MARKER, empty_event, parse_panel_text
+from .profiles import EraProfile
+
+# Dorar.net serves UTF-8; decoding explicitly avoids lxml's latin-1 fallback
+HTML_PARSER = lxml.html.HTMLParser(encoding="utf-8", remove_comments=True)
+
+# Precompiled expressions
+EVENT_HREFS = etree.XPath('//a[contains(@href, "/history/event/")]/@href', smart_strings=False)
+TAB_PANELS = etree.XPath('//*[@role="tabpanel"]')
+TAB_LINKS = etree.XPath("//a[@href = $href]")
+# Like BeautifulSoup's get_text(), skip the contents of script/style/template
+TEXT_NODES = etree.XPath(
+    "descendant::text()[not(ancestor::script or ancestor::style or ancestor::template)]",
+    smart_strings=False,
+)
+
+
+def make_tree(content: bytes | str) -> etree._Element:
+    """Parse raw HTML into an lxml tree."""
+    if isinstance(content, str):
+        return lxml.html.document_fromstring(content)
+    return lxml.html.document_fromstring(content, parser=HTML_PARSER)
+
+
+def get_text(element: etree._Element, strip: bool = False) -> str:
+    """Get the text of an element the way BeautifulSoup's get_text() does."""
+    texts = TEXT_NODES(element)
+    if strip:
+        return "".join(text for text in (t.strip() for t in texts) if text)
+    return "".join(texts)
+
+
+def has_class(element: etree._Element | None, name: str) -> bool:
+    """Check whether an element's class attribute contains a class name."""
+    return element is not None and name in (element.get("class") or "").split()
+
+
+def parse_listing(content: bytes | str, profile: EraProfile) -> list[int]:
+    """Extract the event IDs of an era from a listing page."""
+    event_ids = []
+    seen = set()
+
+    for href in EVENT_HREFS(make_tree(content)):
+        match = EVENT_LINK_RE.search(href)
+        if match:
+            event_id = int(match.group(1))
+            if profile.accepts(event_id) and event_id not in seen:
+                seen.add(event_id)
+                event_ids.append(event_id)
+
+    return event_ids
+
+
+def parse_event(content: bytes | str, event_id: int, url: str, profile: EraProfile) -> dict:
+    """Extract event fields from an event page."""
+    tree = make_tree(content)
+    event = empty_event(event_id, url, profile)
+
+    event_panel = None
+    panel_text = ""
+    for panel in TAB_PANELS(tree):
+        panel_text = get_text(panel)
+        if PANEL_MARKER in panel_text and DETAILS_MARKER in panel_text:
+            event_panel = panel
+            break
+
+    if event_panel is None:
+        return event
+
+    # Same title link selection as the BeautifulSoup backend
+    panel_id = event_panel.get("id")
+    if panel_id:
+        for tab_link in TAB_LINKS(tree, href=f"#{panel_id}"):
+            parent = tab_link.getparent()
+            grandparent = parent.getparent() if parent is not None else None
+            if has_class(grandparent, "scroll-pos") or not has_class(tab_link, "collapsed"):
+                title_text = get_text(tab_link, strip=True)
+                if title_text:
+                    event["title"] = title_text
+                break
+
+    event.update(parse_panel_text(panel_text))
+    return event
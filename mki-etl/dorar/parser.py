@@ -0,0 +1,138 @@
+"""HTML parsing for Dorar.net listing and event pages."""
+
+import re
+
+from bs4 import BeautifulSoup
+
+from .profiles import EraProfile
+
+# Precompiled patterns
+EVENT_LINK_RE = re.compile(r"/history/event/(\d+)")
+HIJRI_RE = re.compile(r"العام الهجري\s*:\s*(\d+)")
+MONTH_RE = re.compile(r"الشهر القمري\s*:\s*(\S+)")
+GREGORIAN_RE = re.compile(r"العام الميلادي\s*:\s*(\d+)")
+
+PANEL_MARKER = "العام الهجري"
+DETAILS_MARKER = "تفاصيل الحدث"
+DETAILS_LABEL = f"{DETAILS_MARKER}:"
+
+
+def make_soup(content: bytes | str) -> BeautifulSoup:
+    """Parse raw HTML into a BeautifulSoup tree."""
+    return BeautifulSoup(content, "lxml")
+
+
+def parse_event_ids(soup: BeautifulSoup, profile: EraProfile) -> list[int]:
+    """Extract the event IDs of an era from a parsed listing page."""
+    event_ids = []
+    seen = set()
+
+    # Find all links to individual event pages
+    for link in soup.find_all("a", href=EVENT_LINK_RE):
+        match = EVENT_LINK_RE.search(link.get("href", ""))
+        if match:
+            event_id = int(match.group(1))
+            if profile.accepts(event_id) and event_id not in seen:
+                seen.add(event_id)
+                event_ids.append(event_id)
+
+    return event_ids
+
+
+def empty_event(event_id: int, url: str, profile: EraProfile) -> dict:
+    """Create an event row with every output column unset."""
+    event = dict.fromkeys(profile.columns)
+    event["event_id"] = event_id
+    event["source_url"] = url
+    return event
+
+
+def parse_event_details(soup: BeautifulSoup, event_id: int, url: str, profile: EraProfile) -> dict:
+    """Extract event fields from a parsed event page."""
+    event = empty_event(event_id, url, profile)
+
+    # Find the event panel by looking for tabpanels containing "العام الهجري"
+    # (keeping its text so it is only extracted once)
+    event_panel = None
+    panel_text = ""
+    for panel in soup.find_all(attrs={"role": "tabpanel"}):
+        panel_text = panel.get_text()
+        if PANEL_MARKER in panel_text and DETAILS_MARKER in panel_text:
+            event_panel = panel
+            break
+
+    if not event_panel:
+        return event
+
+    # Get panel ID to find the corresponding title link
+    panel_id = event_panel.get("id")
+    if panel_id:
+        # Find all links that control this panel
+        tab_links = soup.find_all("a", href=f"#{panel_id}")
+        # Choose the correct link: prefer one without 'collapsed' class
+        # or one whose grandparent has 'scroll-pos' class (the actual event header)
+        for tab_link in tab_links:
+            # Check if this is the event header (not navigation)
+            grandparent = tab_link.parent.parent if tab_link.parent else None
+            if grandparent and "scroll-pos" in grandparent.get("class", []):
+                title_text = tab_link.get_text(strip=True)
+                if title_text:
+                    event["title"] = title_text
+                break
+            # Fallback: use link without 'collapsed' class
+            link_classes = tab_link.get("class", [])
+            if "collapsed" not in link_classes:
+                title_text = tab_link.get_text(strip=True)
+                if title_text:
+                    event["title"] = title_text
+                break
+
+    event.update(parse_panel_text(panel_text))
+    return event
+
+
+def parse_panel_text(panel_text: str) -> dict:
+    """Extract dates and details from the text of an event panel."""
+    fields = {}
+
+    # Hijri year: extract number and suffix (ق هـ or هـ)
+    hijri_match = HIJRI_RE.search(panel_text)
+    if hijri_match:
+        year_num = hijri_match.group(1)
+        # Check for "ق هـ" (before hijra) or just "هـ"
+        after_num = panel_text[hijri_match.end():hijri_match.end() + 30]
+        if "ق هـ" in after_num or "ق  هـ" in after_num:
+            fields["hijri_year"] = f"{year_num} ق هـ"
+        elif "هـ" in after_num:
+            fields["hijri_year"] = f"{year_num} هـ"
+        else:
+            fields["hijri_year"] = year_num
+
+    # Lunar month
+    month_match = MONTH_RE.search(panel_text)
+    if month_match:
+        fields["lunar_month"] = month_match.group(1).strip()
+
+    # Gregorian year
+    greg_match = GREGORIAN_RE.search(panel_text)
+    if greg_match:
+        fields["gregorian_year"] = greg_match.group(1)
+
+    # Event details: everything after "تفاصيل الحدث:"
+    details_start = panel_text.find(DETAILS_LABEL)
+    if details_start != -1:
+        details = panel_text[details_start + len(DETAILS_LABEL):].strip()
+        # Clean up whitespace
+        fields["details"] = " ".join(details.split())
+
+    return fields
+
+
+def parse_listing(content: bytes | str, profile: EraProfile) -> list[int]:
+    """Extract the event IDs of an era from a raw listing page."""
+    return parse_event_ids(make_soup(content), profile)
+
+
+def parse_event(content: bytes | str, event_id: int, url: str, profile: EraProfile) -> dict:
+    """Extract event fields from a raw event page."""
+    return parse_event_details(make_soup(content), event_id, url, profile)
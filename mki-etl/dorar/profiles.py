@@ -0,0 +1,62 @@
+"""Era profiles describing which part of the Dorar.net encyclopedia to scrape."""
+
+from dataclasses import dataclass
+from pathlib import Path
+
+from .config import BASE_URL, DATASETS_DIR, EVENT_COLUMNS, EVENT_PATH_TEMPLATE
+
+
+@dataclass(frozen=True)
+class EraProfile:
+    """Listing URL, event ID filter and output layout for one dataset."""
+
+    name: str
+    description: str
+    listing_path: str  # must contain a {page} placeholder
+    total_pages: int
+    output_file: Path
+    min_event_id: int = 1
+    max_event_id: int | None = None
+    columns: tuple[str, ...] = EVENT_COLUMNS
+
+    def listing_url(self, page: int, base_url: str = BASE_URL) -> str:
+        """Get the URL of a listing page."""
+        return base_url + self.listing_path.format(page=page)
+
+    def event_url(self, event_id: int, base_url: str = BASE_URL) -> str:
+        """Get the URL of an event page."""
+        return base_url + EVENT_PATH_TEMPLATE.format(event_id=event_id)
+
+    def accepts(self, event_id: int) -> bool:
+        """Check whether an event ID belongs to this era."""
+        if event_id < self.min_event_id:
+            return False
+        return self.max_event_id is None or event_id <= self.max_event_id
+
+
+SEERA = EraProfile(
+    name="seera",
+    description="Prophet's Biography",
+    listing_path="/history?era=1&page={page}",
+    total_pages=8,
+    output_file=DATASETS_DIR / "seera" / "seera_events.csv",
+    max_event_id=145,  # History events start at 146
+)
+
+HISTORY = EraProfile(
+    name="history",
+    description="Islamic History",
+    listing_path="/history?page={page}",  # No era filter
+    total_pages=309,
+    output_file=DATASETS_DIR / "history" / "history_events.csv",
+    min_event_id=146,  # Skip seera events (1-145)
+)
+
+PROFILES = {profile.name: profile for profile in (SEERA, HISTORY)}
+
+
+def get_profile(name: str) -> EraProfile:
+    """Get an era profile by name."""
+    if name not in PROFILES:
+        raise ValueError(f"Unknown era: {name}. Supported: {list(PROFILES.keys())}")
+    return PROFILES[name]
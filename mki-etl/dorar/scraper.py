@@ -0,0 +1,168 @@
+"""High-level scraping operations shared by every era."""
+
+import asyncio
+from collections.abc import Iterable
+from functools import partial
+from pathlib import Path
+
+from .cache import ResponseCache
+from .backends import get_parser, parse_event_page, parse_listing_page
+from .config import (
+    BASE_URL,
+    DEFAULT_PARSER,
+    HEADERS,
+    JOURNAL_DIR,
+    MAX_CONNECTIONS,
+    PARSE_WORKERS,
+    REQUESTS_PER_SECOND,
+)
+from .crawler import AsyncCrawler
+from .http import fetch
+from .incremental import load_previous, update_events
+from .journal import CrawlJournal
+from .profiles import EraProfile
+from .sink import external_sort, open_sinks, write_events
+
+
+def get_event_ids_from_page(
+    profile: EraProfile,
+    page: int,
+    cache: ResponseCache | None = None,
+    parser: str = DEFAULT_PARSER,
+) -> list[int]:
+    """Extract all event IDs of an era from a listing page."""
+    url = profile.listing_url(page)
+    print(f"Fetching listing page {page}: {url}")
+
+    content = fetch(url, cache=cache)
+    if content is None:
+        print(f"  Failed to fetch page {page}")
+        return []
+
+    event_ids = get_parser(parser).parse_listing(content, profile)
+    print(f"  Found {len(event_ids)} {profile.name} events on page {page}")
+    return event_ids
+
+
+def get_event_details(
+    profile: EraProfile,
+    event_id: int,
+    cache: ResponseCache | None = None,
+    parser: str = DEFAULT_PARSER,
+) -> dict | None:
+    """Fetch and extract details from an individual event page."""
+    url = profile.event_url(event_id)
+
+    content = fetch(url, cache=cache)
+    if content is None:
+        print(f"  Failed to fetch event {event_id}")
+        return None
+
+    return get_parser(parser).parse_event(content, event_id, url, profile)
+
+
+def scrape_all_events(
+    profile: EraProfile,
+    requests_per_second: float = REQUESTS_PER_SECOND,
+    max_connections: int = MAX_CONNECTIONS,
+    base_url: str = BASE_URL,
+    cache: ResponseCache | None = None,
+    journal: CrawlJournal | None = None,
+    parser: str = DEFAULT_PARSER,
+    parse_workers: int = PARSE_WORKERS,
+) -> list[dict]:
+    """Scrape all events of an era with the async crawler.
+
+    With a journal, completed work is skipped and events are recorded in
+    the journal rather than returned.
+    """
+    listing_urls = [profile.listing_url(page, base_url) for page in range(1, profile.total_pages + 1)]
+
+    crawler = AsyncCrawler(
+        HEADERS,
+        requests_per_second=requests_per_second,
+        max_connections=max_connections,
+        cache=cache,
+        parse_workers=parse_workers,
+    )
+
+    print(f"Crawling {len(listing_urls)} listing pages at {requests_per_second} req/s, {max_connections} connections...")
+    return asyncio.run(
+        crawler.crawl(
+            listing_urls,
+            extract_ids=partial(parse_listing_page, parser, profile),
+            event_url=partial(profile.event_url, base_url=base_url),
+            parse_event=partial(parse_event_page, parser, profile),
+            journal=journal,
+        )
+    )
+
+
+def save_to_csv(events: Iterable[dict], output_path: Path, profile: EraProfile) -> None:
+    """Save events to CSV file, sorted by event_id."""
+    count = write_events(external_sort(events), open_sinks(profile, ("csv",), output_path))
+    print(f"\nSaved {count} events to {output_path}")
+
+
+def run(
+    profile: EraProfile,
+    requests_per_second: float,
+    max_connections: int,
+    base_url: str,
+    cache: ResponseCache | None = None,
+    incremental: bool = False,
+    fresh: bool = False,
+    parser: str = DEFAULT_PARSER,
+    parse_workers: int = PARSE_WORKERS,
+    formats: Iterable[str] = ("csv",),
+) -> None:
+    """Scrape an era and write its outputs, printing a summary banner."""
+    print("=" * 60)
+    print(f"Dorar.net {profile.description} Scraper")
+    print("=" * 60)
+    print(f"Source: {profile.listing_url(1, base_url)}")
+    print(f"Event range: {profile.min_event_id}+" if profile.max_event_id is None
+          else f"Event range: {profile.min_event_id}-{profile.max_event_id}")
+    print(f"Pages to crawl: {profile.total_pages}")
+    print(f"Output: {profile.output_file}")
+    print(f"Parser: {parser} ({parse_workers} worker processes)")
+    if cache is not None:
+        print(f"Cache: {cache.cache_dir}{' (offline)' if cache.offline else ''}")
+    print("=" * 60)
+
+    if incremental:
+        previous = load_previous(profile.output_file)
+        if previous is not None:
+            update_events(profile, previous, requests_per_second, max_connections, base_url, cache, parser, formats)
+            return
+        print("No previous output found, running a full crawl")
+
+    journal = CrawlJournal(JOURNAL_DIR / f"{profile.name}.sqlite3")
+    if fresh:
+        journal.remove()
+        journal = CrawlJournal(journal.path)
+    print(f"Journal: {journal.path}")
+
+    scrape_all_events(profile, requests_per_second, max_connections, base_url, cache, journal, parser, parse_workers)
+
+    if len(journal):
+        count = write_events(journal.iter_events(), open_sinks(profile, formats))
+        print(f"\nSaved {count} events to {profile.output_file} ({', '.join(formats)})")
+
+        missing_pages = profile.total_pages - len(journal.completed_pages())
+        missing_events = len(journal.pending_event_ids())
+        given_up = journal.given_up_events()
+        if given_up:
+            shown = ", ".join(f"{eid} ({status})" for eid, status in sorted(given_up.items())[:20])
+            print(f"Gave up on {len(given_up)} events after {journal.max_attempts} failed runs: "
+                  f"{shown}{' ...' if len(given_up) > 20 else ''}")
+        if missing_pages or missing_events:
+            journal.close()
+            print(f"Incomplete: {missing_pages} listing pages and {missing_events} events failed. "
+                  "Run again to retry them from the journal.")
+        else:
+            journal.remove()
+            print("\nDone!")
+    else:
+        journal.close()
+        print("\nNo events found. Check for errors above.")
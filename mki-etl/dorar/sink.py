@@ -0,0 +1,190 @@
+"""
+Streaming output sinks for scraped events
+
+Rows are written as they are produced instead of being collected into a
+DataFrame first. CSV output keeps the utf-8-sig encoding and shared column
+order of the original save_to_csv; Parquet output (needs pyarrow) stores
+the repetitive text columns dictionary-encoded. Unordered input is sorted
+by an external merge sort that spills sorted runs to temporary files, so
+memory stays bounded by the run size rather than the dataset size.
+"""
+
+import csv
+import heapq
+import json
+import os
+import tempfile
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import IO
+
+from .config import ARROW_BATCH_SIZE, DICTIONARY_COLUMNS, SORT_RUN_SIZE
+from .profiles import EraProfile
+
+OUTPUT_FORMATS = ("csv", "parquet")
+
+
+class CsvSink:
+    """
+    Stream rows to a CSV file, replacing the target atomically on close.
+    A row with a key outside the columns raises instead of losing the value.
+    """
+
+    def __init__(self, path: Path, columns: Iterable[str]):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+        self._file = open(self._tmp_path, "w", encoding="utf-8-sig", newline="")
+        self._writer = csv.DictWriter(self._file, fieldnames=list(columns), lineterminator="\n")
+        self._writer.writeheader()
+
+    def write(self, event: dict) -> None:
+        self._writer.writerow(event)
+
+    def close(self) -> None:
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self) -> None:
+        self._file.close()
+        self._tmp_path.unlink(missing_ok=True)
+
+
+class ParquetSink:
+    """Stream rows to a Parquet file in record batches, with dictionary-encoded text."""
+
+    def __init__(self, path: Path, columns: Iterable[str], batch_size: int = ARROW_BATCH_SIZE):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Parquet output needs pyarrow: uv sync --extra columnar") from e
+
+        self._pa = pa
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+        self.columns = list(columns)
+        self.batch_size = batch_size
+        self.schema = pa.schema([
+            (col, pa.int64() if col == "event_id"
+             else pa.dictionary(pa.int32(), pa.string()) if col in DICTIONARY_COLUMNS
+             else pa.string())
+            for col in self.columns
+        ])
+        self._writer = pq.ParquetWriter(self._tmp_path, self.schema, compression="zstd", use_dictionary=True)
+        self._buffer: dict[str, list] = {col: [] for col in self.columns}
+        self._buffered = 0
+
+    def write(self, event: dict) -> None:
+        extra = event.keys() - self._buffer.keys()
+        if extra:
+            raise ValueError(f"Row has columns outside the Parquet schema: {sorted(extra)}")
+        for col in self.columns:
+            value = event.get(col)
+            self._buffer[col].append(value if value is None or col == "event_id" else str(value))
+        self._buffered += 1
+        if self._buffered >= self.batch_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        """Write the buffered rows as one record batch."""
+        if not self._buffered:
+            return
+        pa = self._pa
+        arrays = []
+        for field in self.schema:
+            values = self._buffer[field.name]
+            if pa.types.is_dictionary(field.type):
+                arrays.append(pa.array(values, type=pa.string()).dictionary_encode())
+            else:
+                arrays.append(pa.array(values, type=field.type))
+        self._writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=self.schema))
+        self._buffer = {col: [] for col in self.columns}
+        self._buffered = 0
+
+    def close(self) -> None:
+        self._flush()
+        self._writer.close()
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self) -> None:
+        self._writer.close()
+        self._tmp_path.unlink(missing_ok=True)
+
+
+def open_sinks(
+    profile: EraProfile,
+    formats: Iterable[str] = ("csv",),
+    output_file: Path | None = None,
+    columns: Iterable[str] | None = None,
+) -> list:
+    """
+    Open one sink per requested output format next to the era's output file.
+    Columns default to the era's layout; pass the full list when rows carry
+    extra columns (added later by mki-agents) that must be kept.
+    """
+    output_file = output_file or profile.output_file
+    columns = list(columns or profile.columns)
+    sinks = []
+    for fmt in formats:
+        if fmt == "csv":
+            sinks.append(CsvSink(output_file, columns))
+        elif fmt == "parquet":
+            sinks.append(ParquetSink(output_file.with_suffix(".parquet"), columns))
+        else:
+            raise ValueError(f"Unknown output format: {fmt}. Supported: {list(OUTPUT_FORMATS)}")
+    return sinks
+
+
+def write_events(events: Iterable[dict], sinks: list) -> int:
+    """Stream events into every sink, leaving targets untouched if anything fails."""
+    count = 0
+    try:
+        for event in events:
+            for sink in sinks:
+                sink.write(event)
+            count += 1
+    except BaseException:
+        for sink in sinks:
+            sink.abort()
+        raise
+
+    for sink in sinks:
+        sink.close()
+    return count
+
+
+def _spill(run: list[dict]) -> IO[str]:
+    """Write a sorted run to a temporary JSONL file."""
+    f = tempfile.TemporaryFile("w+", encoding="utf-8")
+    for event in run:
+        f.write(json.dumps(event, ensure_ascii=False))
+        f.write("\n")
+    f.seek(0)
+    return f
+
+
+def external_sort(events: Iterable[dict], key: str = "event_id", run_size: int = SORT_RUN_SIZE) -> Iterator[dict]:
+    """Sort events by a column, spilling sorted runs to disk and merging them."""
+    runs = []
+    run = []
+    try:
+        for event in events:
+            run.append(event)
+            if len(run) >= run_size:
+                run.sort(key=lambda e: e[key])
+                runs.append(_spill(run))
+                run = []
+        run.sort(key=lambda e: e[key])
+
+        if not runs:
+            yield from run
+            return
+
+        runs.append(_spill(run))
+        run = []
+        yield from heapq.merge(*((json.loads(line) for line in f) for f in runs), key=lambda e: e[key])
+    finally:
+        for f in runs:
+            f.close()
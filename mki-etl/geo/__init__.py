@@ -0,0 +1,8 @@
+"""Simplified, multi-resolution exports of the historical world borders."""
+
+from .topology import Topology, quantize
+
+__all__ = [
+    "Topology",
+    "quantize",
+]
@@ -0,0 +1,24 @@
+# Settings for the world borders simplification stage
+from pathlib import Path
+
+# Paths
+PACKAGE_DIR = Path(__file__).parent
+PROJECT_ROOT = PACKAGE_DIR.parent.parent  # mki-etl -> mki
+GEOJSON_DIR = PROJECT_ROOT / "mki-datasets" / "geojson"
+OUTPUT_DIR = GEOJSON_DIR / "web"
+
+# Source borders, as loaded by the site map
+SOURCES = ("world_400", "world_500")
+
+# Coordinates are rounded to this many decimals (~1 m at the equator)
+PRECISION = 5
+
+# Zoom levels with their own simplified output (the map's minZoom is 3);
+# above the last one the map can use the full-detail quantized output
+ZOOM_LEVELS = (3, 5, 7)
+
+# Douglas-Peucker tolerance, in screen pixels at each zoom level
+TOLERANCE_PIXELS = 1.0
+TILE_SIZE = 256  # pixels per Web Mercator tile
+
+KM_PER_DEGREE = 111.32
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Multi-resolution Exports of the Historical World Borders
+
+Builds a shared-arc topology of each source GeoJSON with coordinates
+quantized to PRECISION decimals, and writes to mki-datasets/geojson/web:
+
+    {source}.geojson            full detail, quantized
+    {source}.topojson           full detail as TopoJSON
+    {source}.z{zoom}.geojson    simplified for a zoom level
+    {source}.z{zoom}.topojson   simplified for a zoom level as TopoJSON
+
+Each zoom level is simplified with Douglas-Peucker at TOLERANCE_PIXELS
+screen pixels. Reports the size of every output against the source (raw
+and gzipped, as served), the number of regions that are not valid polygons
+(quantizing can pinch a ring, and the outputs keep the shared arcs rather
+than repairing them), and the simplification error: the Hausdorff distance
+of each region to its full-detail shape and the change in the total area.
+
+Usage:
+    uv run python -m geo.simplify_borders
+    uv run python -m geo.simplify_borders --source world_500 --zooms 3 4 5 6
+"""
+
+import argparse
+import gzip
+import json
+from pathlib import Path
+
+import numpy as np
+import shapely
+
+from .config import (
+    GEOJSON_DIR,
+    KM_PER_DEGREE,
+    OUTPUT_DIR,
+    PRECISION,
+    SOURCES,
+    TILE_SIZE,
+    TOLERANCE_PIXELS,
+    ZOOM_LEVELS,
+)
+from .topology import Topology
+
+
+def zoom_tolerance(zoom: int, pixels: float = TOLERANCE_PIXELS) -> float:
+    """Degrees of longitude covered by `pixels` screen pixels at a Web Mercator zoom level."""
+    return pixels * 360 / (TILE_SIZE * 2 ** zoom)
+
+
+def write_json(data: dict, path: Path) -> tuple[int, int]:
+    """Write compact JSON and return its raw and gzipped size in bytes."""
+    body = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    path.write_bytes(body)
+    return len(body), len(gzip.compress(body, 9))
+
+
+def simplification_error(reference: list, simplified: list) -> tuple[float, float, float]:
+    """
+    Max and 95th percentile Hausdorff distance (degrees) of the regions to
+    their reference shape, and the total change in area relative to the total area.
+    Invalid shapes are repaired first, since a self-intersecting ring's area
+    cancels out in part.
+    """
+    pairs = [(a, b) for a, b in zip(reference, simplified) if a is not None and b is not None]
+    if not pairs:
+        return 0.0, 0.0, 0.0
+    a, b = (shapely.make_valid(np.array(geoms, dtype=object)) for geoms in zip(*pairs))
+    distances = shapely.hausdorff_distance(a, b)
+    area = shapely.area(a)
+    change = np.abs(shapely.area(b) - area).sum() / area.sum()
+    return float(distances.max()), float(np.percentile(distances, 95)), float(change)
+
+
+def count_invalid(geometries: list) -> int:
+    """Regions whose geometry is not a valid (Multi)Polygon."""
+    return sum(1 for geometry in geometries if geometry is not None and not shapely.is_valid(geometry))
+
+
+def export_source(name: str, zooms: list[int], output_dir: Path) -> None:
+    """Write the full and per-zoom outputs of one source and print their report."""
+    path = GEOJSON_DIR / f"{name}.geojson"
+    raw = path.read_bytes()
+    collection = json.loads(raw)
+    source_gzip = len(gzip.compress(raw, 9))
+
+    topology = Topology.from_geojson(collection, PRECISION)
+    reference = topology.to_shapely()
+    print(f"\n{path.name}: {len(topology.features)} regions, {len(raw):,} bytes ({source_gzip:,} gzipped)")
+    print(f"Quantized to {PRECISION} decimals, dropping {topology.dropped_rings} rings narrower than the grid")
+    print(f"Topology: {len(topology.arcs)} shared arcs, {topology.vertex_count()} vertices")
+    source = [shapely.from_geojson(json.dumps(feature["geometry"])) if feature["geometry"] else None
+              for feature in collection["features"]]
+    print(f"Invalid regions: {count_invalid(source)} in the source")
+    print(f"{'output':<26} {'vertices':>8} {'bytes':>11} {'gzipped':>9} {'saved':>6} "
+          f"{'max err':>9} {'p95 err':>9} {'area':>6} {'invalid':>7}")
+
+    levels = [(None, topology)] + [(zoom, topology.simplify(zoom_tolerance(zoom))) for zoom in zooms]
+    for zoom, level in levels:
+        stem = name if zoom is None else f"{name}.z{zoom}"
+        geometries = level.to_shapely()
+        max_error, p95_error, area_change = simplification_error(reference, geometries)
+        invalid = count_invalid(geometries)
+        outputs = (
+            (f"{stem}.geojson", level.to_geojson()),
+            (f"{stem}.topojson", level.to_topojson(name)),
+        )
+        for filename, data in outputs:
+            size, gzipped = write_json(data, output_dir / filename)
+            print(f"{filename:<26} {level.vertex_count():>8} {size:>11,} {gzipped:>9,} "
+                  f"{1 - gzipped / source_gzip:>6.0%} {max_error * KM_PER_DEGREE:>7.2f}km "
+                  f"{p95_error * KM_PER_DEGREE:>7.2f}km {area_change:>6.1%} {invalid:>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write simplified, quantized and TopoJSON world borders")
+    parser.add_argument("--source", type=str, nargs="+", default=list(SOURCES), choices=list(SOURCES),
+                        help="Source GeoJSON files (without extension)")
+    parser.add_argument("--zooms", type=int, nargs="+", default=list(ZOOM_LEVELS), help="Zoom levels to simplify for")
+    parser.add_argument("--output-dir", type=Path, default=OUTPUT_DIR, help="Output directory")
+    args = parser.parse_args()
+
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    for name in args.source:
+        export_source(name, sorted(set(args.zooms)), args.output_dir)
+    print(f"\nSaved to {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+"""
+Shared-arc topology of the world borders
+
+Neighbouring regions in the source GeoJSON repeat every shared border, once
+per region. Building a topology cuts each ring at the points where borders
+meet (junctions) and keeps every distinct stretch of border once as an arc.
+Simplifying the arcs rather than the polygons keeps neighbours' borders
+identical, so no gaps or slivers open between regions, and the arcs are
+exactly what a TopoJSON file stores.
+
+Coordinates are quantized to integers on a 10^-precision degree grid first,
+so points that only differ past that precision are treated as equal. Rings
+that enclose no area on that grid (slivers and back-and-forth spikes in the
+source) are dropped.
+"""
+
+import json
+from dataclasses import dataclass
+
+import shapely
+
+# A quantized (x, y) position
+Point = tuple[int, int]
+
+# Arc references of each ring, of each polygon, of one feature
+# (a negative reference ~i means arc i reversed, as in TopoJSON)
+PolygonArcs = list[list[int]]
+
+
+def quantize(coordinates: list, scale: int) -> list[Point]:
+    """Round a ring to the integer grid, dropping repeated points and the closing point."""
+    ring = []
+    for x, y, *_ in coordinates:
+        point = (round(x * scale), round(y * scale))
+        if not ring or ring[-1] != point:
+            ring.append(point)
+    if len(ring) > 1 and ring[0] == ring[-1]:
+        ring.pop()
+    return ring
+
+
+def signed_area(ring: list[Point]) -> int:
+    """Twice the signed area of a closed ring (zero for a collapsed ring)."""
+    return sum(x0 * y1 - x1 * y0 for (x0, y0), (x1, y1) in zip(ring, ring[1:]))
+
+
+def polygon_rings(geometry: dict | None) -> list[list[list]]:
+    """The rings of each polygon of a Polygon or MultiPolygon geometry."""
+    if geometry is None:
+        return []
+    if geometry["type"] == "Polygon":
+        return [geometry["coordinates"]]
+    if geometry["type"] == "MultiPolygon":
+        return geometry["coordinates"]
+    raise ValueError(f"Unsupported geometry type: {geometry['type']}")
+
+
+@dataclass
+class Feature:
+    """One region: its properties, geometry type and polygons as arc references."""
+
+    properties: dict
+    geometry_type: str | None
+    polygons: list[PolygonArcs]
+
+
+class Topology:
+    """Features whose rings are stored as references to shared, deduplicated arcs."""
+
+    def __init__(self, precision: int):
+        self.precision = precision
+        self.scale = 10 ** precision
+        self.arcs: list[list[Point]] = []
+        self.features: list[Feature] = []
+        self.dropped_rings = 0  # rings enclosing no area on the integer grid
+        self._index: dict[tuple[Point, ...], int] = {}
+
+    @classmethod
+    def from_geojson(cls, collection: dict, precision: int) -> "Topology":
+        """Build the topology of a GeoJSON FeatureCollection of (Multi)Polygons."""
+        topology = cls(precision)
+        features = collection["features"]
+        rings = [
+            [[quantize(ring, topology.scale) for ring in polygon] for polygon in polygon_rings(feature["geometry"])]
+            for feature in features
+        ]
+        junctions = find_junctions(ring for polygons in rings for polygon in polygons for ring in polygon)
+
+        for feature, polygons in zip(features, rings):
+            geometry = feature["geometry"]
+            arcs = []
+            for polygon in polygons:
+                if not polygon or not is_ring(polygon[0] + polygon[0][:1]):
+                    topology.dropped_rings += len(polygon)
+                    continue
+                kept = [ring for ring in polygon if is_ring(ring + ring[:1])]
+                topology.dropped_rings += len(polygon) - len(kept)
+                arcs.append([topology._cut(ring, junctions) for ring in kept])
+            topology.features.append(Feature(feature.get("properties") or {}, geometry and geometry["type"], arcs))
+        return topology
+
+    def _add_arc(self, points: list[Point]) -> int:
+        """Store an arc once, returning the reference of an existing copy in either direction."""
+        key = tuple(points)
+        if key in self._index:
+            return self._index[key]
+        if key[::-1] in self._index:
+            return ~self._index[key[::-1]]
+        self._index[key] = len(self.arcs)
+        self.arcs.append(points)
+        return self._index[key]
+
+    def _cut(self, ring: list[Point], junctions: set[Point]) -> list[int]:
+        """Split a ring into arcs between junctions, and store them."""
+        cuts = [i for i, point in enumerate(ring) if point in junctions]
+        if not cuts:
+            # A ring that touches no other ring is one closed arc, started at its
+            # lowest point so that a copy of it is found whatever its start
+            start = ring.index(min(ring))
+            return [self._add_arc(ring[start:] + ring[:start + 1])]
+
+        start = cuts[0]
+        closed = ring[start:] + ring[:start + 1]
+        offsets = [i - start for i in cuts] + [len(ring)]
+        return [self._add_arc(closed[a:b + 1]) for a, b in zip(offsets, offsets[1:])]
+
+    def ring(self, refs: list[int]) -> list[Point]:
+        """Join a ring's arcs back into a closed ring."""
+        ring = []
+        for ref in refs:
+            arc = self.arcs[ref] if ref >= 0 else self.arcs[~ref][::-1]
+            ring.extend(arc if not ring else arc[1:])
+        return ring
+
+    def simplify(self, tolerance: float) -> "Topology":
+        """
+        Simplify every arc with Douglas-Peucker at `tolerance` degrees.
+
+        The arcs are simplified together with GEOS's topology-preserving
+        variant, so arc ends (junctions) are kept, closed arcs do not collapse
+        and no simplified arc crosses another: shared borders stay shared.
+        That does not make every polygon valid. A ring can still touch itself,
+        or a hole its exterior, at a point, as quantizing already does to some
+        source rings; check the output with shapely.is_valid. Rings that still
+        enclose no area are dropped, then polygons that lost their exterior
+        ring. A feature that would lose every polygon keeps its largest
+        exterior ring unsimplified, so it can still be drawn and clicked.
+        """
+        lines = shapely.multilinestrings([shapely.linestrings(arc) for arc in self.arcs])
+        simplified = shapely.get_parts(shapely.simplify(lines, tolerance * self.scale, preserve_topology=True))
+
+        result = Topology(self.precision)
+        result.arcs = [[(round(x), round(y)) for x, y in shapely.get_coordinates(line)] for line in simplified]
+        for feature in self.features:
+            polygons = []
+            for polygon in feature.polygons:
+                if not is_ring(result.ring(polygon[0])):
+                    continue
+                polygons.append([polygon[0], *(hole for hole in polygon[1:] if is_ring(result.ring(hole)))])
+
+            if feature.polygons and not polygons:
+                largest = max(feature.polygons, key=lambda polygon: abs(signed_area(self.ring(polygon[0]))))
+                polygons = [[result._keep_ring(self.ring(largest[0]))]]
+            result.features.append(Feature(feature.properties, feature.geometry_type, polygons))
+        return result
+
+    def _keep_ring(self, ring: list[Point]) -> list[int]:
+        """Store an unsimplified ring as a new closed arc."""
+        self.arcs.append(ring)
+        return [len(self.arcs) - 1]
+
+    def _coordinates(self, refs: list[int]) -> list[list[float]]:
+        return [[x / self.scale, y / self.scale] for x, y in self.ring(refs)]
+
+    def feature_geometry(self, feature: Feature) -> dict | None:
+        """The GeoJSON geometry of a feature (None if it has no polygons left)."""
+        if not feature.polygons:
+            return None
+        polygons = [[self._coordinates(refs) for refs in polygon] for polygon in feature.polygons]
+        if feature.geometry_type == "Polygon" and len(polygons) == 1:
+            return {"type": "Polygon", "coordinates": polygons[0]}
+        return {"type": "MultiPolygon", "coordinates": polygons}
+
+    def to_geojson(self) -> dict:
+        """A GeoJSON FeatureCollection with coordinates rounded to the precision."""
+        return {
+            "type": "FeatureCollection",
+            "features": [
+                {"type": "Feature", "properties": feature.properties, "geometry": self.feature_geometry(feature)}
+                for feature in self.features
+            ],
+        }
+
+    def to_topojson(self, name: str) -> dict:
+        """
+        A quantized TopoJSON Topology with the features as one GeometryCollection.
+
+        Arc positions are delta-encoded integers on the precision grid, offset
+        by the lowest x and y of any arc.
+        """
+        x0 = min((x for arc in self.arcs for x, _ in arc), default=0)
+        y0 = min((y for arc in self.arcs for _, y in arc), default=0)
+
+        arcs = []
+        for arc in self.arcs:
+            encoded = []
+            px, py = x0, y0
+            for x, y in arc:
+                encoded.append([x - px, y - py])
+                px, py = x, y
+            arcs.append(encoded)
+
+        geometries = []
+        for feature in self.features:
+            if not feature.polygons:
+                geometries.append({"type": None, "properties": feature.properties})
+            elif feature.geometry_type == "Polygon" and len(feature.polygons) == 1:
+                geometries.append({"type": "Polygon", "arcs": feature.polygons[0], "properties": feature.properties})
+            else:
+                geometries.append({"type": "MultiPolygon", "arcs": feature.polygons, "properties": feature.properties})
+
+        return {
+            "type": "Topology",
+            "transform": {"scale": [1 / self.scale, 1 / self.scale], "translate": [x0 / self.scale, y0 / self.scale]},
+            "objects": {name: {"type": "GeometryCollection", "geometries": geometries}},
+            "arcs": arcs,
+        }
+
+    def to_shapely(self) -> list[shapely.Geometry | None]:
+        """The features' geometries as shapely geometries (None for null geometries)."""
+        return [
+            shapely.from_geojson(json.dumps(geometry)) if (geometry := self.feature_geometry(feature)) else None
+            for feature in self.features
+        ]
+
+    def vertex_count(self) -> int:
+        """Positions stored in the arcs."""
+        return sum(len(arc) for arc in self.arcs)
+
+
+def find_junctions(rings) -> set[Point]:
+    """
+    Points where borders meet.
+
+    A point is a junction when it is reached from different neighbours in
+    different rings (or twice in the same ring). Points along a border shared
+    by two regions have the same pair of neighbours in both rings.
+    """
+    neighbours: dict[Point, tuple[Point, Point]] = {}
+    junctions = set()
+    for ring in rings:
+        count = len(ring)
+        for i, point in enumerate(ring):
+            a, b = ring[i - 1], ring[(i + 1) % count]
+            pair = (a, b) if a <= b else (b, a)
+            seen = neighbours.setdefault(point, pair)
+            if seen != pair:
+                junctions.add(point)
+    return junctions
+
+
+def is_ring(ring: list[Point]) -> bool:
+    """Whether a closed ring still encloses an area."""
+    return len(ring) >= 4 and signed_area(ring) != 0
@@ -0,0 +1,8 @@
+"""Typed, columnar narrator fields parsed from rawi_data.csv."""
+
+from .table import NarratorTable, PlaceLists
+
+__all__ = [
+    "NarratorTable",
+    "PlaceLists",
+]
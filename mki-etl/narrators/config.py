@@ -0,0 +1,57 @@
+# Settings for the narrator fields stage
+from pathlib import Path
+
+# Paths
+PACKAGE_DIR = Path(__file__).parent
+PROJECT_ROOT = PACKAGE_DIR.parent.parent  # mki-etl -> mki
+DATASETS_DIR = PROJECT_ROOT / "mki-datasets"
+NARRATORS_CSV = DATASETS_DIR / "hadith" / "rawi_data.csv"
+
+# Compiled artifacts live with the dataset bundle
+OUTPUT_DIR = DATASETS_DIR / "bundle"
+TABLE_FILE = "narrators.parquet"
+PLACES_FILE = "places.csv"
+
+# Date columns, parsed into {prefix}_min, {prefix}_max and {prefix}_approx
+DATE_COLUMNS = {"date_birth": "birth_year", "date_death": "death_year"}
+
+# Place columns, parsed into lists of place ids under these names
+PLACE_COLUMNS = {
+    "place_birth": "birth",
+    "place_death": "death",
+    "place_iqama": "residence",
+    "place_travel": "travel",
+}
+
+# Text columns stored dictionary-encoded
+CATEGORICAL_COLUMNS = ("grade_ibn_hajar", "grade_thahabi", "aqeedah", "tabaqah")
+
+# Years are read as 1 to 4 digits, negative when followed by "ق هـ" (before the Hijra)
+MAX_YEAR = 1500
+
+# Words marking a date as approximate: "in the region of", "and a few", "about", "before", "after"
+APPROX_DATE = r"حدود|بضع|نحو|قبل|بعد|قريبا"
+FEW_YEARS = 9  # "190 وبضع" is 190 to 199
+
+# Ibn Hajar's tabaqat by ordinal, the two-word ordinals first so they win the match
+TABAQAH_ORDINALS = {
+    "الحادية عشرة": 11,
+    "الثانية عشرة": 12,
+    "الأولى": 1,
+    "الثانية": 2,
+    "الثالثة": 3,
+    "الرابعة": 4,
+    "الخامسة": 5,
+    "السادسة": 6,
+    "السابعة": 7,
+    "الثامنة": 8,
+    "التاسعة": 9,
+    "العاشرة": 10,
+}
+# Tabaqat written out instead of as an ordinal, tried in this order
+TABAQAH_PATTERNS = (
+    (r"مخضرم|كبار التابعين|كبار ثقات التابعين", 2),  # the second: senior successors and mukhadramun
+    (r"التابعين|تابعي", 3),
+    (r"صحاب|صحب|رؤية|رأى النبي|بدر|أم المؤمنين|السابقين|المهاجرين|النقباء", 1),  # companions
+)
+TABAQAH_PARTS = {"كبار": "senior", "أوساط": "middle", "صغار": "junior"}
@@ -0,0 +1,139 @@
+"""
+Vectorized parsers of the free-text narrator fields
+
+Every parser takes a whole column and works with pandas string and
+groupby operations, never a Python loop over rows:
+
+    parse_years     "180 هـ ، أو 182 هـ", "231 هـ : 240 هـ", "53 ق هـ"  -> min, max, approx
+    parse_places    "مكة ، البصرة ، والشام"                            -> place ids
+    parse_tabaqah   "من كبار العاشرة", "الحادية عشرة", "صحابي"           -> number, part
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+from .config import APPROX_DATE, FEW_YEARS, MAX_YEAR, TABAQAH_ORDINALS, TABAQAH_PARTS, TABAQAH_PATTERNS
+
+# Tashkeel and tatweel; a non-raw string, as pandas may hand patterns to RE2
+ARABIC_MARKS = "[\u0610-\u061a\u064b-\u065f\u0670\u06d6-\u06ed\u0640]"
+# Letters folded in place keys and tabaqat, so spellings with and without hamza,
+# or with ه for ة, read alike
+FOLDED_LETTERS = str.maketrans({"أ": "ا", "إ": "ا", "آ": "ا", "ى": "ي", "ة": "ه"})
+# Arabic-Indic and Persian digits, read as ASCII digits
+DIGITS = str.maketrans("٠١٢٣٤٥٦٧٨٩۰۱۲۳۴۵۶۷۸۹", "01234567890123456789")
+# Lists are separated by commas, semicolons and "or"
+PLACE_SEPARATORS = r"\s*[،,؛;]\s*|\s+أو\s+"
+PLACE_PUNCTUATION = " .:()[]«»\"'-"
+
+
+def parse_years(text: pd.Series) -> pd.DataFrame:
+    """
+    Earliest and latest year given in each text (a date may list
+    alternatives or a range), and whether the text marks it as approximate.
+    Years before the Hijra are negative.
+    """
+    matches = text.str.translate(DIGITS).str.extractall(r"([0-9]{1,4})\s*(ق\s*هـ)?")
+    years = pd.to_numeric(matches[0]).astype("int32")
+    years = years.where(matches[1].isna(), -years)
+    years = years[years.abs() <= MAX_YEAR]
+    by_row = years.groupby(level=0)
+
+    low = by_row.min().reindex(text.index).astype("Int16")
+    high = by_row.max().reindex(text.index).astype("Int16")
+    few = text.str.contains("بضع", regex=False, na=False)
+    high = high.where(~few, high + FEW_YEARS)
+    approx = text.str.contains(APPROX_DATE, regex=True, na=False) & low.notna()
+    return pd.DataFrame({"min": low, "max": high, "approx": approx})
+
+
+def split_places(text: pd.Series) -> pd.Series:
+    """
+    Each listed place as its own entry, indexed by row, without tashkeel,
+    punctuation or a joining "و" ("والشام" is "الشام").
+    """
+    places = text.str.split(PLACE_SEPARATORS, regex=True).explode()
+    places = (
+        places.str.replace(ARABIC_MARKS, "", regex=True)
+        .str.strip(PLACE_PUNCTUATION)
+        .str.replace(r"^و(ال)", r"\1", regex=True)
+        .str.replace(r"\s+", " ", regex=True)
+    )
+    return places[places.fillna("") != ""]
+
+
+def place_key(places: pd.Series) -> pd.Series:
+    return places.str.translate(FOLDED_LETTERS)
+
+
+def place_keys(text: str) -> list[str]:
+    """Keys of the places listed in one text, as split_places and place_key give them for a column."""
+    keys = []
+    for place in re.split(PLACE_SEPARATORS, text):
+        place = re.sub(ARABIC_MARKS, "", place).strip(PLACE_PUNCTUATION)
+        place = re.sub(r"\s+", " ", re.sub(r"^و(ال)", r"\1", place))
+        if place:
+            keys.append(place.translate(FOLDED_LETTERS))
+    return keys
+
+
+def parse_places(columns: dict[str, pd.Series]) -> tuple[pd.DataFrame, dict[str, tuple[np.ndarray, np.ndarray]]]:
+    """
+    Places of several columns (indexed by row number) against one shared dictionary.
+
+    Returns the dictionary (place_id, name, key and count, the name being
+    the most common spelling of the key) and, for each column, its place
+    lists in CSR form: ids[offsets[row]:offsets[row + 1]] are the places
+    of a row, in order and without repeats.
+    """
+    split = {name: split_places(text) for name, text in columns.items()}
+    everything = pd.concat(split.values())
+    keys = place_key(everything)
+    codes, uniques = pd.factorize(keys, sort=True)
+    id_dtype = np.int16 if len(uniques) <= np.iinfo(np.int16).max else np.int32
+
+    spellings = pd.DataFrame({"key": keys.to_numpy(), "name": everything.to_numpy()}).value_counts()
+    names = spellings.reset_index().drop_duplicates("key").set_index("key")["name"]
+    places = pd.DataFrame({
+        "place_id": np.arange(len(uniques), dtype=id_dtype),
+        "name": names.reindex(uniques).to_numpy(),
+        "key": uniques,
+        "count": np.bincount(codes, minlength=len(uniques)),
+    })
+
+    lists = {}
+    start = 0
+    for name, entries in split.items():
+        rows = entries.index.to_numpy()
+        ids = codes[start:start + len(entries)].astype(id_dtype)
+        start += len(entries)
+        unique = ~pd.DataFrame({"row": rows, "id": ids}).duplicated().to_numpy()
+        rows, ids = rows[unique], ids[unique]
+        counts = np.bincount(rows, minlength=len(columns[name]))
+        offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int32)
+        lists[name] = (offsets, ids)
+    return places, lists
+
+
+def parse_tabaqah(text: pd.Series) -> pd.DataFrame:
+    """
+    Ibn Hajar's tabaqah as a number (1 for the companions to 12), read from
+    its ordinal or from the wording used instead, and the part of it
+    ("senior" for "كبار العاشرة") when given. Tashkeel, hamza and ه for ة
+    are ignored ("السادسه" is the sixth).
+    """
+    text = text.str.replace(ARABIC_MARKS, "", regex=True).str.translate(FOLDED_LETTERS)
+    ordinals = {ordinal.translate(FOLDED_LETTERS): number for ordinal, number in TABAQAH_ORDINALS.items()}
+    parts = {part.translate(FOLDED_LETTERS): name for part, name in TABAQAH_PARTS.items()}
+
+    ordinal = text.str.extract(f"({'|'.join(ordinals)})", expand=False)
+    number = ordinal.map(ordinals)
+    for pattern, value in TABAQAH_PATTERNS:
+        pattern = pattern.translate(FOLDED_LETTERS)
+        number = number.mask(number.isna() & text.str.contains(pattern, regex=True, na=False), value)
+    part = text.str.extract(f"({'|'.join(parts)})", expand=False).map(parts)
+    return pd.DataFrame({
+        "number": number.astype("Int8"),
+        "part": part.astype(pd.CategoricalDtype(list(dict.fromkeys(TABAQAH_PARTS.values())))),
+    })
@@ -0,0 +1,153 @@
+"""
+Compact columnar table of the parsed narrator fields
+
+The scalar fields are a DataFrame of small integer and categorical
+columns; the place fields are CSR arrays of place ids. A query is a
+boolean mask built by array comparisons, so "died 200-250 هـ in Basra" is
+two vectorized filters instead of regex scans over the text.
+
+Stored as Parquet (needs pyarrow: uv sync --extra columnar), with the
+categoricals dictionary-encoded and the places as list<int> columns, next
+to a CSV of the place dictionary.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .config import (
+    CATEGORICAL_COLUMNS,
+    DATE_COLUMNS,
+    NARRATORS_CSV,
+    OUTPUT_DIR,
+    PLACE_COLUMNS,
+    PLACES_FILE,
+    TABLE_FILE,
+)
+from .parse import parse_places, parse_tabaqah, parse_years, place_keys
+
+# Text columns kept as they are, to show with query results
+TEXT_COLUMNS = ("name", "shuhrah", "kunyah")
+
+
+class PlaceLists:
+    """Lists of place ids per row, in CSR form: ids[offsets[row]:offsets[row + 1]]."""
+
+    def __init__(self, offsets: np.ndarray, ids: np.ndarray):
+        self.offsets = offsets
+        self.ids = ids
+        self.rows = np.repeat(np.arange(len(offsets) - 1, dtype=np.int32), np.diff(offsets))
+
+    def contains(self, place_ids: np.ndarray) -> np.ndarray:
+        """Mask of the rows listing any of the places."""
+        mask = np.zeros(len(self.offsets) - 1, dtype=bool)
+        mask[self.rows[np.isin(self.ids, place_ids)]] = True
+        return mask
+
+    def row(self, index: int) -> np.ndarray:
+        return self.ids[self.offsets[index]:self.offsets[index + 1]]
+
+    @property
+    def nbytes(self) -> int:
+        return self.offsets.nbytes + self.ids.nbytes
+
+
+class NarratorTable:
+    """Parsed narrator fields, with the place dictionary and the place lists of each place column."""
+
+    def __init__(self, frame: pd.DataFrame, places: pd.DataFrame, place_lists: dict[str, PlaceLists]):
+        self.frame = frame
+        self.places = places
+        self.place_lists = place_lists
+        self.place_index = dict(zip(places["key"], places["place_id"]))
+        # Death years as plain arrays, unknown years outside every range
+        self.death_min = frame["death_year_min"].to_numpy(dtype=np.int16, na_value=np.iinfo(np.int16).max)
+        self.death_max = frame["death_year_max"].to_numpy(dtype=np.int16, na_value=np.iinfo(np.int16).min)
+
+    @classmethod
+    def from_csv(cls, path: Path = NARRATORS_CSV) -> "NarratorTable":
+        """Parse rawi_data.csv."""
+        df = pd.read_csv(path, encoding="utf-8-sig")
+        df = df.sort_values("rawi_index", ignore_index=True)
+        frame = df[["rawi_index", *TEXT_COLUMNS]].astype({"rawi_index": "int32"})
+        for column in CATEGORICAL_COLUMNS:
+            frame[column] = df[column].astype("category")
+        for column, prefix in DATE_COLUMNS.items():
+            years = parse_years(df[column])
+            frame[f"{prefix}_min"] = years["min"]
+            frame[f"{prefix}_max"] = years["max"]
+            frame[f"{prefix}_approx"] = years["approx"]
+        tabaqah = parse_tabaqah(df["tabaqah"])
+        frame["tabaqah_number"] = tabaqah["number"]
+        frame["tabaqah_part"] = tabaqah["part"]
+
+        places, lists = parse_places({name: df[column] for column, name in PLACE_COLUMNS.items()})
+        return cls(frame, places, {name: PlaceLists(*lists[name]) for name in lists})
+
+    def save(self, output_dir: Path = OUTPUT_DIR) -> tuple[Path, Path]:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("The narrator table needs pyarrow: uv sync --extra columnar") from e
+
+        table = pa.Table.from_pandas(self.frame, preserve_index=False)
+        for name, lists in self.place_lists.items():
+            table = table.append_column(f"{name}_places", pa.ListArray.from_arrays(lists.offsets, lists.ids))
+        table_path = output_dir / TABLE_FILE
+        places_path = output_dir / PLACES_FILE
+        pq.write_table(table, table_path, compression="zstd")
+        self.places.to_csv(places_path, index=False, encoding="utf-8-sig")
+        return table_path, places_path
+
+    @classmethod
+    def load(cls, output_dir: Path = OUTPUT_DIR) -> "NarratorTable":
+        """Read a saved table; place lists are taken from the Arrow buffers without copying rows."""
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("The narrator table needs pyarrow: uv sync --extra columnar") from e
+
+        table = pq.read_table(output_dir / TABLE_FILE)
+        place_lists = {}
+        for name in PLACE_COLUMNS.values():
+            column = table.column(f"{name}_places").combine_chunks()
+            place_lists[name] = PlaceLists(column.offsets.to_numpy(), column.values.to_numpy())
+            table = table.drop_columns(f"{name}_places")
+        places = pd.read_csv(output_dir / PLACES_FILE, encoding="utf-8-sig", dtype={"name": str, "key": str})
+        return cls(table.to_pandas(), places, place_lists)
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def place_ids(self, name: str) -> np.ndarray:
+        """Ids of the places spelled like `name` (or each place of a list), ignoring tashkeel, hamza and taa marbuta."""
+        ids = [self.place_index[key] for key in place_keys(name) if key in self.place_index]
+        return np.array(ids, dtype=self.places["place_id"].dtype)
+
+    def in_place(self, name: str, *columns: str) -> np.ndarray:
+        """Mask of narrators with the place in any of the place columns (all of them by default)."""
+        ids = self.place_ids(name)
+        mask = np.zeros(len(self), dtype=bool)
+        for column in columns or self.place_lists:
+            mask |= self.place_lists[column].contains(ids)
+        return mask
+
+    def died_between(self, first: int, last: int, certain: bool = False) -> np.ndarray:
+        """
+        Mask of narrators who died within the years. Dates given as
+        alternatives or ranges match if any year falls within them, or
+        only if all do when `certain`.
+        """
+        if certain:
+            return (self.death_min >= first) & (self.death_max <= last) & (self.death_min <= self.death_max)
+        return (self.death_max >= first) & (self.death_min <= last)
+
+    def places_of(self, index: int, column: str) -> list[str]:
+        """Place names of one row of the table."""
+        return self.places["name"].to_numpy()[self.place_lists[column].row(index)].tolist()
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.frame.memory_usage(deep=True).sum()) + sum(lists.nbytes for lists in self.place_lists.values())
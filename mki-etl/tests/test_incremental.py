@@ -0,0 +1,54 @@
+import dataclasses
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+
+from dorar.incremental import load_previous, update_events
+from dorar.profiles import SEERA
+
+
+def event(event_id: int, title: str) -> dict:
+    row = dict.fromkeys(SEERA.columns, "")
+    row.update(event_id=event_id, title=title, source_url=f"https://dorar.net/history/event/{event_id}")
+    return row
+
+
+class UpdateEventsTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.profile = dataclasses.replace(SEERA, output_file=Path(self.directory.name) / "seera_events.csv")
+        previous = pd.DataFrame([event(1, "old"), event(2, "kept")]).assign(region="الحجاز")
+        previous.to_csv(self.profile.output_file, index=False, encoding="utf-8-sig")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def update(self, events: list[dict], formats=("csv",)) -> None:
+        crawl = mock.AsyncMock(return_value=(events, []))
+        with mock.patch("dorar.incremental.crawl_incremental", crawl), redirect_stdout(StringIO()):
+            update_events(self.profile, load_previous(self.profile.output_file), formats=formats)
+
+    def test_extra_columns_survive_a_changed_event(self):
+        self.update([event(1, "new")])
+
+        df = pd.read_csv(self.profile.output_file, dtype=str, encoding="utf-8-sig")
+        self.assertEqual(list(df.columns), [*SEERA.columns, "region"])
+        self.assertEqual(list(df["title"]), ["new", "kept"])
+        self.assertEqual(list(df["region"]), ["الحجاز", "الحجاز"])
+
+    def test_extra_columns_reach_parquet(self):
+        self.update([event(3, "added")], formats=("csv", "parquet"))
+
+        df = pd.read_parquet(self.profile.output_file.with_suffix(".parquet"))
+        self.assertEqual(list(df["event_id"]), [1, 2, 3])
+        self.assertEqual(list(df["region"])[:2], ["الحجاز", "الحجاز"])
+        self.assertTrue(pd.isna(df["region"].iloc[2]))
+
+
+if __name__ == "__main__":
+    unittest.main()
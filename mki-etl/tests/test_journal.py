@@ -0,0 +1,36 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from dorar.journal import CrawlJournal
+
+
+class CrawlJournalTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.journal = CrawlJournal(Path(self.directory.name) / "journal.sqlite3", max_attempts=2)
+        self.journal.record_page("page-1", [1, 2, 3])
+        self.journal.record_event({"event_id": 1, "title": "t"})
+
+    def tearDown(self):
+        self.journal.close()
+        self.directory.cleanup()
+
+    def test_failed_event_is_retried_until_given_up(self):
+        self.journal.record_failure(2, "fetch")
+        self.assertEqual(self.journal.pending_event_ids(), {2, 3})
+        self.assertEqual(self.journal.given_up_events(), {})
+
+        self.journal.record_failure(2, "parse")
+        self.assertEqual(self.journal.pending_event_ids(), {3})
+        self.assertEqual(self.journal.given_up_events(), {2: "parse"})
+
+    def test_parsed_event_clears_its_failures(self):
+        self.journal.record_failure(3, "fetch")
+        self.journal.record_event({"event_id": 3, "title": "t"})
+        self.journal.record_failure(3, "fetch")
+        self.assertEqual(self.journal.given_up_events(), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+-- Covering indexes for the hot lookups, and full-text search
+-- Built into the dataset bundle by mki-etl/bundle after 0001
+
+-- Seerah events of a locale in timeline order, and within a year range;
+-- (event_id, locale) lookups use the UNIQUE constraint's index
+DROP INDEX IF EXISTS idx_seerah_locale;
+DROP INDEX IF EXISTS idx_seerah_year;
+CREATE INDEX IF NOT EXISTS idx_seerah_locale_year ON seerah_events(locale, year_gregorian, id);
+CREATE INDEX IF NOT EXISTS idx_seerah_locale_year_hijri ON seerah_events(locale, year_hijri, event_id);
+
+-- Chains of a hadith in order, and hadiths of a narrator, without touching the table
+DROP INDEX IF EXISTS idx_hadith_chains_hadith;
+DROP INDEX IF EXISTS idx_hadith_chains_narrator;
+CREATE INDEX IF NOT EXISTS idx_hadith_chains_hadith ON hadith_chains(hadith_id, chain_position, narrator_id);
+CREATE INDEX IF NOT EXISTS idx_hadith_chains_narrator ON hadith_chains(narrator_id, hadith_id, chain_position);
+
+-- Teachers or students of a narrator
+DROP INDEX IF EXISTS idx_relationships_narrator;
+DROP INDEX IF EXISTS idx_relationships_type;
+CREATE INDEX IF NOT EXISTS idx_relationships_narrator ON narrator_relationships(narrator_id, relationship_type, related_id);
+
+-- Full-text search
+-- The tables are contentless: rowid is the rowid of the indexed row, and the
+-- text is normalized by the compiler (tashkeel and tatweel removed, alef,
+-- hamza, yaa and taa marbuta forms unified, the article "ال" and a joining
+-- "و" stripped from each word, lowercased), so queries must be normalized
+-- the same way (normalize_search_query in mki-etl/bundle/compile_bundle.py):
+-- "البصرة" is searched as "بصره". Search with
+--   SELECT e.* FROM seerah_events_fts JOIN seerah_events e ON e.id = seerah_events_fts.rowid
+--   WHERE seerah_events_fts MATCH ? ORDER BY rank
+CREATE VIRTUAL TABLE IF NOT EXISTS seerah_events_fts USING fts5(
+  title, description, location_name,
+  content='', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS narrators_fts USING fts5(
+  name_ar, name_en, grade, places,
+  content='', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS hadiths_fts USING fts5(
+  text_ar, text_en, chapter,
+  content='', tokenize='unicode61 remove_diacritics 2'
+);